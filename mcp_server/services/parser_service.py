@@ -39,6 +39,9 @@ class ParserService:
         self._freq_words_cache: Optional[List[Dict]] = None
         self._freq_words_mtime: float = 0.0
 
+        # SQLite 读连接参数（延迟从 config.yaml 加载）
+        self._sqlite_pragmas: Optional[Dict] = None
+
     @staticmethod
     def clean_title(title: str) -> str:
         """清理标题文本"""
@@ -79,6 +82,35 @@ class ParserService:
             return db_path
         return None
 
+    def _get_sqlite_pragmas(self) -> Dict:
+        """获取 SQLite 连接参数（storage.sqlite 配置）"""
+        if self._sqlite_pragmas is None:
+            from trendradar.storage.sqlite_profile import resolve_sqlite_pragmas
+
+            try:
+                sqlite_config = (self.parse_yaml_config().get("storage") or {}).get("sqlite") or {}
+            except FileParseError:
+                sqlite_config = {}
+            self._sqlite_pragmas = resolve_sqlite_pragmas(
+                sqlite_config.get("profile", "performance"),
+                sqlite_config.get("pragmas"),
+            )
+        return self._sqlite_pragmas
+
+    def _connect_sqlite(self, db_path: Path) -> sqlite3.Connection:
+        """
+        打开只读用途的 SQLite 连接
+
+        应用与写入端一致的缓存/内存映射参数；数据库为 WAL 模式时，
+        读取不会被抓取写入阻塞。
+        """
+        from trendradar.storage.sqlite_profile import apply_sqlite_pragmas
+
+        conn = sqlite3.connect(str(db_path))
+        conn.row_factory = sqlite3.Row
+        apply_sqlite_pragmas(conn, self._get_sqlite_pragmas(), readonly=True)
+        return conn
+
     def _read_from_sqlite(
         self,
         date: datetime = None,
@@ -105,8 +137,7 @@ class ParserService:
         all_timestamps = {}
 
         try:
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
+            conn = self._connect_sqlite(db_path)
             cursor = conn.cursor()
 
             if db_type == "news":
@@ -161,24 +192,36 @@ class ParserService:
 
         rows = cursor.fetchall()
 
-        # 收集所有 news_item_id 用于查询历史排名
-        news_ids = [row['id'] for row in rows]
+        # 查询历史排名：与 news_items 有序连接后流式分组，避免超长 IN (...) 参数列表
+        # 已结束日期的排名历史可能已压缩到 rank_history_packed，解码后合并
         rank_history_map = {}
+        if rows:
+            from trendradar.storage.rank_pack import load_packed_history, merge_history_rows
 
-        if news_ids:
-            placeholders = ",".join("?" * len(news_ids))
-            cursor.execute(f"""
-                SELECT news_item_id, rank FROM rank_history
-                WHERE news_item_id IN ({placeholders})
-                ORDER BY news_item_id, crawl_time
-            """, news_ids)
-
-            for rh_row in cursor.fetchall():
-                news_id = rh_row['news_item_id']
-                rank = rh_row['rank']
-                if news_id not in rank_history_map:
-                    rank_history_map[news_id] = []
-                rank_history_map[news_id].append(rank)
+            query = """
+                SELECT rh.news_item_id, rh.rank, rh.crawl_time
+                FROM news_items n
+                JOIN rank_history rh ON rh.news_item_id = n.id
+            """
+            where = ""
+            params: List[str] = []
+            if platform_ids:
+                where = f" WHERE n.platform_id IN ({','.join('?' for _ in platform_ids)})"
+                params = list(platform_ids)
+            query += where + " ORDER BY rh.news_item_id, rh.crawl_time"
+
+            packed = load_packed_history(cursor, where, tuple(params))
+            history_rows = cursor.execute(query, params)
+            if packed:
+                history_rows = merge_history_rows(history_rows.fetchall(), packed)
+
+            current_id = None
+            ranks: List[int] = []
+            for news_id, rank, _ in history_rows:
+                if news_id != current_id:
+                    current_id = news_id
+                    ranks = rank_history_map[news_id] = []
+                ranks.append(rank)
 
         for row in rows:
             news_id = row['id']
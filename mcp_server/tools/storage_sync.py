@@ -86,10 +86,12 @@ class StorageSyncTools:
 
         try:
             from trendradar.storage.remote import RemoteStorageBackend
+            from trendradar.storage.sqlite_profile import resolve_sqlite_pragmas
 
             remote_config = self._get_remote_config()
             config = self._load_config()
             timezone = config.get("app", {}).get("timezone", "Asia/Shanghai")
+            sqlite_config = self._get_storage_config().get("sqlite", {})
 
             self._remote_backend = RemoteStorageBackend(
                 bucket_name=remote_config["bucket_name"],
@@ -98,6 +100,10 @@ class StorageSyncTools:
                 endpoint_url=remote_config["endpoint_url"],
                 region=remote_config.get("region", ""),
                 timezone=timezone,
+                sqlite_pragmas=resolve_sqlite_pragmas(
+                    sqlite_config.get("profile", "performance"),
+                    sqlite_config.get("pragmas"),
+                ),
             )
             return self._remote_backend
         except ImportError:
@@ -248,71 +254,48 @@ class StorageSyncTools:
             local_dir = self._get_local_data_dir()
             local_dir.mkdir(parents=True, exist_ok=True)
 
-            # 获取远程可用日期
-            remote_dates = remote_backend.list_remote_dates()
-
-            # 获取本地已有日期
-            local_dates = set(self._get_local_dates())
-
             # 计算需要拉取的日期（最近 N 天）
             from trendradar.utils.time import get_configured_time
             config = self._load_config()
             timezone = config.get("app", {}).get("timezone", "Asia/Shanghai")
             now = get_configured_time(timezone)
+            target_dates = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+
+            # 并发拉取热榜和 RSS 数据库（本地已存在的跳过）
+            pull_config = self._get_storage_config().get("pull", {})
+            result = remote_backend.pull_dates(
+                target_dates,
+                str(local_dir),
+                max_workers=pull_config.get("workers", 4),
+            )
 
-            target_dates = []
-            for i in range(days):
-                date = now - timedelta(days=i)
-                date_str = date.strftime("%Y-%m-%d")
-                if date_str in remote_dates:
-                    target_dates.append(date_str)
-
-            # 执行拉取
-            synced_dates = []
-            skipped_dates = []
-            failed_dates = []
-
-            for date_str in target_dates:
-                # 检查本地是否已存在
-                if date_str in local_dates:
-                    skipped_dates.append(date_str)
-                    continue
-
-                # 拉取单个日期
-                try:
-                    local_date_dir = local_dir / date_str
-                    local_db_path = local_date_dir / "news.db"
-                    remote_key = f"news/{date_str}.db"
-
-                    local_date_dir.mkdir(parents=True, exist_ok=True)
-                    remote_backend.s3_client.download_file(
-                        remote_backend.bucket_name,
-                        remote_key,
-                        str(local_db_path)
-                    )
-                    synced_dates.append(date_str)
-                    print(f"[存储同步] 已拉取: {date_str}")
-                except Exception as e:
-                    failed_dates.append({"date": date_str, "error": str(e)})
-                    print(f"[存储同步] 拉取失败 ({date_str}): {e}")
+            def _dates_of(keys: List[str]) -> List[str]:
+                return sorted({Path(key).stem for key in keys}, reverse=True)
 
+            synced_dates = _dates_of(result["synced"])
+            skipped_dates = _dates_of(result["skipped"])
+            failed_dates = [
+                {"date": item["date"], "db_type": item["db_type"], "error": item["error"]}
+                for item in result["failed"]
+            ]
             return {
                 "success": True,
                 "summary": {
                     "description": "远程存储同步结果",
-                    "synced_files": len(synced_dates),
+                    "synced_files": len(result["synced"]),
                     "skipped_count": len(skipped_dates),
                     "failed_count": len(failed_dates)
                 },
                 "data": {
                     "synced_dates": synced_dates,
+                    "synced_files": result["synced"],
                     "skipped_dates": skipped_dates,
                     "failed_dates": failed_dates
                 },
                 "message": f"成功同步 {len(synced_dates)} 天数据" + (
                     f"，跳过 {len(skipped_dates)} 天（本地已存在）" if skipped_dates else ""
                 ) + (
-                    f"，失败 {len(failed_dates)} 天" if failed_dates else ""
+                    f"，失败 {len(failed_dates)} 个文件" if failed_dates else ""
                 )
             }
 
@@ -489,13 +472,24 @@ class StorageSyncTools:
                     remote_backend = self._get_remote_backend()
                     if remote_backend:
                         try:
-                            remote_dates = remote_backend.list_remote_dates()
+                            # 读取远程清单（没有清单时遍历存储桶）
+                            remote_news_dates = remote_backend.list_remote_dates("news")
+                            remote_rss_dates = remote_backend.list_remote_dates("rss")
+                            remote_dates = sorted(set(remote_news_dates) | set(remote_rss_dates), reverse=True)
                             data_result["remote"] = {
                                 "configured": True,
                                 "dates": remote_dates,
                                 "count": len(remote_dates),
                                 "earliest": remote_dates[-1] if remote_dates else None,
                                 "latest": remote_dates[0] if remote_dates else None,
+                                "news": {
+                                    "dates": remote_news_dates,
+                                    "count": len(remote_news_dates),
+                                },
+                                "rss": {
+                                    "dates": remote_rss_dates,
+                                    "count": len(remote_rss_dates),
+                                },
                             }
                         except Exception as e:
                             data_result["remote"] = {
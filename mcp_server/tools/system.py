@@ -30,6 +30,37 @@ class SystemManagementTools:
             current_file = Path(__file__)
             self.project_root = current_file.parent.parent.parent
 
+        # 复用的数据获取器（保持 HTTP 连接池跨多次 trigger_crawl 调用）
+        self._fetcher = None
+        self._fetcher_key = None
+
+    def _get_fetcher(self, proxy_url: Optional[str], crawler_config: Dict):
+        """
+        获取复用的数据获取器
+
+        代理、并发数、主机启动间隔或熔断配置变化时重建获取器（连接池大小与并发数绑定）。
+        熔断状态保存在获取器内存中，跨多次调用生效。
+        """
+        from trendradar.crawler.fetcher import DataFetcher
+
+        max_workers = crawler_config.get("max_workers", 1)
+        host_interval = crawler_config.get("host_interval", 100)
+        breaker_config = crawler_config.get("circuit_breaker", {})
+        key = (proxy_url, max_workers, host_interval, tuple(sorted(breaker_config.items())))
+        if self._fetcher is None or self._fetcher_key != key:
+            if self._fetcher is not None:
+                self._fetcher.close()
+            self._fetcher = DataFetcher(
+                proxy_url=proxy_url,
+                max_workers=max_workers,
+                host_interval=host_interval,
+                failure_threshold=breaker_config.get("failure_threshold", 3),
+                cooldown_minutes=breaker_config.get("cooldown_minutes", 30),
+                max_cooldown_minutes=breaker_config.get("max_cooldown_minutes", 240),
+            )
+            self._fetcher_key = key
+        return self._fetcher
+
     def get_system_status(self) -> Dict:
         """
         获取系统运行状态和健康检查信息
@@ -92,9 +123,9 @@ class SystemManagementTools:
         try:
             import time
             import yaml
-            from trendradar.crawler.fetcher import DataFetcher
             from trendradar.storage.local import LocalStorageBackend
             from trendradar.storage.base import convert_crawl_results_to_news_data
+            from trendradar.storage.sqlite_profile import resolve_sqlite_pragmas
             from trendradar.utils.time import get_configured_time, format_date_folder, format_time_filename
             from ..services.cache_service import get_cache
 
@@ -155,7 +186,7 @@ class SystemManagementTools:
             if crawler_config.get("use_proxy"):
                 proxy_url = crawler_config.get("default_proxy")
             
-            fetcher = DataFetcher(proxy_url=proxy_url)
+            fetcher = self._get_fetcher(proxy_url, crawler_config)
             request_interval = crawler_config.get("request_interval", 100)
 
             # 执行爬取
@@ -181,11 +212,16 @@ class SystemManagementTools:
             )
 
             # 初始化存储后端
+            sqlite_config = config_data.get("storage", {}).get("sqlite", {})
             storage = LocalStorageBackend(
                 data_dir=str(self.project_root / "output"),
                 enable_txt=True,
                 enable_html=True,
-                timezone=timezone
+                timezone=timezone,
+                sqlite_pragmas=resolve_sqlite_pragmas(
+                    sqlite_config.get("profile", "performance"),
+                    sqlite_config.get("pragmas"),
+                ),
             )
 
             # 尝试持久化数据
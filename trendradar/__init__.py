@@ -7,7 +7,13 @@ TrendRadar - 热点新闻聚合与分析工具
   trendradar                  # 安装后执行
 """
 
-from trendradar.context import AppContext
-
 __version__ = "6.0.0"
 __all__ = ["AppContext", "__version__"]
+
+
+def __getattr__(name: str):
+    # AppContext 依赖报告、通知等模块，按需导入以缩短 CLI 启动时间
+    if name == "AppContext":
+        from trendradar.context import AppContext
+        return AppContext
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -13,17 +13,15 @@ import webbrowser
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
-import requests
-
 from trendradar.context import AppContext
 from trendradar import __version__
 from trendradar.core import load_config
 from trendradar.core.analyzer import convert_keyword_stats_to_platform_stats
-from trendradar.crawler import DataFetcher
 from trendradar.storage import convert_crawl_results_to_news_data
 from trendradar.utils.time import DEFAULT_TIMEZONE, is_within_days, calculate_days_old
 from trendradar.ai import AIAnalyzer, AIAnalysisResult
 from trendradar.core.scheduler import ResolvedSchedule
+from trendradar.core.daemon import DaemonRunner
 
 
 def _parse_version(version_str: str) -> Tuple[int, int, int]:
@@ -63,6 +61,8 @@ def _fetch_remote_version(version_url: str, proxy_url: Optional[str] = None) ->
             "Cache-Control": "no-cache",
         }
 
+        import requests
+
         response = requests.get(version_url, proxies=proxies, headers=headers, timeout=10)
         response.raise_for_status()
         return response.text.strip()
@@ -228,7 +228,17 @@ class NewsAnalyzer:
         self.update_info = None
         self.proxy_url = None
         self._setup_proxy()
-        self.data_fetcher = DataFetcher(self.proxy_url)
+        from trendradar.crawler import DataFetcher
+
+        breaker_config = self.ctx.config.get("CIRCUIT_BREAKER", {})
+        self.data_fetcher = DataFetcher(
+            self.proxy_url,
+            max_workers=self.ctx.config.get("CRAWLER_MAX_WORKERS", 1),
+            host_interval=self.ctx.config.get("CRAWLER_HOST_INTERVAL", 100),
+            failure_threshold=breaker_config.get("FAILURE_THRESHOLD", 3),
+            cooldown_minutes=breaker_config.get("COOLDOWN_MINUTES", 30),
+            max_cooldown_minutes=breaker_config.get("MAX_COOLDOWN_MINUTES", 240),
+        )
 
         # 初始化存储管理器（使用 AppContext）
         self._init_storage_manager()
@@ -997,6 +1007,22 @@ class NewsAnalyzer:
         print(f"报告模式: {self.report_mode}")
         print(f"运行模式: {mode_strategy['description']}")
 
+    def _resolve_schedule(self) -> ResolvedSchedule:
+        """
+        解析当前时间的调度计划（每次运行只解析一次）
+
+        使用 schedule 决定的 report_mode 覆盖全局配置，
+        抓取、存储、报告、AI 分析和推送各阶段共用同一份计划。
+        """
+        schedule = self.ctx.create_scheduler().resolve()
+
+        effective_mode = schedule.report_mode
+        if effective_mode != self.report_mode:
+            print(f"[调度] 报告模式覆盖: {self.report_mode} -> {effective_mode}")
+        self.report_mode = effective_mode
+
+        return schedule
+
     def _crawl_data(self) -> Tuple[Dict, Dict, List]:
         """执行数据爬取"""
         ids = []
@@ -1012,15 +1038,22 @@ class NewsAnalyzer:
         print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
         Path("output").mkdir(parents=True, exist_ok=True)
 
+        # 载入当天的平台指纹和健康记录，用于识别未变化的平台和熔断判断
+        crawl_date = self.ctx.format_date()
+        self.data_fetcher.fingerprints = self.storage_manager.get_platform_fingerprints(crawl_date)
+        self.data_fetcher.health = self.storage_manager.get_platform_health(crawl_date)
+
         results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
             ids, self.request_interval
         )
 
         # 转换为 NewsData 格式并保存到存储后端
         crawl_time = self.ctx.format_time()
-        crawl_date = self.ctx.format_date()
         news_data = convert_crawl_results_to_news_data(
-            results, id_to_name, failed_ids, crawl_time, crawl_date
+            results, id_to_name, failed_ids, crawl_time, crawl_date,
+            unchanged_ids=self.data_fetcher.unchanged_ids,
+            fingerprints=self.data_fetcher.fingerprints,
+            source_health=self.data_fetcher.health,
         )
 
         # 保存到存储后端（SQLite）
@@ -1099,6 +1132,7 @@ class NewsAnalyzer:
             freshness_config = rss_config.get("FRESHNESS_FILTER", {})
             freshness_enabled = freshness_config.get("ENABLED", True)
             default_max_age_days = freshness_config.get("MAX_AGE_DAYS", 3)
+            filter_on_fetch = freshness_config.get("FILTER_ON_FETCH", False)
 
             fetcher = RSSFetcher(
                 feeds=feeds,
@@ -1109,7 +1143,13 @@ class NewsAnalyzer:
                 timezone=timezone,
                 freshness_enabled=freshness_enabled,
                 default_max_age_days=default_max_age_days,
+                filter_on_fetch=filter_on_fetch,
+                max_workers=rss_config.get("MAX_WORKERS", 1),
+                parse_workers=rss_config.get("PARSE_WORKERS", 0),
+                parser_backend=rss_config.get("PARSER", "feedparser"),
             )
+            # 载入当天保存的 HTTP 校验头，未变化的源将返回 304
+            fetcher.validators = self.storage_manager.get_rss_feed_validators(self.ctx.format_date())
 
             # 抓取数据
             rss_data = fetcher.fetch_all()
@@ -1431,6 +1471,7 @@ class NewsAnalyzer:
         rss_items: Optional[List[Dict]] = None,
         rss_new_items: Optional[List[Dict]] = None,
         raw_rss_items: Optional[List[Dict]] = None,
+        schedule: Optional[ResolvedSchedule] = None,
     ) -> Optional[str]:
         """执行模式特定逻辑，支持热榜+RSS合并推送
 
@@ -1438,15 +1479,9 @@ class NewsAnalyzer:
         - 每次运行都生成 HTML 报告（时间戳快照 + latest/{mode}.html + index.html）
         - 根据模式发送通知
         """
-        # 调度系统
-        scheduler = self.ctx.create_scheduler()
-        schedule = scheduler.resolve()
-
-        # 使用 schedule 决定的 report_mode 覆盖全局配置
-        effective_mode = schedule.report_mode
-        if effective_mode != self.report_mode:
-            print(f"[调度] 报告模式覆盖: {self.report_mode} -> {effective_mode}")
-        self.report_mode = effective_mode
+        # 调度系统（run() 已提前解析时直接复用）
+        if schedule is None:
+            schedule = self._resolve_schedule()
 
         # 如果调度器说不采集，则直接跳过
         if not schedule.collect:
@@ -1629,11 +1664,25 @@ class NewsAnalyzer:
 
         return html_file
 
-    def run(self) -> None:
-        """执行分析流程"""
+    def run(self, keep_alive: bool = False) -> None:
+        """
+        执行分析流程
+
+        Args:
+            keep_alive: 执行后保留存储连接、HTTP 连接池等资源（常驻模式下复用，由 close() 释放）
+        """
         try:
+            # 报告模式可能被上一次执行的调度结果覆盖，每次执行前恢复配置值
+            self.report_mode = self.ctx.config["REPORT_MODE"]
+
             self._initialize_and_check_config()
 
+            # 先解析调度计划：当前时间段不采集时，抓取、存储写入、HTML 生成和 AI 分析全部跳过
+            schedule = self._resolve_schedule()
+            if not schedule.collect:
+                print("[调度] 当前时间段不执行数据采集，跳过本次运行")
+                return
+
             mode_strategy = self._get_mode_strategy()
 
             # 抓取热榜数据
@@ -1646,7 +1695,7 @@ class NewsAnalyzer:
             self._execute_mode_strategy(
                 mode_strategy, results, id_to_name, failed_ids,
                 rss_items=rss_items, rss_new_items=rss_new_items,
-                raw_rss_items=raw_rss_items
+                raw_rss_items=raw_rss_items, schedule=schedule
             )
 
         except Exception as e:
@@ -1654,8 +1703,13 @@ class NewsAnalyzer:
             if self.ctx.config.get("DEBUG", False):
                 raise
         finally:
-            # 清理资源（包括过期数据清理和数据库连接关闭）
-            self.ctx.cleanup()
+            if not keep_alive:
+                self.close()
+
+    def close(self) -> None:
+        """清理资源（包括过期数据清理、数据库连接和 HTTP 连接池关闭）"""
+        self.data_fetcher.close()
+        self.ctx.cleanup()
 
 
 def main():
@@ -1668,9 +1722,17 @@ def main():
 调度状态命令:
   --show-schedule        显示当前调度状态（时间段、行为开关）
 
+常驻模式:
+  --daemon               常驻运行，按 schedule.daemon_interval 和时间段切换时刻执行
+  --interval MINUTES     覆盖常驻模式的执行间隔（分钟）
+
+诊断命令:
+  --profile-startup      显示启动导入耗时分析（按包统计 + 按需加载模块成本）
+
 示例:
   python -m trendradar                    # 正常运行
   python -m trendradar --show-schedule    # 查看当前调度状态
+  python -m trendradar --daemon           # 常驻运行（替代 cron）
 """
     )
     parser.add_argument(
@@ -1678,9 +1740,33 @@ def main():
         action="store_true",
         help="显示当前调度状态"
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="常驻运行，内部按调度执行，配置文件修改后自动重新加载"
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=None,
+        metavar="MINUTES",
+        help="常驻模式的执行间隔（分钟），默认使用 schedule.daemon_interval"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="显示启动导入耗时分析"
+    )
 
     args = parser.parse_args()
 
+    # 启动分析不需要配置文件
+    if args.profile_startup:
+        from trendradar.utils.startup import profile_startup
+
+        profile_startup()
+        return
+
     debug_mode = False
     try:
         # 先加载配置
@@ -1700,6 +1786,16 @@ def main():
         if version_url:
             need_update, remote_version = check_all_versions(version_url, configs_version_url)
 
+        if args.daemon:
+            debug_mode = config.get("DEBUG", False)
+            DaemonRunner(
+                config,
+                load_config_func=load_config,
+                create_analyzer_func=lambda cfg: NewsAnalyzer(config=cfg),
+                interval_minutes=args.interval,
+            ).run_forever()
+            return
+
         # 复用已加载的配置，避免重复加载
         analyzer = NewsAnalyzer(config=config)
 
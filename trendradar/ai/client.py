@@ -9,8 +9,6 @@ AI 客户端模块
 import os
 from typing import Any, Dict, List, Optional
 
-from litellm import completion
-
 
 class AIClient:
     """统一的 AI 客户端（基于 LiteLLM）"""
@@ -88,7 +86,9 @@ class AIClient:
             if key not in params:
                 params[key] = value
 
-        # 调用 LiteLLM
+        # 调用 LiteLLM（导入耗时较长，首次调用时再导入）
+        from litellm import completion
+
         response = completion(**params)
 
         # 提取响应内容
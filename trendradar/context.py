@@ -7,7 +7,7 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from trendradar.utils.time import (
     DEFAULT_TIMEZONE,
@@ -25,20 +25,11 @@ from trendradar.core import (
     count_word_frequency,
     Scheduler,
 )
-from trendradar.report import (
-    clean_title,
-    prepare_report_data,
-    generate_html_report,
-    render_html_content,
-)
-from trendradar.notification import (
-    render_feishu_content,
-    render_dingtalk_content,
-    split_content_into_batches,
-    NotificationDispatcher,
-)
-from trendradar.ai import AITranslator
-from trendradar.storage import get_storage_manager
+from trendradar.storage import get_storage_manager, resolve_sqlite_pragmas
+
+# 报告、通知、AI 模块在首次使用时导入（--show-schedule 等命令无需加载）
+if TYPE_CHECKING:
+    from trendradar.notification import NotificationDispatcher
 
 
 class AppContext:
@@ -164,6 +155,7 @@ class AppContext:
             remote_config = storage_config.get("REMOTE", {})
             local_config = storage_config.get("LOCAL", {})
             pull_config = storage_config.get("PULL", {})
+            sqlite_config = storage_config.get("SQLITE", {})
 
             self._storage_manager = get_storage_manager(
                 backend_type=storage_config.get("BACKEND", "auto"),
@@ -176,12 +168,24 @@ class AppContext:
                     "secret_access_key": remote_config.get("SECRET_ACCESS_KEY", ""),
                     "endpoint_url": remote_config.get("ENDPOINT_URL", ""),
                     "region": remote_config.get("REGION", ""),
+                    "sync_mode": remote_config.get("SYNC_MODE", "full"),
+                    "compact_every": remote_config.get("COMPACT_EVERY", 12),
+                    "cache_dir": remote_config.get("CACHE_DIR", ""),
+                    "archive": remote_config.get("ARCHIVE", False),
+                    "archive_format": remote_config.get("ARCHIVE_FORMAT", "gzip"),
+                    "upload": remote_config.get("UPLOAD", {}),
                 },
                 local_retention_days=local_config.get("RETENTION_DAYS", 0),
+                local_compact_rank_history=local_config.get("COMPACT_RANK_HISTORY", True),
                 remote_retention_days=remote_config.get("RETENTION_DAYS", 0),
                 pull_enabled=pull_config.get("ENABLED", False),
                 pull_days=pull_config.get("DAYS", 7),
+                pull_workers=pull_config.get("WORKERS", 4),
                 timezone=self.timezone,
+                sqlite_pragmas=resolve_sqlite_pragmas(
+                    sqlite_config.get("PROFILE", "performance"),
+                    sqlite_config.get("PRAGMAS"),
+                ),
             )
         return self._storage_manager
 
@@ -271,6 +275,8 @@ class AppContext:
         mode: str = "daily",
     ) -> Dict:
         """准备报告数据"""
+        from trendradar.report import prepare_report_data
+
         return prepare_report_data(
             stats=stats,
             failed_ids=failed_ids,
@@ -298,6 +304,8 @@ class AppContext:
         standalone_data: Optional[Dict] = None,
     ) -> str:
         """生成HTML报告"""
+        from trendradar.report import generate_html_report
+
         return generate_html_report(
             stats=stats,
             total_titles=total_titles,
@@ -327,6 +335,8 @@ class AppContext:
         standalone_data: Optional[Dict] = None,
     ) -> str:
         """渲染HTML内容"""
+        from trendradar.report import render_html_content
+
         return render_html_content(
             report_data=report_data,
             total_titles=total_titles,
@@ -351,6 +361,8 @@ class AppContext:
         mode: str = "daily",
     ) -> str:
         """渲染飞书内容"""
+        from trendradar.notification import render_feishu_content
+
         return render_feishu_content(
             report_data=report_data,
             update_info=update_info,
@@ -368,6 +380,8 @@ class AppContext:
         mode: str = "daily",
     ) -> str:
         """渲染钉钉内容"""
+        from trendradar.notification import render_dingtalk_content
+
         return render_dingtalk_content(
             report_data=report_data,
             update_info=update_info,
@@ -409,6 +423,8 @@ class AppContext:
         Returns:
             分批后的消息内容列表
         """
+        from trendradar.notification import split_content_into_batches
+
         return split_content_into_batches(
             report_data=report_data,
             format_type=format_type,
@@ -437,13 +453,17 @@ class AppContext:
 
     # === 通知发送 ===
 
-    def create_notification_dispatcher(self) -> NotificationDispatcher:
+    def create_notification_dispatcher(self) -> "NotificationDispatcher":
         """创建通知调度器"""
+        from trendradar.notification import NotificationDispatcher
+
         # 创建翻译器（如果启用）
         translator = None
         trans_config = self.config.get("AI_TRANSLATION", {})
         if trans_config.get("ENABLED", False):
             ai_config = self.config.get("AI", {})
+            from trendradar.ai import AITranslator
+
             translator = AITranslator(trans_config, ai_config)
 
         return NotificationDispatcher(
@@ -476,6 +496,9 @@ class AppContext:
     def cleanup(self):
         """清理资源"""
         if self._storage_manager:
+            # 先按保留天数删除过期数据，避免压缩、归档即将被删除的日期
             self._storage_manager.cleanup_old_data()
+            self._storage_manager.compact_local_days()
+            self._storage_manager.archive_remote_days()
             self._storage_manager.cleanup()
             self._storage_manager = None
@@ -0,0 +1,250 @@
+# coding=utf-8
+"""
+常驻运行模式（python -m trendradar --daemon）
+
+替代 cron 每次启动新进程的方式：进程常驻，由内部调度按间隔触发执行。
+解释器、已导入的依赖、解析后的配置、数据库连接和当天读模型在多次执行之间保持，
+省去每次执行的固定启动开销。
+
+- 执行时刻：按 schedule.daemon_interval 从零点对齐（如 30 → :00 / :30），
+  以及 timeline 中各时间段的切换时刻
+- 配置热加载：config.yaml / timeline.yaml 修改后自动重新加载
+- 跨天或重新加载配置时重建分析器（清理过期数据、关闭旧连接）
+"""
+
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from trendradar.core.scheduler import Scheduler
+from trendradar.utils.time import DEFAULT_TIMEZONE, format_date_folder, get_configured_time
+
+# 等待期间检查配置文件变化的间隔（秒）
+CONFIG_POLL_SECONDS = 5
+
+DEFAULT_DAEMON_INTERVAL = 30
+
+
+class ConfigWatcher:
+    """通过修改时间和文件大小检测配置文件变化"""
+
+    def __init__(self, paths: List[Path]):
+        self.paths = paths
+        self._state = self._snapshot()
+
+    def _snapshot(self) -> Dict[Path, Optional[Tuple[int, int]]]:
+        state = {}
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                state[path] = None
+        return state
+
+    def changed(self) -> bool:
+        """自上次检查以来是否有文件变化"""
+        state = self._snapshot()
+        if state == self._state:
+            return False
+        self._state = state
+        return True
+
+
+def get_config_paths() -> List[Path]:
+    """需要监视的配置文件：config.yaml 及同目录下的 timeline.yaml"""
+    config_path = Path(os.environ.get("CONFIG_PATH", "config/config.yaml"))
+    return [config_path, config_path.parent / "timeline.yaml"]
+
+
+def next_run_time(now: datetime, interval_minutes: int, boundary_times: List[str]) -> datetime:
+    """
+    计算下一次执行时间
+
+    Args:
+        now: 当前时间（配置时区）
+        interval_minutes: 执行间隔（分钟），从零点开始对齐
+        boundary_times: 时间段切换时刻列表（HH:MM）
+
+    Returns:
+        下一次执行时间（严格晚于 now）
+    """
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    elapsed_minutes = int((now - midnight).total_seconds() // 60)
+    step = (elapsed_minutes // interval_minutes + 1) * interval_minutes
+    candidates = [midnight + timedelta(minutes=step)]
+
+    for hhmm in boundary_times:
+        hour, minute = map(int, hhmm.split(":"))
+        boundary = midnight + timedelta(hours=hour, minutes=minute)
+        if boundary <= now:
+            boundary += timedelta(days=1)
+        candidates.append(boundary)
+
+    return min(candidates)
+
+
+class DaemonRunner:
+    """
+    常驻运行器
+
+    使用示例:
+        runner = DaemonRunner(config, load_config, lambda cfg: NewsAnalyzer(config=cfg))
+        runner.run_forever()
+
+    分析器需提供 run(keep_alive=True) 和 close()。
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        load_config_func: Callable[[], Dict[str, Any]],
+        create_analyzer_func: Callable[[Dict[str, Any]], Any],
+        interval_minutes: Optional[int] = None,
+    ):
+        """
+        Args:
+            config: 已加载的配置
+            load_config_func: 重新加载配置的函数
+            create_analyzer_func: 根据配置创建分析器的函数
+            interval_minutes: 执行间隔（分钟），None 时使用配置中的 daemon_interval
+        """
+        self.config = config
+        self._load_config = load_config_func
+        self._create_analyzer = create_analyzer_func
+        self._interval_override = interval_minutes
+        self._watcher = ConfigWatcher(get_config_paths())
+        self._stop_event = threading.Event()
+        self._analyzer = None
+        self._analyzer_date: Optional[str] = None
+
+    @property
+    def timezone(self) -> str:
+        return self.config.get("TIMEZONE", DEFAULT_TIMEZONE)
+
+    @property
+    def interval_minutes(self) -> int:
+        value = self._interval_override or self.config.get("SCHEDULE", {}).get(
+            "daemon_interval", DEFAULT_DAEMON_INTERVAL
+        )
+        return max(1, int(value))
+
+    def stop(self, *_args) -> None:
+        """请求退出（当前执行完成后退出）"""
+        if not self._stop_event.is_set():
+            print("[常驻] 收到退出信号，将在当前执行结束后退出")
+        self._stop_event.set()
+
+    def run_forever(self) -> None:
+        """立即执行一次，之后按调度循环执行，直到收到 SIGTERM / SIGINT"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        print(f"[常驻] 已启动，执行间隔 {self.interval_minutes} 分钟")
+        try:
+            while not self._stop_event.is_set():
+                self._run_once()
+                if self._stop_event.is_set():
+                    break
+                self._wait_until(self._next_run_time())
+        finally:
+            self._close_analyzer()
+            print("[常驻] 已退出")
+
+    # ========================================
+    # 内部方法
+    # ========================================
+
+    def _run_once(self) -> None:
+        """执行一次分析流程（异常不会终止常驻进程）"""
+        self._reload_config_if_changed()
+
+        start = time.perf_counter()
+        try:
+            analyzer = self._get_analyzer()
+            analyzer.run(keep_alive=True)
+        except Exception as e:
+            print(f"[常驻] 本次执行失败: {e}")
+            # 状态可能已不一致，下次执行时重建
+            self._close_analyzer()
+            if self.config.get("DEBUG", False):
+                raise
+        print(f"[常驻] 本次执行耗时 {time.perf_counter() - start:.1f} 秒")
+
+    def _get_analyzer(self):
+        """获取分析器，跨天时重建（触发过期数据清理并关闭前一天的连接）"""
+        today = format_date_folder(None, self.timezone)
+        if self._analyzer is not None and self._analyzer_date != today:
+            print(f"[常驻] 日期变更为 {today}，重建分析器")
+            self._close_analyzer()
+
+        if self._analyzer is None:
+            self._analyzer = self._create_analyzer(self.config)
+            self._analyzer_date = today
+        return self._analyzer
+
+    def _close_analyzer(self) -> None:
+        if self._analyzer is None:
+            return
+        try:
+            self._analyzer.close()
+        except Exception as e:
+            print(f"[常驻] 释放资源失败: {e}")
+        self._analyzer = None
+        self._analyzer_date = None
+
+    def _reload_config_if_changed(self) -> bool:
+        """
+        配置文件变化时重新加载
+
+        Returns:
+            是否已应用新配置（加载失败时继续使用原配置）
+        """
+        if not self._watcher.changed():
+            return False
+
+        print("[常驻] 检测到配置文件变化，重新加载配置")
+        try:
+            config = self._load_config()
+        except Exception as e:
+            print(f"[常驻] 配置重新加载失败，继续使用原配置: {e}")
+            return False
+
+        self.config = config
+        self._close_analyzer()
+        return True
+
+    def _next_run_time(self) -> datetime:
+        boundary_times: List[str] = []
+        try:
+            # 只读取时间线，不涉及 once 去重记录，无需存储后端
+            scheduler = Scheduler(
+                schedule_config=self.config.get("SCHEDULE", {}),
+                timeline_data=self.config.get("_TIMELINE_DATA", {}),
+                storage_backend=None,
+                get_time_func=lambda: get_configured_time(self.timezone),
+            )
+            boundary_times = scheduler.get_boundary_times()
+        except Exception as e:
+            print(f"[常驻] 读取时间段切换时刻失败: {e}")
+
+        return next_run_time(
+            get_configured_time(self.timezone), self.interval_minutes, boundary_times
+        )
+
+    def _wait_until(self, target: datetime) -> None:
+        """等待到指定时间，期间检查退出信号和配置变化"""
+        print(f"[常驻] 下次执行时间: {target.strftime('%Y-%m-%d %H:%M:%S')}")
+        while True:
+            remaining = (target - get_configured_time(self.timezone)).total_seconds()
+            if remaining <= 0:
+                return
+            if self._stop_event.wait(min(remaining, CONFIG_POLL_SECONDS)):
+                return
+            if self._reload_config_if_changed():
+                target = self._next_run_time()
+                print(f"[常驻] 下次执行时间: {target.strftime('%Y-%m-%d %H:%M:%S')}")
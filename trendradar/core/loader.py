@@ -68,10 +68,18 @@ def _load_crawler_config(config_data: Dict) -> Dict:
     advanced = config_data.get("advanced", {})
     crawler_config = advanced.get("crawler", {})
     platforms_config = config_data.get("platforms", {})
+    breaker_config = crawler_config.get("circuit_breaker", {})
     return {
         "REQUEST_INTERVAL": crawler_config.get("request_interval", 100),
         "USE_PROXY": crawler_config.get("use_proxy", False),
         "DEFAULT_PROXY": crawler_config.get("default_proxy", ""),
+        "CRAWLER_MAX_WORKERS": crawler_config.get("max_workers", 1),
+        "CRAWLER_HOST_INTERVAL": crawler_config.get("host_interval", 100),
+        "CIRCUIT_BREAKER": {
+            "FAILURE_THRESHOLD": breaker_config.get("failure_threshold", 3),
+            "COOLDOWN_MINUTES": breaker_config.get("cooldown_minutes", 30),
+            "MAX_COOLDOWN_MINUTES": breaker_config.get("max_cooldown_minutes", 240),
+        },
         "ENABLE_CRAWLER": platforms_config.get("enabled", True),
     }
 
@@ -126,10 +134,14 @@ def _load_schedule_config(config_data: Dict) -> Dict:
 
     enabled = enabled_env if enabled_env is not None else schedule.get("enabled", False)
     preset = preset_env or schedule.get("preset", "always_on")
+    daemon_interval = _get_env_int_or_none("DAEMON_INTERVAL")
+    if daemon_interval is None:
+        daemon_interval = schedule.get("daemon_interval", 30)
 
     return {
         "enabled": enabled,
         "preset": preset,
+        "daemon_interval": daemon_interval,
     }
 
 
@@ -210,12 +222,16 @@ def _load_rss_config(config_data: Dict) -> Dict:
         "ENABLED": rss.get("enabled", False),
         "REQUEST_INTERVAL": advanced_rss.get("request_interval", 2000),
         "TIMEOUT": advanced_rss.get("timeout", 15),
+        "MAX_WORKERS": advanced_rss.get("max_workers", 1),
+        "PARSE_WORKERS": advanced_rss.get("parse_workers", 0),
+        "PARSER": advanced_rss.get("parser", "feedparser"),
         "USE_PROXY": advanced_rss.get("use_proxy", False),
         "PROXY_URL": rss_proxy_url,
         "FEEDS": rss.get("feeds", []),
         "FRESHNESS_FILTER": {
             "ENABLED": freshness_filter.get("enabled", True),  # 默认启用
             "MAX_AGE_DAYS": max_age_days,
+            "FILTER_ON_FETCH": freshness_filter.get("filter_on_fetch", False),
         },
     }
 
@@ -320,10 +336,15 @@ def _load_storage_config(config_data: Dict) -> Dict:
     local = storage.get("local", {})
     remote = storage.get("remote", {})
     pull = storage.get("pull", {})
+    sqlite = storage.get("sqlite", {})
 
     txt_enabled_env = _get_env_bool("STORAGE_TXT_ENABLED")
     html_enabled_env = _get_env_bool("STORAGE_HTML_ENABLED")
     pull_enabled_env = _get_env_bool("PULL_ENABLED")
+    archive_env = _get_env_bool("REMOTE_ARCHIVE")
+    upload = remote.get("upload", {})
+    upload_compat_env = _get_env_bool("REMOTE_UPLOAD_COMPAT")
+    upload_compat = upload_compat_env if upload_compat_env is not None else upload.get("compat", "auto")
 
     return {
         "BACKEND": _get_env_str("STORAGE_BACKEND") or storage.get("backend", "auto"),
@@ -335,6 +356,7 @@ def _load_storage_config(config_data: Dict) -> Dict:
         "LOCAL": {
             "DATA_DIR": local.get("data_dir", "output"),
             "RETENTION_DAYS": _get_env_int("LOCAL_RETENTION_DAYS") or local.get("retention_days", 0),
+            "COMPACT_RANK_HISTORY": local.get("compact_rank_history", True),
         },
         "REMOTE": {
             "ENDPOINT_URL": _get_env_str("S3_ENDPOINT_URL") or remote.get("endpoint_url", ""),
@@ -343,10 +365,27 @@ def _load_storage_config(config_data: Dict) -> Dict:
             "SECRET_ACCESS_KEY": _get_env_str("S3_SECRET_ACCESS_KEY") or remote.get("secret_access_key", ""),
             "REGION": _get_env_str("S3_REGION") or remote.get("region", ""),
             "RETENTION_DAYS": _get_env_int("REMOTE_RETENTION_DAYS") or remote.get("retention_days", 0),
+            "SYNC_MODE": _get_env_str("REMOTE_SYNC_MODE") or remote.get("sync_mode", "full"),
+            "COMPACT_EVERY": _get_env_int("REMOTE_COMPACT_EVERY") or remote.get("compact_every", 12),
+            "CACHE_DIR": _get_env_str("REMOTE_CACHE_DIR") or remote.get("cache_dir", ""),
+            "ARCHIVE": archive_env if archive_env is not None else remote.get("archive", False),
+            "ARCHIVE_FORMAT": _get_env_str("REMOTE_ARCHIVE_FORMAT") or remote.get("archive_format", "gzip"),
+            "UPLOAD": {
+                "PART_SIZE_MB": upload.get("part_size_mb", 8),
+                "MULTIPART_THRESHOLD_MB": upload.get("multipart_threshold_mb", 16),
+                "RETRIES": upload.get("retries", 3),
+                # "auto" 时按服务商自动判断（None）
+                "COMPAT": None if upload_compat == "auto" else bool(upload_compat),
+            },
         },
         "PULL": {
             "ENABLED": pull_enabled_env if pull_enabled_env is not None else pull.get("enabled", False),
             "DAYS": _get_env_int("PULL_DAYS") or pull.get("days", 7),
+            "WORKERS": _get_env_int("PULL_WORKERS") or pull.get("workers", 4),
+        },
+        "SQLITE": {
+            "PROFILE": sqlite.get("profile", "performance"),
+            "PRAGMAS": sqlite.get("pragmas") or {},
         },
     }
 
@@ -270,6 +270,30 @@ class Scheduler:
             return cfg.get("report_mode", "current")
         return ai_mode
 
+    def get_boundary_times(self) -> List[str]:
+        """
+        获取时间线中所有时间段的切换时刻（供常驻模式在时间段切换时立即执行）
+
+        包括各时间段的开始时刻，以及结束后的下一分钟（_in_range 包含结束分钟）。
+
+        Returns:
+            排序后的 HH:MM 列表，调度未启用时为空
+        """
+        if not self.enabled:
+            return []
+
+        times = set()
+        for period in self.timeline.get("periods", {}).values():
+            start = period.get("start")
+            end = period.get("end")
+            if start:
+                times.add(start)
+            if end:
+                hour, minute = map(int, end.split(":"))
+                minutes = (hour * 60 + minute + 1) % (24 * 60)
+                times.add(f"{minutes // 60:02d}:{minutes % 60:02d}")
+        return sorted(times)
+
     def already_executed(self, period_key: str, action: str, date_str: str) -> bool:
         """
         检查指定时间段的某个 action 今天是否已执行
@@ -5,16 +5,25 @@
 负责从 NewsNow API 抓取新闻数据，支持：
 - 单个平台数据获取
 - 批量平台数据爬取
-- 自动重试机制
+- 并发爬取（按主机限流）
+- 连接池复用（keep-alive）
+- 条件请求与内容指纹（识别未变化的平台）
+- 自动重试机制（指数退避 + 抖动）
+- 按平台熔断（跳过持续失败的平台）
 - 代理支持
 """
 
+import hashlib
 import json
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from trendradar.crawler.throttle import HostThrottle
 
 
 class DataFetcher:
@@ -36,6 +45,11 @@ class DataFetcher:
         self,
         proxy_url: Optional[str] = None,
         api_url: Optional[str] = None,
+        max_workers: int = 1,
+        host_interval: int = 100,
+        failure_threshold: int = 3,
+        cooldown_minutes: int = 30,
+        max_cooldown_minutes: int = 240,
     ):
         """
         初始化数据获取器
@@ -43,24 +57,81 @@ class DataFetcher:
         Args:
             proxy_url: 代理服务器 URL（可选）
             api_url: API 基础 URL（可选，默认使用 DEFAULT_API_URL）
+            max_workers: 最大并发请求数（1 表示顺序爬取）
+            host_interval: 并发模式下同一主机相邻请求的最小启动间隔（毫秒）
+            failure_threshold: 连续失败多少次后熔断（0 表示禁用熔断）
+            cooldown_minutes: 首次熔断的冷却时间（分钟），之后每次失败翻倍
+            max_cooldown_minutes: 冷却时间上限（分钟）
         """
         self.proxy_url = proxy_url
         self.api_url = api_url or self.DEFAULT_API_URL
+        self.max_workers = max(1, int(max_workers or 1))
+        self.host_interval = max(0, int(host_interval or 0))
+        # 并发模式下的按主机限流器（由 crawl_websites 设置）
+        self._throttle: Optional[HostThrottle] = None
+        self.session = self._create_session()
+
+        # 平台指纹 {platform_id: {"content_hash", "etag", "last_modified", "payload"}}
+        # 由调用方从当天数据库载入，爬取后更新，供存储层持久化
+        self.fingerprints: Dict[str, Dict] = {}
+        # 最近一次 crawl_websites 中内容未变化的平台
+        self.unchanged_ids: List[str] = []
+
+        # 熔断配置
+        self.failure_threshold = max(0, int(failure_threshold or 0))
+        self.cooldown_minutes = cooldown_minutes
+        self.max_cooldown_minutes = max_cooldown_minutes
+        # 平台健康记录 {platform_id: {"failure_streak", "last_error", "open_until", ...}}
+        # 由调用方从当天数据库载入，爬取后更新，供存储层持久化
+        self.health: Dict[str, Dict] = {}
+
+    def _create_session(self) -> requests.Session:
+        """
+        创建复用连接的会话
+
+        连接池大小与并发数一致，保证并发模式下每个线程都能复用已建立的连接，
+        避免每次请求重新进行 TCP/TLS 握手。
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_workers,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.DEFAULT_HEADERS)
+        if self.proxy_url:
+            session.proxies = {"http": self.proxy_url, "https": self.proxy_url}
+        return session
+
+    def close(self) -> None:
+        """关闭会话，释放连接池"""
+        if self.session:
+            self.session.close()
+
+    def __enter__(self) -> "DataFetcher":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
     def fetch_data(
         self,
         id_info: Union[str, Tuple[str, str]],
         max_retries: int = 2,
-        min_retry_wait: int = 3,
-        max_retry_wait: int = 5,
+        min_retry_wait: float = 1,
+        max_retry_wait: float = 8,
     ) -> Tuple[Optional[str], str, str]:
         """
         获取指定ID数据，支持重试
 
+        重试等待采用指数退避 + 抖动：第 n 次重试等待
+        [base/2, base] 秒，其中 base = min(max_retry_wait, min_retry_wait * 2^(n-1))。
+
         Args:
             id_info: 平台ID 或 (平台ID, 别名) 元组
             max_retries: 最大重试次数
-            min_retry_wait: 最小重试等待时间（秒）
+            min_retry_wait: 首次重试的基础等待时间（秒）
             max_retry_wait: 最大重试等待时间（秒）
 
         Returns:
@@ -73,21 +144,24 @@ class DataFetcher:
             alias = id_value
 
         url = f"{self.api_url}?id={id_value}&latest"
-
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
+        headers = self._conditional_headers(id_value)
 
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(
-                    url,
-                    proxies=proxies,
-                    headers=self.DEFAULT_HEADERS,
-                    timeout=10,
-                )
+                if self._throttle:
+                    with self._throttle.slot(url):
+                        response = self.session.get(url, headers=headers, timeout=10)
+                else:
+                    response = self.session.get(url, headers=headers, timeout=10)
+
+                if response.status_code == 304:
+                    # 服务端确认未变化，复用上次的响应内容
+                    print(f"获取 {id_value} 成功（未变化）")
+                    return self.fingerprints[id_value]["payload"], id_value, alias
+
                 response.raise_for_status()
+                self._remember_validators(id_value, response)
 
                 data_text = response.text
                 data_json = json.loads(data_text)
@@ -102,10 +176,10 @@ class DataFetcher:
 
             except Exception as e:
                 retries += 1
+                self.health.setdefault(id_value, {})["last_error"] = str(e)[:500]
                 if retries <= max_retries:
-                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
-                    additional_wait = (retries - 1) * random.uniform(1, 2)
-                    wait_time = base_wait + additional_wait
+                    base_wait = min(max_retry_wait, min_retry_wait * 2 ** (retries - 1))
+                    wait_time = random.uniform(base_wait / 2, base_wait)
                     print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
                     time.sleep(wait_time)
                 else:
@@ -114,21 +188,218 @@ class DataFetcher:
 
         return None, id_value, alias
 
+    def _conditional_headers(self, id_value: str) -> Optional[Dict[str, str]]:
+        """根据已保存的指纹构建条件请求头（仅在保存了响应内容时发送）"""
+        fingerprint = self.fingerprints.get(id_value)
+        if not fingerprint or not fingerprint.get("payload"):
+            return None
+
+        headers = {}
+        if fingerprint.get("etag"):
+            headers["If-None-Match"] = fingerprint["etag"]
+        if fingerprint.get("last_modified"):
+            headers["If-Modified-Since"] = fingerprint["last_modified"]
+        return headers or None
+
+    def _remember_validators(self, id_value: str, response: requests.Response) -> None:
+        """记录响应中的缓存校验头，供计算指纹时使用"""
+        fingerprint = self.fingerprints.setdefault(id_value, {})
+        fingerprint["_etag"] = response.headers.get("ETag", "")
+        fingerprint["_last_modified"] = response.headers.get("Last-Modified", "")
+
+    @staticmethod
+    def compute_content_hash(response: str) -> str:
+        """
+        计算响应中 items 列表的内容指纹
+
+        只对 items 取哈希，忽略 status、updatedTime 等每次请求都可能变化的字段。
+        """
+        data = json.loads(response)
+        items_text = json.dumps(
+            data.get("items", []), ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha1(items_text.encode("utf-8")).hexdigest()
+
+    def _update_fingerprint(self, id_value: str, response: str) -> bool:
+        """
+        更新平台指纹
+
+        Returns:
+            内容是否与上次指纹一致
+        """
+        fingerprint = self.fingerprints.setdefault(id_value, {})
+        content_hash = self.compute_content_hash(response)
+        unchanged = fingerprint.get("content_hash") == content_hash
+
+        etag = fingerprint.pop("_etag", None)
+        last_modified = fingerprint.pop("_last_modified", None)
+        if etag is not None:
+            # 本次是完整响应（非 304），刷新校验头
+            fingerprint["etag"] = etag
+            fingerprint["last_modified"] = last_modified or ""
+        fingerprint["content_hash"] = content_hash
+        # 只有服务端支持条件请求时才需要保留响应内容（304 时复用）
+        has_validator = fingerprint.get("etag") or fingerprint.get("last_modified")
+        fingerprint["payload"] = response if has_validator else ""
+
+        return unchanged
+
+    @staticmethod
+    def _parse_items(response: str) -> Dict:
+        """
+        解析 API 响应为 {标题: {ranks, url, mobileUrl}} 结构
+
+        Args:
+            response: API 响应文本
+
+        Returns:
+            标题数据字典
+
+        Raises:
+            json.JSONDecodeError: 响应不是合法 JSON
+        """
+        data = json.loads(response)
+        title_data = {}
+
+        for index, item in enumerate(data.get("items", []), 1):
+            title = item.get("title")
+            # 跳过无效标题（None、float、空字符串）
+            if title is None or isinstance(title, float) or not str(title).strip():
+                continue
+            title = str(title).strip()
+            url = item.get("url", "")
+            mobile_url = item.get("mobileUrl", "")
+
+            if title in title_data:
+                title_data[title]["ranks"].append(index)
+            else:
+                title_data[title] = {
+                    "ranks": [index],
+                    "url": url,
+                    "mobileUrl": mobile_url,
+                }
+
+        return title_data
+
+    # ========================================
+    # 熔断与健康记录
+    # ========================================
+
+    def _circuit_state(self, id_value: str) -> str:
+        """
+        获取平台熔断状态
+
+        Returns:
+            "closed"（正常）、"open"（冷却中，跳过）或 "half_open"（冷却结束，试探一次）
+        """
+        if self.failure_threshold <= 0:
+            return "closed"
+
+        record = self.health.get(id_value)
+        if not record or record.get("failure_streak", 0) < self.failure_threshold:
+            return "closed"
+
+        if time.time() < record.get("open_until", 0):
+            return "open"
+        return "half_open"
+
+    def _record_success(self, id_value: str, started: float) -> None:
+        record = self.health.setdefault(id_value, {})
+        record.update({
+            "status": "success",
+            "failure_streak": 0,
+            "last_error": "",
+            "open_until": 0,
+            "duration_ms": int((time.time() - started) * 1000),
+        })
+
+    def _record_failure(self, id_value: str, started: float, error: str) -> None:
+        record = self.health.setdefault(id_value, {})
+        streak = record.get("failure_streak", 0) + 1
+        record.update({
+            "status": "failed",
+            "failure_streak": streak,
+            "last_error": error or record.get("last_error", ""),
+            "duration_ms": int((time.time() - started) * 1000),
+        })
+
+        if self.failure_threshold > 0 and streak >= self.failure_threshold:
+            # 冷却时间随连续失败次数指数增长，并加入 ±10% 抖动避免同时恢复
+            exponent = streak - self.failure_threshold
+            cooldown = min(self.max_cooldown_minutes, self.cooldown_minutes * 2 ** exponent)
+            cooldown *= random.uniform(0.9, 1.1)
+            record["open_until"] = time.time() + cooldown * 60
+            print(f"{id_value} 连续失败 {streak} 次，熔断 {cooldown:.0f} 分钟")
+
+    def _record_skipped(self, id_value: str) -> None:
+        record = self.health[id_value]
+        remaining = max(0, record.get("open_until", 0) - time.time()) / 60
+        record["status"] = "skipped"
+        record["duration_ms"] = 0
+        print(f"跳过 {id_value}：熔断中（连续失败 {record.get('failure_streak', 0)} 次，剩余 {remaining:.0f} 分钟）")
+
+    def _fetch_and_parse(self, id_info: Union[str, Tuple[str, str]]) -> Optional[Dict]:
+        """获取并解析单个平台数据（受熔断控制），失败返回 None"""
+        id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+
+        state = self._circuit_state(id_value)
+        if state == "open":
+            self._record_skipped(id_value)
+            return None
+
+        started = time.time()
+        # 冷却结束后只试探一次，不重试
+        max_retries = 0 if state == "half_open" else 2
+        response, _, _ = self.fetch_data(id_info, max_retries=max_retries)
+        if not response:
+            self._record_failure(id_value, started, self.health.get(id_value, {}).get("last_error", ""))
+            return None
+
+        try:
+            title_data = self._parse_items(response)
+            if self._update_fingerprint(id_value, response):
+                self.unchanged_ids.append(id_value)
+            self._record_success(id_value, started)
+            return title_data
+        except json.JSONDecodeError:
+            print(f"解析 {id_value} 响应失败")
+            self._record_failure(id_value, started, "响应解析失败")
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+            self._record_failure(id_value, started, str(e))
+        return None
+
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: int = 100,
+        max_workers: Optional[int] = None,
+        host_interval: Optional[int] = None,
     ) -> Tuple[Dict, Dict, List]:
         """
         爬取多个网站数据
 
+        max_workers > 1 时启用并发模式：线程池并发请求，同一主机的相邻请求
+        按 host_interval 错开启动（不使用 request_interval），重试等待不会阻塞其他平台。
+        热榜平台都在同一个 API 主机上，启动间隔决定了并发模式的总耗时下限
+        （约为 平台数 × host_interval），因此默认值远小于顺序模式的请求间隔。
+        结果顺序与 ids_list 保持一致。
+
         Args:
             ids_list: 平台ID列表，每个元素可以是字符串或 (平台ID, 别名) 元组
-            request_interval: 请求间隔（毫秒）
+            request_interval: 顺序模式下的请求间隔（毫秒）
+            max_workers: 最大并发请求数（默认使用初始化时的设置）
+            host_interval: 并发模式下同一主机的最小启动间隔（毫秒，默认使用初始化时的设置）
 
         Returns:
             (结果字典, ID到名称的映射, 失败ID列表) 元组
         """
+        workers = self.max_workers if max_workers is None else max(1, max_workers)
+        self.unchanged_ids = []
+        if workers > 1 and len(ids_list) > 1:
+            interval = self.host_interval if host_interval is None else max(0, host_interval)
+            return self._crawl_concurrently(ids_list, interval, workers)
+
         results = {}
         id_to_name = {}
         failed_ids = []
@@ -141,36 +412,10 @@ class DataFetcher:
                 name = id_value
 
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
+            title_data = self._fetch_and_parse(id_info)
+
+            if title_data is not None:
+                results[id_value] = title_data
             else:
                 failed_ids.append(id_value)
 
@@ -180,5 +425,59 @@ class DataFetcher:
                 actual_interval = max(50, actual_interval)
                 time.sleep(actual_interval / 1000)
 
-        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        self._report(results, failed_ids)
+        return results, id_to_name, failed_ids
+
+    def _crawl_concurrently(
+        self,
+        ids_list: List[Union[str, Tuple[str, str]]],
+        host_interval: int,
+        workers: int,
+    ) -> Tuple[Dict, Dict, List]:
+        """并发爬取多个平台（按主机限流）"""
+        id_to_name = {}
+        for id_info in ids_list:
+            if isinstance(id_info, tuple):
+                id_to_name[id_info[0]] = id_info[1]
+            else:
+                id_to_name[id_info] = id_info
+
+        workers = min(workers, len(ids_list))
+        print(f"并发爬取 {len(ids_list)} 个平台，并发数 {workers}，同一主机启动间隔 {host_interval} 毫秒")
+
+        self._throttle = HostThrottle(
+            min_interval_ms=host_interval,
+            max_per_host=workers,
+        )
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="crawler"
+            ) as executor:
+                futures = [
+                    executor.submit(self._fetch_and_parse, id_info)
+                    for id_info in ids_list
+                ]
+                outcomes = [future.result() for future in futures]
+        finally:
+            self._throttle = None
+
+        results = {}
+        failed_ids = []
+        for id_info, title_data in zip(ids_list, outcomes):
+            id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+            if title_data is not None:
+                results[id_value] = title_data
+            else:
+                failed_ids.append(id_value)
+
+        self._report(results, failed_ids)
         return results, id_to_name, failed_ids
+
+    def _report(self, results: Dict, failed_ids: List) -> None:
+        """输出爬取汇总"""
+        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        if self.unchanged_ids:
+            # 保持与 ids 顺序一致（并发模式下完成顺序不确定）
+            unchanged = set(self.unchanged_ids)
+            self.unchanged_ids = [i for i in results if i in unchanged]
+            print(f"内容未变化: {self.unchanged_ids}")
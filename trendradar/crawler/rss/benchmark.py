@@ -0,0 +1,100 @@
+# coding=utf-8
+"""
+RSS 解析后端基准测试
+
+对录制的 Feed 文件分别使用 feedparser 和 fast 后端解析，比较耗时并核对结果一致性。
+
+用法:
+    python -m trendradar.crawler.rss.benchmark feeds/*.xml
+    python -m trendradar.crawler.rss.benchmark feeds/*.xml --rounds 20 --max-items 20
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from .parser import PARSER_BACKENDS, ParsedRSSItem, RSSParser
+
+
+def _time_parse(parser: RSSParser, content: str, rounds: int, max_items: int) -> float:
+    """返回单次解析的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parser.parse(content, max_items=max_items)
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def _diff_items(base: List[ParsedRSSItem], other: List[ParsedRSSItem]) -> List[str]:
+    """比较两个后端的解析结果，返回差异说明"""
+    diffs = []
+    if len(base) != len(other):
+        diffs.append(f"条目数 {len(base)} != {len(other)}")
+    for index, (a, b) in enumerate(zip(base, other)):
+        for field in ("title", "url", "published_at"):
+            if getattr(a, field) != getattr(b, field):
+                diffs.append(f"#{index} {field}: {getattr(a, field)!r} != {getattr(b, field)!r}")
+    return diffs
+
+
+def run_benchmark(paths: List[Path], rounds: int = 10, max_items: int = 0) -> Dict[str, float]:
+    """
+    运行基准测试并打印每个文件的结果
+
+    Returns:
+        各后端的总耗时（毫秒）
+    """
+    parsers = {backend: RSSParser(backend=backend) for backend in PARSER_BACKENDS}
+    totals = {backend: 0.0 for backend in PARSER_BACKENDS}
+
+    header = f"{'文件':<32} {'大小':>8} " + " ".join(f"{b + '(ms)':>14}" for b in PARSER_BACKENDS) + "  一致性"
+    print(header)
+    print("-" * len(header))
+
+    for path in paths:
+        content = path.read_text(encoding="utf-8", errors="replace")
+
+        results = {}
+        timings = {}
+        for backend, parser in parsers.items():
+            try:
+                results[backend] = parser.parse(content, str(path), max_items=max_items)
+                timings[backend] = _time_parse(parser, content, rounds, max_items)
+            except Exception as e:
+                results[backend] = []
+                timings[backend] = float("nan")
+                print(f"[{backend}] {path.name} 解析失败: {e}")
+            totals[backend] += timings[backend]
+
+        diffs = _diff_items(results["feedparser"], results["fast"])
+        size_kb = f"{len(content.encode('utf-8')) / 1024:.1f}KB"
+        cells = " ".join(f"{timings[b]:>14.2f}" for b in PARSER_BACKENDS)
+        print(f"{path.name[:32]:<32} {size_kb:>8} {cells}  {'一致' if not diffs else f'{len(diffs)} 处差异'}")
+        for diff in diffs[:5]:
+            print(f"    {diff}")
+
+    print("-" * len(header))
+    base = totals["feedparser"]
+    for backend in PARSER_BACKENDS:
+        ratio = f"{base / totals[backend]:.1f}x" if totals[backend] else "-"
+        print(f"{backend:<12} 总计 {totals[backend]:.2f} ms  (相对 feedparser {ratio})")
+
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="比较 RSS 解析后端的性能与结果一致性")
+    parser.add_argument("files", nargs="+", help="录制的 Feed 文件（XML/JSON）")
+    parser.add_argument("--rounds", type=int, default=10, help="每个文件的解析次数（默认 10）")
+    parser.add_argument("--max-items", type=int, default=0, help="每个 Feed 最多解析的条目数（0=不限制）")
+    args = parser.parse_args()
+
+    paths = [Path(f) for f in args.files if Path(f).is_file()]
+    if not paths:
+        parser.error("没有可用的 Feed 文件")
+
+    run_benchmark(paths, rounds=max(1, args.rounds), max_items=args.max_items)
+
+
+if __name__ == "__main__":
+    main()
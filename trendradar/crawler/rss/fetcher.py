@@ -2,22 +2,33 @@
 """
 RSS 抓取器
 
-负责从配置的 RSS 源抓取数据并转换为标准格式
+负责从配置的 RSS 源抓取数据并转换为标准格式。
+启用解析进程池时，下载与解析以流水线方式重叠执行：
+下载线程拿到内容后立即提交给进程池解析，继续下载下一个源。
 """
 
+import re
 import time
 import random
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple, Callable
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple, Callable, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from .parser import RSSParser, ParsedRSSItem
+from .parser import FeedContent, RSSParser, ParsedRSSItem, parse_feed_content
+from trendradar.crawler.throttle import HostThrottle
 from trendradar.storage.base import RSSItem, RSSData
 from trendradar.utils.time import get_configured_time, is_within_days, DEFAULT_TIMEZONE
 
 
+# Content-Type 中的字符集
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
 @dataclass
 class RSSFeedConfig:
     """RSS 源配置"""
@@ -42,19 +53,27 @@ class RSSFetcher:
         timezone: str = DEFAULT_TIMEZONE,
         freshness_enabled: bool = True,
         default_max_age_days: int = 3,
+        max_workers: int = 1,
+        parse_workers: int = 0,
+        parser_backend: str = "feedparser",
+        filter_on_fetch: bool = False,
     ):
         """
         初始化抓取器
 
         Args:
             feeds: RSS 源配置列表
-            request_interval: 请求间隔（毫秒）
+            request_interval: 请求间隔（毫秒），并发模式下为同一主机相邻请求的间隔
             timeout: 请求超时（秒）
             use_proxy: 是否使用代理
             proxy_url: 代理 URL
             timezone: 时区配置（如 'Asia/Shanghai'）
             freshness_enabled: 是否启用新鲜度过滤
             default_max_age_days: 默认最大文章年龄（天）
+            max_workers: 全局最大并发请求数（1 表示顺序抓取）
+            parse_workers: 解析进程数（0 表示在抓取线程内解析）
+            parser_backend: 解析后端（"feedparser" 或 "fast"）
+            filter_on_fetch: 是否在解析阶段就丢弃超出新鲜度的文章（不再入库）
         """
         self.feeds = [f for f in feeds if f.enabled]
         self.request_interval = request_interval
@@ -64,13 +83,28 @@ class RSSFetcher:
         self.timezone = timezone
         self.freshness_enabled = freshness_enabled
         self.default_max_age_days = default_max_age_days
-
-        self.parser = RSSParser()
+        self.filter_on_fetch = filter_on_fetch
+        self.max_workers = max(1, int(max_workers or 1))
+        self.parse_workers = max(0, int(parse_workers or 0))
+        # fetch_all 期间的解析进程池
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+        # HTTP 校验头 {feed_id: {"etag", "last_modified"}}
+        # 由调用方从当天数据库载入，抓取后更新，随 RSSData 持久化
+        self.validators: Dict[str, Dict] = {}
+        # 最近一次 fetch_all 中返回 304（未变化）的源
+        self.unchanged_ids: List[str] = []
+
+        self.parser = RSSParser(backend=parser_backend)
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
         """创建请求会话"""
         session = requests.Session()
+        # 每个主机一个连接池（同一主机串行请求），池的数量覆盖并发涉及的主机
+        adapter = HTTPAdapter(pool_connections=max(10, self.max_workers * 2))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         session.headers.update({
             "User-Agent": "TrendRadar/2.0 RSS Reader (https://github.com/trendradar)",
             "Accept": "application/feed+json, application/json, application/rss+xml, application/atom+xml, application/xml, text/xml, */*",
@@ -127,72 +161,149 @@ class RSSFetcher:
         filtered_count = len(items) - len(filtered)
         return filtered, filtered_count
 
-    def fetch_feed(self, feed: RSSFeedConfig) -> Tuple[List[RSSItem], Optional[str]]:
+    def _published_after(self, feed: RSSFeedConfig) -> Optional[datetime]:
         """
-        抓取单个 RSS 源
+        解析阶段的发布时间下限（UTC，无时区）
 
-        Args:
-            feed: RSS 源配置
+        仅在启用 filter_on_fetch 时生效，判定规则与 _filter_by_freshness 一致。
+        """
+        if not (self.freshness_enabled and self.filter_on_fetch):
+            return None
+
+        max_days = feed.max_age_days
+        if max_days is None:
+            max_days = self.default_max_age_days
+        if max_days <= 0:
+            return None
+
+        now_utc = get_configured_time("UTC").replace(tzinfo=None)
+        return now_utc - timedelta(days=max_days)
+
+    def _parse_content(self, feed: RSSFeedConfig, content: FeedContent) -> List[ParsedRSSItem]:
+        """调用解析器（条目数限制和时间过滤下推到解析阶段）"""
+        return self.parser.parse(content, feed.url, feed.max_items, self._published_after(feed))
+
+    def _conditional_headers(self, feed_id: str) -> Optional[Dict[str, str]]:
+        """根据已保存的校验头构建条件请求头"""
+        validator = self.validators.get(feed_id)
+        if not validator:
+            return None
+
+        headers = {}
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+        return headers or None
+
+    def _response_body(self, response: requests.Response) -> FeedContent:
+        """
+        取出响应内容
+
+        fast 后端直接使用原始字节，由解析器按 XML 声明流式解码；
+        HTTP 头显式指定了非 UTF-8 字符集时，仍按该字符集解码为文本（HTTP 头优先于 XML 声明）。
+        """
+        if self.parser.backend != "fast":
+            return response.text
+        match = _CHARSET_RE.search(response.headers.get("Content-Type", ""))
+        if match and match.group(1).lower() not in ("utf-8", "utf8", "us-ascii"):
+            return response.text
+        return response.content
+
+    def _download_feed(self, feed: RSSFeedConfig) -> Tuple[Optional[FeedContent], Optional[str]]:
+        """
+        下载单个 RSS 源内容
 
         Returns:
-            (条目列表, 错误信息) 元组
+            (内容, 错误信息) 元组；返回 304 时两者均为 None
         """
         try:
-            response = self.session.get(feed.url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self.session.get(
+                feed.url,
+                headers=self._conditional_headers(feed.id),
+                timeout=self.timeout,
+            )
+
+            if response.status_code == 304:
+                # 未变化：不解析，视为没有新条目
+                self.unchanged_ids.append(feed.id)
+                print(f"[RSS] {feed.name}: 未变化 (304)")
+                return None, None
 
-            parsed_items = self.parser.parse(response.text, feed.url)
-
-            # 限制条目数量（0=不限制）
-            if feed.max_items > 0:
-                parsed_items = parsed_items[:feed.max_items]
-
-            # 转换为 RSSItem（使用配置的时区）
-            now = get_configured_time(self.timezone)
-            crawl_time = now.strftime("%H:%M")
-            items = []
-
-            for parsed in parsed_items:
-                item = RSSItem(
-                    title=parsed.title,
-                    feed_id=feed.id,
-                    feed_name=feed.name,
-                    url=parsed.url,
-                    published_at=parsed.published_at or "",
-                    summary=parsed.summary or "",
-                    author=parsed.author or "",
-                    crawl_time=crawl_time,
-                    first_time=crawl_time,
-                    last_time=crawl_time,
-                    count=1,
-                )
-                items.append(item)
-
-            # 注意：新鲜度过滤已移至推送阶段（_convert_rss_items_to_list）
-            # 这样所有文章都会存入数据库，但旧文章不会推送
-            print(f"[RSS] {feed.name}: 获取 {len(items)} 条")
-            return items, None
+            response.raise_for_status()
+            self.validators[feed.id] = {
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+            }
+            return self._response_body(response), None
 
         except requests.Timeout:
             error = f"请求超时 ({self.timeout}s)"
-            print(f"[RSS] {feed.name}: {error}")
-            return [], error
-
         except requests.RequestException as e:
             error = f"请求失败: {e}"
-            print(f"[RSS] {feed.name}: {error}")
-            return [], error
+        except Exception as e:
+            error = f"未知错误: {e}"
 
-        except ValueError as e:
-            error = f"解析失败: {e}"
-            print(f"[RSS] {feed.name}: {error}")
-            return [], error
+        print(f"[RSS] {feed.name}: {error}")
+        return None, error
 
-        except Exception as e:
+    def _parse_error(self, feed: RSSFeedConfig, e: Exception) -> Tuple[List[RSSItem], str]:
+        """格式化解析阶段的错误"""
+        if isinstance(e, ValueError):
+            error = f"解析失败: {e}"
+        else:
             error = f"未知错误: {e}"
-            print(f"[RSS] {feed.name}: {error}")
+        print(f"[RSS] {feed.name}: {error}")
+        return [], error
+
+    def _convert_parsed_items(
+        self,
+        feed: RSSFeedConfig,
+        parsed_items: List[ParsedRSSItem],
+    ) -> List[RSSItem]:
+        """将解析结果转换为 RSSItem（条目数限制已在解析阶段完成）"""
+        # 转换为 RSSItem（使用配置的时区）
+        now = get_configured_time(self.timezone)
+        crawl_time = now.strftime("%H:%M")
+        items = []
+
+        for parsed in parsed_items:
+            item = RSSItem(
+                title=parsed.title,
+                feed_id=feed.id,
+                feed_name=feed.name,
+                url=parsed.url,
+                published_at=parsed.published_at or "",
+                summary=parsed.summary or "",
+                author=parsed.author or "",
+                crawl_time=crawl_time,
+                first_time=crawl_time,
+                last_time=crawl_time,
+                count=1,
+            )
+            items.append(item)
+
+        # 注意：新鲜度过滤默认在推送阶段（_convert_rss_items_to_list）
+        # 这样所有文章都会存入数据库，但旧文章不会推送；启用 filter_on_fetch 时在解析阶段过滤
+        print(f"[RSS] {feed.name}: 获取 {len(items)} 条")
+        return items
+
+    def fetch_feed(self, feed: RSSFeedConfig) -> Tuple[List[RSSItem], Optional[str]]:
+        """
+        抓取单个 RSS 源
+
+        Args:
+            feed: RSS 源配置
+
+        Returns:
+            (条目列表, 错误信息) 元组
+        """
+        content, error = self._download_feed(feed)
+        if error or content is None:
             return [], error
 
+        return self._parse_inline(feed, content)
+
     def fetch_all(self) -> RSSData:
         """
         抓取所有 RSS 源
@@ -210,25 +321,44 @@ class RSSFetcher:
         crawl_date = now.strftime("%Y-%m-%d")
 
         print(f"[RSS] 开始抓取 {len(self.feeds)} 个 RSS 源...")
+        self.unchanged_ids = []
 
-        for i, feed in enumerate(self.feeds):
-            # 请求间隔（带随机波动）
-            if i > 0:
-                interval = self.request_interval / 1000
-                jitter = random.uniform(-0.2, 0.2) * interval
-                time.sleep(interval + jitter)
-
-            items, error = self.fetch_feed(feed)
-
+        # 需在启动下载线程之前创建进程池（fork 时进程内只有主线程）
+        self._parse_pool = self._start_parse_pool()
+        try:
+            if self.max_workers > 1 and len(self.feeds) > 1:
+                stages = self._fetch_concurrently()
+            else:
+                stages = []
+                for i, feed in enumerate(self.feeds):
+                    # 请求间隔（带随机波动）
+                    if i > 0:
+                        interval = self.request_interval / 1000
+                        jitter = random.uniform(-0.2, 0.2) * interval
+                        time.sleep(interval + jitter)
+
+                    stages.append(self._fetch_stage(feed))
+
+            outcomes = [self._finish_stage(feed, stage) for feed, stage in zip(self.feeds, stages)]
+        finally:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+
+        unchanged = set(self.unchanged_ids)
+        unchanged_ids = [feed.id for feed in self.feeds if feed.id in unchanged]
+
+        for feed, (items, error) in zip(self.feeds, outcomes):
             id_to_name[feed.id] = feed.name
 
             if error:
                 failed_ids.append(feed.id)
-            else:
+            elif feed.id not in unchanged:
                 all_items[feed.id] = items
 
         total_items = sum(len(items) for items in all_items.values())
-        print(f"[RSS] 抓取完成: {len(all_items)} 个源成功, {len(failed_ids)} 个失败, 共 {total_items} 条")
+        print(f"[RSS] 抓取完成: {len(all_items)} 个源成功, {len(unchanged_ids)} 个未变化, "
+              f"{len(failed_ids)} 个失败, 共 {total_items} 条")
 
         return RSSData(
             date=crawl_date,
@@ -236,8 +366,111 @@ class RSSFetcher:
             items=all_items,
             id_to_name=id_to_name,
             failed_ids=failed_ids,
+            unchanged_ids=unchanged_ids,
+            validators={feed_id: self.validators[feed_id] for feed_id in all_items if feed_id in self.validators},
         )
 
+    def _start_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        """创建解析进程池，不可用时返回 None（回退到线程内解析）"""
+        if self.parse_workers <= 0 or not self.feeds:
+            return None
+
+        workers = min(self.parse_workers, len(self.feeds))
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            # 预热：让工作进程在下载线程启动前就绪
+            pool.submit(int).result()
+            print(f"[RSS] 解析进程池已启动，进程数 {workers}")
+            return pool
+        except Exception as e:
+            print(f"[RSS] 解析进程池不可用，改为线程内解析: {e}")
+            return None
+
+    def _fetch_stage(self, feed: RSSFeedConfig) -> Union[Tuple[List[RSSItem], Optional[str]], Tuple[Future, FeedContent]]:
+        """
+        流水线的抓取阶段
+
+        启用进程池时，下载完成后把内容提交给进程池解析，立即返回 (Future, 内容)；
+        否则就地解析，返回 (条目列表, 错误信息)。
+        """
+        if self._parse_pool is None:
+            return self.fetch_feed(feed)
+
+        content, error = self._download_feed(feed)
+        if error or content is None:
+            return [], error
+
+        try:
+            future = self._parse_pool.submit(
+                parse_feed_content, content, feed.url,
+                self.parser.max_summary_length, self.parser.backend,
+                feed.max_items, self._published_after(feed),
+            )
+            return future, content
+        except (BrokenProcessPool, RuntimeError):
+            return self._parse_inline(feed, content)
+
+    def _parse_inline(self, feed: RSSFeedConfig, content: FeedContent) -> Tuple[List[RSSItem], Optional[str]]:
+        """在当前线程解析内容"""
+        try:
+            parsed_items = self._parse_content(feed, content)
+            return self._convert_parsed_items(feed, parsed_items), None
+        except Exception as e:
+            return self._parse_error(feed, e)
+
+    def _finish_stage(
+        self,
+        feed: RSSFeedConfig,
+        stage: Union[Tuple[List[RSSItem], Optional[str]], Tuple[Future, FeedContent]],
+    ) -> Tuple[List[RSSItem], Optional[str]]:
+        """流水线的收尾阶段：等待进程池解析结果并转换为 RSSItem"""
+        if not isinstance(stage[0], Future):
+            return stage
+
+        future, content = stage
+        try:
+            parsed_items = future.result()
+        except BrokenProcessPool:
+            # 工作进程异常退出，回退到线程内解析
+            return self._parse_inline(feed, content)
+        except Exception as e:
+            return self._parse_error(feed, e)
+
+        return self._convert_parsed_items(feed, parsed_items), None
+
+    def _fetch_concurrently(self) -> List[Union[Tuple[List[RSSItem], Optional[str]], Tuple[Future, FeedContent]]]:
+        """
+        并发抓取所有 RSS 源
+
+        按主机分组：不同主机的分组并行抓取（受全局并发上限约束）；
+        同一主机的源在一个任务内串行抓取，相邻请求之间保持 request_interval 间隔，
+        不会占用其他主机的并发名额。结果顺序与 self.feeds 一致。
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, feed in enumerate(self.feeds):
+            groups.setdefault(HostThrottle.host_of(feed.url), []).append(index)
+
+        workers = min(self.max_workers, len(groups))
+        print(f"[RSS] 并发抓取，并发数 {workers}，涉及 {len(groups)} 个主机")
+
+        stages: List = [([], None)] * len(self.feeds)
+
+        def fetch_host_group(indexes: List[int]) -> None:
+            for position, index in enumerate(indexes):
+                if position > 0:
+                    interval = self.request_interval / 1000
+                    jitter = random.uniform(-0.2, 0.2) * interval
+                    time.sleep(interval + jitter)
+                stages[index] = self._fetch_stage(self.feeds[index])
+
+        # 源数量多的主机先开始，避免其成为最后的长尾
+        ordered_groups = sorted(groups.values(), key=len, reverse=True)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss") as executor:
+            for future in [executor.submit(fetch_host_group, g) for g in ordered_groups]:
+                future.result()
+
+        return stages
+
     @classmethod
     def from_config(cls, config: Dict) -> "RSSFetcher":
         """
@@ -248,9 +481,13 @@ class RSSFetcher:
                 {
                     "enabled": true,
                     "request_interval": 2000,
+                    "max_workers": 8,
+                    "parse_workers": 2,
+                    "parser": "fast",
                     "freshness_filter": {
                         "enabled": true,
-                        "max_age_days": 3
+                        "max_age_days": 3,
+                        "filter_on_fetch": false
                     },
                     "feeds": [
                         {"id": "hacker-news", "name": "Hacker News", "url": "...", "max_age_days": 1}
@@ -264,6 +501,7 @@ class RSSFetcher:
         freshness_config = config.get("freshness_filter", {})
         freshness_enabled = freshness_config.get("enabled", True)  # 默认启用
         default_max_age_days = freshness_config.get("max_age_days", 3)  # 默认3天
+        filter_on_fetch = freshness_config.get("filter_on_fetch", False)  # 默认推送阶段过滤
 
         feeds = []
         for feed_config in config.get("feeds", []):
@@ -302,4 +540,8 @@ class RSSFetcher:
             timezone=config.get("timezone", DEFAULT_TIMEZONE),
             freshness_enabled=freshness_enabled,
             default_max_age_days=default_max_age_days,
+            filter_on_fetch=filter_on_fetch,
+            max_workers=config.get("max_workers", 1),
+            parse_workers=config.get("parse_workers", 0),
+            parser_backend=config.get("parser", "feedparser"),
         )
@@ -3,22 +3,51 @@
 RSS 解析器
 
 支持 RSS 2.0、Atom 和 JSON Feed 1.1 格式的解析
+
+解析后端：
+- feedparser: 通用解析（默认），兼容各种不规范的 Feed
+- fast: 基于 xml.etree.ElementTree.iterparse 的流式解析，只提取所需字段，
+  达到 max_items 后立即停止；遇到格式错误、非 RSS 2.0 / Atom 格式或 expat 不支持的
+  多字节编码（如 GBK）时自动回退到 feedparser
+
+Feed 内容可以是 str 或原始字节：字节由 XML 声明 / BOM 决定编码，直接流式解析，
+不会先整体解码再重新编码。
 """
 
 import re
 import html
+import importlib.util
 import json
+import xml.etree.ElementTree as ET
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from io import BytesIO, StringIO
+from typing import List, Optional, Dict, Any, Union
 from email.utils import parsedate_to_datetime
 
-try:
-    import feedparser
-    HAS_FEEDPARSER = True
-except ImportError:
-    HAS_FEEDPARSER = False
-    feedparser = None
+# feedparser 导入较慢，只检查是否安装，首次解析时再导入（fast 后端可完全不加载）
+HAS_FEEDPARSER = importlib.util.find_spec("feedparser") is not None
+
+
+# 解析后端
+PARSER_BACKENDS = ("feedparser", "fast")
+
+# XML 命名空间
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+_DC_NS = "http://purl.org/dc/elements/1.1/"
+_CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+
+# Feed 内容：已解码的文本或 HTTP 响应的原始字节
+FeedContent = Union[str, bytes]
+
+
+class _FastPathUnsupported(Exception):
+    """快速解析不支持该内容，需回退到 feedparser"""
+
+
+def _local_name(tag: str) -> str:
+    """去除命名空间前缀"""
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
 
 
 @dataclass
@@ -35,47 +64,280 @@ class ParsedRSSItem:
 class RSSParser:
     """RSS 解析器"""
 
-    def __init__(self, max_summary_length: int = 500):
+    def __init__(self, max_summary_length: int = 500, backend: str = "feedparser"):
         """
         初始化解析器
 
         Args:
             max_summary_length: 摘要最大长度
+            backend: 解析后端（"feedparser" 或 "fast"）
         """
-        if not HAS_FEEDPARSER:
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"未知的 RSS 解析后端: {backend}（可选: {', '.join(PARSER_BACKENDS)}）")
+        if backend == "feedparser" and not HAS_FEEDPARSER:
             raise ImportError("RSS 解析需要安装 feedparser: pip install feedparser")
 
         self.max_summary_length = max_summary_length
-
-    def parse(self, content: str, feed_url: str = "") -> List[ParsedRSSItem]:
+        self.backend = backend
+
+    def parse(
+        self,
+        content: FeedContent,
+        feed_url: str = "",
+        max_items: int = 0,
+        published_after: Optional[datetime] = None,
+    ) -> List[ParsedRSSItem]:
         """
         解析 RSS/Atom/JSON Feed 内容
 
+        条目数限制和发布时间过滤在解析过程中完成：超出 max_items 的条目不再处理，
+        早于 published_after 的条目只解析日期，不做文本清理和对象构建。
+
         Args:
-            content: Feed 内容（XML 或 JSON）
+            content: Feed 内容（XML 或 JSON），str 或原始字节
             feed_url: Feed URL（用于错误提示）
+            max_items: 最多处理的条目数（0=不限制），按 Feed 中的顺序计数，
+                被时间过滤掉的条目同样占用名额
+            published_after: 发布时间下限（UTC，无时区），为 None 时不过滤；
+                无发布时间的条目始终保留
 
         Returns:
             解析后的条目列表
         """
-        # 先尝试检测 JSON Feed
-        if self._is_json_feed(content):
-            return self._parse_json_feed(content, feed_url)
+        # 先尝试检测 JSON Feed（JSON 规定使用 UTF-8）
+        if isinstance(content, bytes) and content.lstrip()[:1] == b"{":
+            text = content.decode("utf-8", errors="replace")
+            if self._is_json_feed(text):
+                return self._parse_json_feed(text, feed_url, max_items, published_after)
+        elif isinstance(content, str) and self._is_json_feed(content):
+            return self._parse_json_feed(content, feed_url, max_items, published_after)
+
+        if self.backend == "fast":
+            try:
+                return self._parse_xml_fast(content, max_items, published_after)
+            except (ET.ParseError, _FastPathUnsupported):
+                if not HAS_FEEDPARSER:
+                    raise ValueError(f"RSS 解析失败 ({feed_url}): 快速解析不支持该内容，且未安装 feedparser")
+
+        return self._parse_with_feedparser(content, feed_url, max_items, published_after)
+
+    @staticmethod
+    def _is_stale(published_at: Optional[str], published_after: Optional[datetime]) -> bool:
+        """判断发布时间是否早于下限（无法判断时视为新鲜）"""
+        if published_after is None or not published_at:
+            return False
+        try:
+            dt = datetime.fromisoformat(published_at)
+        except ValueError:
+            return False
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt < published_after
+
+    def _parse_with_feedparser(
+        self,
+        content: FeedContent,
+        feed_url: str,
+        max_items: int = 0,
+        published_after: Optional[datetime] = None,
+    ) -> List[ParsedRSSItem]:
+        """使用 feedparser 解析 RSS/Atom（字节内容由 feedparser 按 XML 声明 / BOM 解码）"""
+        import feedparser
 
-        # 使用 feedparser 解析 RSS/Atom
         feed = feedparser.parse(content)
 
         if feed.bozo and not feed.entries:
             raise ValueError(f"RSS 解析失败 ({feed_url}): {feed.bozo_exception}")
 
         items = []
+        position = 0
         for entry in feed.entries:
-            item = self._parse_entry(entry)
+            if max_items > 0 and position >= max_items:
+                break
+
+            published_at = self._parse_date(entry)
+            if self._is_stale(published_at, published_after):
+                if entry.get("title"):
+                    position += 1
+                continue
+
+            item = self._parse_entry(entry, published_at)
             if item:
                 items.append(item)
+                position += 1
+
+        return items
+
+    # ========================================
+    # 快速解析（iterparse）
+    # ========================================
+
+    def _parse_xml_fast(
+        self,
+        content: FeedContent,
+        max_items: int = 0,
+        published_after: Optional[datetime] = None,
+    ) -> List[ParsedRSSItem]:
+        """
+        流式解析 RSS 2.0 / Atom
+
+        只提取标题、链接、日期、摘要、作者和 GUID，每个条目解析完即释放，
+        达到 max_items 后停止读取剩余内容。
+
+        Raises:
+            ET.ParseError: XML 格式错误
+            _FastPathUnsupported: 非 RSS 2.0 / Atom 格式（如 RSS 1.0/RDF），或 expat 不支持的编码
+        """
+        # 字节直接交给 expat（按 XML 声明解码）；str 已解码，expat 会忽略其中声明的编码
+        source = BytesIO(content) if isinstance(content, bytes) else StringIO(content)
+
+        items: List[ParsedRSSItem] = []
+        position = 0
+        is_atom = None
+
+        for event, elem in self._iterparse(source):
+            if is_atom is None:
+                root = _local_name(elem.tag)
+                if root == "rss":
+                    is_atom = False
+                elif root == "feed" and elem.tag.startswith("{" + _ATOM_NS):
+                    is_atom = True
+                else:
+                    raise _FastPathUnsupported(root)
+                continue
+
+            if event != "end":
+                continue
+
+            name = _local_name(elem.tag)
+            if (is_atom and name == "entry") or (not is_atom and name == "item"):
+                fields = self._collect_fast_fields(elem, is_atom)
+                elem.clear()
+
+                published_at = self._parse_fast_date(
+                    fields.get("published") or fields.get("pubDate")
+                    or fields.get("updated") or fields.get("dc_date")
+                )
+                if self._is_stale(published_at, published_after):
+                    if fields.get("title", "").strip():
+                        position += 1
+                else:
+                    item = self._build_fast_item(fields, published_at)
+                    if item:
+                        items.append(item)
+                        position += 1
+
+                if max_items > 0 and position >= max_items:
+                    break
+
+        if is_atom is None:
+            raise _FastPathUnsupported("empty")
 
         return items
 
+    @staticmethod
+    def _iterparse(source):
+        """iterparse 包装：expat 不支持的编码（如 GBK）转为回退信号"""
+        iterator = ET.iterparse(source, events=("start", "end"))
+        while True:
+            try:
+                yield next(iterator)
+            except StopIteration:
+                return
+            except ValueError as e:
+                raise _FastPathUnsupported(str(e))
+
+    def _collect_fast_fields(self, elem: ET.Element, is_atom: bool) -> Dict[str, str]:
+        """从 item/entry 元素收集原始字段（不做清理）"""
+        fields: Dict[str, str] = {}
+        url = ""
+        has_alternate = False
+        authors: List[str] = []
+
+        for child in elem:
+            tag = child.tag
+            name = _local_name(tag)
+
+            if name == "link":
+                if is_atom:
+                    # 优先 rel="alternate"（缺省即 alternate），否则取第一个链接
+                    href = child.get("href", "")
+                    if href and (not url or (child.get("rel", "alternate") == "alternate" and not has_alternate)):
+                        url = href
+                        has_alternate = child.get("rel", "alternate") == "alternate"
+                elif not url:
+                    url = (child.text or "").strip()
+            elif name == "author":
+                if is_atom:
+                    author_name = child.findtext(f"{{{_ATOM_NS}}}name")
+                    if author_name:
+                        authors.append(author_name)
+                elif child.text:
+                    authors.append(child.text)
+            elif tag == f"{{{_DC_NS}}}creator" and child.text:
+                authors.append(child.text)
+            elif tag == f"{{{_CONTENT_NS}}}encoded":
+                fields.setdefault("content", "".join(child.itertext()))
+            elif name in ("title", "pubDate", "published", "updated", "description",
+                          "summary", "content", "guid", "id") or tag == f"{{{_DC_NS}}}date":
+                key = "dc_date" if tag == f"{{{_DC_NS}}}date" else name
+                fields.setdefault(key, "".join(child.itertext()))
+                if name == "guid" and child.get("isPermaLink", "true") != "false":
+                    fields.setdefault("guid_link", fields[key].strip())
+
+        if not url and fields.get("guid_link", "").startswith("http"):
+            url = fields["guid_link"]
+        fields["url"] = url
+        if authors:
+            fields["author"] = authors[0]
+
+        return fields
+
+    def _build_fast_item(self, fields: Dict[str, str], published_at: Optional[str]) -> Optional[ParsedRSSItem]:
+        """由原始字段构建条目"""
+        title = self._clean_text(fields.get("title", ""))
+        if not title:
+            return None
+
+        url = fields.get("url", "")
+        summary = fields.get("summary") or fields.get("description") or fields.get("content") or ""
+        summary = self._clean_text(summary) if summary else ""
+        if len(summary) > self.max_summary_length:
+            summary = summary[:self.max_summary_length] + "..."
+
+        author = self._clean_text(fields.get("author", "")) or None
+        guid = (fields.get("id") or fields.get("guid") or "").strip() or url
+
+        return ParsedRSSItem(
+            title=title,
+            url=url,
+            published_at=published_at,
+            summary=summary or None,
+            author=author or None,
+            guid=guid,
+        )
+
+    def _parse_fast_date(self, date_str: Optional[str]) -> Optional[str]:
+        """
+        解析日期并统一为 UTC 无时区 ISO 格式（与 feedparser 后端的输出一致）
+        """
+        if not date_str:
+            return None
+
+        date_str = date_str.strip()
+        dt = None
+        try:
+            dt = parsedate_to_datetime(date_str)
+        except (ValueError, TypeError, IndexError):
+            try:
+                dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            except (ValueError, TypeError):
+                return None
+
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt.replace(microsecond=0).isoformat()
+
     def _is_json_feed(self, content: str) -> bool:
         """
         检测内容是否为 JSON Feed 格式
@@ -93,7 +355,13 @@ class RSSParser:
         except (json.JSONDecodeError, TypeError):
             return False
 
-    def _parse_json_feed(self, content: str, feed_url: str = "") -> List[ParsedRSSItem]:
+    def _parse_json_feed(
+        self,
+        content: str,
+        feed_url: str = "",
+        max_items: int = 0,
+        published_after: Optional[datetime] = None,
+    ) -> List[ParsedRSSItem]:
         """
         解析 JSON Feed 1.1 格式
 
@@ -102,6 +370,8 @@ class RSSParser:
         Args:
             content: JSON Feed 内容
             feed_url: Feed URL（用于错误提示）
+            max_items: 最多处理的条目数（0=不限制）
+            published_after: 发布时间下限（UTC，无时区）
 
         Returns:
             解析后的条目列表
@@ -116,9 +386,16 @@ class RSSParser:
             return []
 
         items = []
+        position = 0
         for item_data in items_data:
+            if max_items > 0 and position >= max_items:
+                break
+
             item = self._parse_json_feed_item(item_data)
-            if item:
+            if not item:
+                continue
+            position += 1
+            if not self._is_stale(item.published_at, published_after):
                 items.append(item)
 
         return items
@@ -213,8 +490,8 @@ class RSSParser:
 
         return self.parse(response.text, url)
 
-    def _parse_entry(self, entry: Any) -> Optional[ParsedRSSItem]:
-        """解析单个条目"""
+    def _parse_entry(self, entry: Any, published_at: Optional[str] = None) -> Optional[ParsedRSSItem]:
+        """解析单个条目（published_at 为已解析的发布时间，未提供时从条目解析）"""
         title = self._clean_text(entry.get("title", ""))
         if not title:
             return None
@@ -230,7 +507,8 @@ class RSSParser:
             if not url and links:
                 url = links[0].get("href", "")
 
-        published_at = self._parse_date(entry)
+        if published_at is None:
+            published_at = self._parse_date(entry)
         summary = self._parse_summary(entry)
         author = self._parse_author(entry)
         guid = entry.get("id") or entry.get("guid", {}).get("value") or url
@@ -330,3 +608,29 @@ class RSSParser:
                 return ", ".join(names)
 
         return None
+
+
+def parse_feed_content(
+    content: FeedContent,
+    feed_url: str = "",
+    max_summary_length: int = 500,
+    backend: str = "feedparser",
+    max_items: int = 0,
+    published_after: Optional[datetime] = None,
+) -> List[ParsedRSSItem]:
+    """
+    解析 Feed 内容（模块级函数，可在进程池中执行）
+
+    Args:
+        content: Feed 内容（XML 或 JSON），str 或原始字节
+        feed_url: Feed URL（用于错误提示）
+        max_summary_length: 摘要最大长度
+        backend: 解析后端
+        max_items: 最多处理的条目数（0=不限制）
+        published_after: 发布时间下限（UTC，无时区）
+
+    Returns:
+        解析后的条目列表
+    """
+    parser = RSSParser(max_summary_length=max_summary_length, backend=backend)
+    return parser.parse(content, feed_url, max_items, published_after)
@@ -0,0 +1,87 @@
+# coding=utf-8
+"""
+按主机限流模块
+
+并发抓取时保证对同一主机的礼貌访问：
+- 限制同一主机的同时请求数
+- 保证同一主机相邻两次请求之间的最小启动间隔（带随机抖动）
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from urllib.parse import urlparse
+
+
+class HostThrottle:
+    """按主机限流器（线程安全）"""
+
+    def __init__(
+        self,
+        min_interval_ms: int = 0,
+        max_per_host: int = 1,
+        min_sleep_ms: int = 50,
+    ):
+        """
+        初始化限流器
+
+        Args:
+            min_interval_ms: 同一主机相邻请求的最小启动间隔（毫秒），0 表示不限制
+            max_per_host: 同一主机的最大同时请求数
+            min_sleep_ms: 抖动后的最小间隔（毫秒）
+        """
+        self.min_interval_ms = max(0, min_interval_ms)
+        self.max_per_host = max(1, max_per_host)
+        self.min_sleep_ms = min_sleep_ms
+
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """提取 URL 的主机名（含端口）"""
+        return urlparse(url).netloc.lower()
+
+    def _get_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    def _reserve_start(self, host: str) -> float:
+        """预约本次请求的启动时间，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_start.get(host, 0.0))
+
+            if self.min_interval_ms > 0:
+                # 与顺序模式一致的抖动范围
+                interval = self.min_interval_ms + random.randint(-10, 20)
+                interval = max(self.min_sleep_ms, interval)
+                self._next_start[host] = start_at + interval / 1000
+            else:
+                self._next_start[host] = start_at
+
+            return start_at - now
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """
+        获取对目标主机发起一次请求的许可
+
+        用法:
+            with throttle.slot(url):
+                session.get(url)
+        """
+        host = self.host_of(url)
+        semaphore = self._get_semaphore(host)
+        with semaphore:
+            wait = self._reserve_start(host)
+            if wait > 0:
+                time.sleep(wait)
+            yield
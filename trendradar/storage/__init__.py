@@ -17,16 +17,23 @@ from trendradar.storage.base import (
     convert_crawl_results_to_news_data,
 )
 from trendradar.storage.sqlite_mixin import SQLiteStorageMixin
+from trendradar.storage.sqlite_profile import (
+    SQLITE_PROFILES,
+    resolve_sqlite_pragmas,
+    apply_sqlite_pragmas,
+    checkpoint_sqlite,
+)
 from trendradar.storage.local import LocalStorageBackend
 from trendradar.storage.manager import StorageManager, get_storage_manager
 
-# 远程后端可选导入（需要 boto3）
-try:
-    from trendradar.storage.remote import RemoteStorageBackend
-    HAS_REMOTE = True
-except ImportError:
-    RemoteStorageBackend = None
-    HAS_REMOTE = False
+
+def __getattr__(name: str):
+    # 远程后端需要 boto3（导入较慢），首次访问时再导入
+    if name in ("RemoteStorageBackend", "HAS_REMOTE"):
+        from trendradar.storage import remote
+        return remote.RemoteStorageBackend if name == "RemoteStorageBackend" else remote.HAS_BOTO3
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # 基础类
@@ -37,6 +44,11 @@ __all__ = [
     "RSSData",
     # Mixin
     "SQLiteStorageMixin",
+    # SQLite 连接参数
+    "SQLITE_PROFILES",
+    "resolve_sqlite_pragmas",
+    "apply_sqlite_pragmas",
+    "checkpoint_sqlite",
     # 转换函数
     "convert_crawl_results_to_news_data",
     # 后端实现
@@ -0,0 +1,83 @@
+# coding=utf-8
+"""
+已结束日期数据库的压缩归档
+
+归档流程：VACUUM INTO 生成紧凑副本 → 压缩（gzip，安装 zstandard 后可用 zstd）
+归档对象键为 {type}/{date}.db.gz 或 {type}/{date}.db.zst，读取时按后缀透明解压。
+"""
+
+import gzip
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+# 归档格式 → 对象键后缀
+ARCHIVE_SUFFIXES = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+DEFAULT_ARCHIVE_FORMAT = "gzip"
+
+_COPY_BUFFER = 1024 * 1024
+
+
+def resolve_archive_format(archive_format: str) -> str:
+    """校验归档格式，不可用时回退到 gzip"""
+    if archive_format not in ARCHIVE_SUFFIXES:
+        print(f"[远程存储] 未知的归档格式 '{archive_format}'，使用 {DEFAULT_ARCHIVE_FORMAT}")
+        return DEFAULT_ARCHIVE_FORMAT
+    if archive_format == "zstd" and not HAS_ZSTD:
+        print("[远程存储] zstd 归档需要安装 zstandard: pip install zstandard，使用 gzip")
+        return DEFAULT_ARCHIVE_FORMAT
+    return archive_format
+
+
+def format_from_key(key: str) -> Optional[str]:
+    """根据对象键后缀判断归档格式，未压缩时返回 None"""
+    for archive_format, suffix in ARCHIVE_SUFFIXES.items():
+        if key.endswith(".db" + suffix):
+            return archive_format
+    return None
+
+
+def vacuum_into(src_path: Path, dst_path: Path) -> None:
+    """生成去除空闲页的紧凑副本（VACUUM INTO）"""
+    dst_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(src_path))
+    try:
+        conn.execute("VACUUM INTO ?", (str(dst_path),))
+    finally:
+        conn.close()
+
+
+def compress_file(src_path: Path, dst_path: Path, archive_format: str) -> None:
+    """流式压缩文件"""
+    with open(src_path, "rb") as src:
+        if archive_format == "zstd":
+            with open(dst_path, "wb") as dst:
+                zstandard.ZstdCompressor(level=10).copy_stream(src, dst)
+        else:
+            with gzip.open(dst_path, "wb", compresslevel=9) as dst:
+                shutil.copyfileobj(src, dst, _COPY_BUFFER)
+
+
+def decompress_file(src_path: Path, dst_path: Path, archive_format: str) -> None:
+    """流式解压文件"""
+    with open(dst_path, "wb") as dst:
+        if archive_format == "zstd":
+            if not HAS_ZSTD:
+                raise ImportError("读取 zstd 归档需要安装 zstandard: pip install zstandard")
+            with open(src_path, "rb") as src:
+                zstandard.ZstdDecompressor().copy_stream(src, dst)
+        else:
+            with gzip.open(src_path, "rb") as src:
+                shutil.copyfileobj(src, dst, _COPY_BUFFER)
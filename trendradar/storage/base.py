@@ -130,6 +130,8 @@ class RSSData:
     - items: 按 feed_id 分组的 RSS 条目
     - id_to_name: feed_id 到名称的映射
     - failed_ids: 失败的 feed_id 列表
+    - unchanged_ids: 返回 304（未变化）的 feed_id 列表
+    - validators: 各源的 HTTP 校验头 {feed_id: {"etag", "last_modified"}}
     """
 
     date: str                                   # 日期
@@ -137,6 +139,8 @@ class RSSData:
     items: Dict[str, List[RSSItem]]             # 按 feed_id 分组的条目
     id_to_name: Dict[str, str] = field(default_factory=dict)   # ID到名称映射
     failed_ids: List[str] = field(default_factory=list)        # 失败的ID
+    unchanged_ids: List[str] = field(default_factory=list)     # 未变化的ID
+    validators: Dict[str, Dict] = field(default_factory=dict)  # HTTP 校验头
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -184,6 +188,9 @@ class NewsData:
     - items: 按来源ID分组的新闻条目
     - id_to_name: 来源ID到名称的映射
     - failed_ids: 失败的来源ID列表
+    - unchanged_ids: 内容与上次抓取一致的来源ID列表（存储层走批量快速路径）
+    - fingerprints: 本次抓取的平台指纹（随数据一起持久化）
+    - source_health: 本次抓取后的平台健康记录（随数据一起持久化）
     """
 
     date: str                                   # 日期
@@ -191,6 +198,9 @@ class NewsData:
     items: Dict[str, List[NewsItem]]            # 按来源分组的新闻
     id_to_name: Dict[str, str] = field(default_factory=dict)   # ID到名称映射
     failed_ids: List[str] = field(default_factory=list)        # 失败的ID
+    unchanged_ids: List[str] = field(default_factory=list)     # 内容未变化的ID
+    fingerprints: Dict[str, Dict] = field(default_factory=dict)  # 平台指纹
+    source_health: Dict[str, Dict] = field(default_factory=dict)  # 平台健康记录
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -451,6 +461,49 @@ class StorageBackend(ABC):
         """
         return False
 
+    def get_platform_fingerprints(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        获取指定日期已保存的平台指纹（用于识别未变化的平台）
+
+        默认实现返回空字典，子类可覆盖。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD），默认为今天
+
+        Returns:
+            {platform_id: {"content_hash", "etag", "last_modified", "payload", "crawl_time"}}
+        """
+        return {}
+
+    def get_rss_feed_validators(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        获取指定日期已保存的 RSS 源 HTTP 校验头（用于条件请求）
+
+        默认实现返回空字典，子类可覆盖。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD），默认为今天
+
+        Returns:
+            {feed_id: {"etag", "last_modified"}}
+        """
+        return {}
+
+    def get_platform_health(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        获取指定日期已保存的平台健康记录（用于熔断判断）
+
+        默认实现返回空字典，子类可覆盖。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD），默认为今天
+
+        Returns:
+            {platform_id: {"failure_streak", "last_error", "last_success_time",
+                           "last_failure_time", "open_until"}}
+        """
+        return {}
+
     def record_period_execution(self, date_str: str, period_key: str, action: str) -> bool:
         """
         记录时间段的 action 执行
@@ -472,6 +525,9 @@ def convert_crawl_results_to_news_data(
     failed_ids: List[str],
     crawl_time: str,
     crawl_date: str,
+    unchanged_ids: Optional[List[str]] = None,
+    fingerprints: Optional[Dict[str, Dict]] = None,
+    source_health: Optional[Dict[str, Dict]] = None,
 ) -> NewsData:
     """
     将爬虫结果转换为 NewsData 格式
@@ -482,6 +538,9 @@ def convert_crawl_results_to_news_data(
         failed_ids: 失败的来源ID
         crawl_time: 抓取时间（HH:MM）
         crawl_date: 抓取日期（YYYY-MM-DD）
+        unchanged_ids: 内容未变化的来源ID（可选）
+        fingerprints: 平台指纹（可选）
+        source_health: 平台健康记录（可选）
 
     Returns:
         NewsData 对象
@@ -522,4 +581,7 @@ def convert_crawl_results_to_news_data(
         items=items,
         id_to_name=id_to_name,
         failed_ids=failed_ids,
+        unchanged_ids=list(unchanged_ids or []),
+        fingerprints=dict(fingerprints or {}),
+        source_health=dict(source_health or {}),
     )
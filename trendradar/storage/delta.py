@@ -0,0 +1,226 @@
+# coding=utf-8
+"""
+SQLite 增量同步（远程存储 delta 模式）
+
+全量模式下每次保存都要上传整个当天数据库，上传量随当天数据增长。
+delta 模式只上传本次变更的行：
+
+- 写入端在连接上安装 TEMP 触发器，记录各表被插入 / 更新 / 删除的 rowid
+- 上传时把变更行导出为一个小的 SQLite 段文件，存为 {type}/{date}.delta/{seq:06d}.db
+- 段数达到阈值时合并：上传完整数据库作为新的基础文件，再删除已合并的段
+- 读取端下载基础文件后按序号应用尚未合并的段，即可还原完整数据库
+
+基础文件的 sync_state 表记录其已包含的最大段序号，读取端只应用更大序号的段。
+段文件是普通 SQLite 数据库：每张表一份（带 __rowid__ 列），删除记录在 __deleted__ 表中。
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+SYNC_STATE_TABLE = "sync_state"
+DELETED_TABLE = "__deleted__"
+ROWID_COLUMN = "__rowid__"
+
+_SEQ_KEY = "delta_seq"
+_SEGMENT_SCHEMA = "delta_seg"
+
+
+def delta_prefix(base_key: str) -> str:
+    """
+    段文件的对象键前缀
+
+    Args:
+        base_key: 基础文件对象键，如 "news/2025-12-28.db"
+
+    Returns:
+        如 "news/2025-12-28.delta/"
+    """
+    if base_key.endswith(".db"):
+        base_key = base_key[:-len(".db")]
+    return f"{base_key}.delta/"
+
+
+def segment_key(base_key: str, seq: int) -> str:
+    """段文件的对象键，如 "news/2025-12-28.delta/000003.db" """
+    return f"{delta_prefix(base_key)}{seq:06d}.db"
+
+
+def parse_segment_seq(key: str) -> Optional[int]:
+    """从段文件对象键解析序号，不是段文件时返回 None"""
+    match = re.search(r"\.delta/(\d+)\.db$", key)
+    return int(match.group(1)) if match else None
+
+
+def get_synced_seq(conn: sqlite3.Connection) -> int:
+    """数据库已包含的最大段序号（没有记录时为 0）"""
+    try:
+        row = conn.execute(
+            f"SELECT value FROM {SYNC_STATE_TABLE} WHERE key = ?", (_SEQ_KEY,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return int(row[0]) if row else 0
+
+
+def set_synced_seq(conn: sqlite3.Connection, seq: int) -> None:
+    """记录数据库已包含的最大段序号"""
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} "
+        "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+    )
+    conn.execute(
+        f"INSERT OR REPLACE INTO {SYNC_STATE_TABLE} (key, value) VALUES (?, ?)",
+        (_SEQ_KEY, str(seq)),
+    )
+    conn.commit()
+
+
+def _tracked_tables(conn: sqlite3.Connection, schema: str = "main") -> List[str]:
+    """需要同步的数据表（排除 SQLite 内部表和同步状态表）"""
+    rows = conn.execute(
+        f"SELECT name FROM {schema}.sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name != ?",
+        (SYNC_STATE_TABLE,),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def _table_columns(conn: sqlite3.Connection, table: str, schema: str = "main") -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA {schema}.table_info("{table}")')]
+
+
+def install_change_capture(conn: sqlite3.Connection) -> None:
+    """
+    在连接上安装变更记录触发器
+
+    触发器和记录表都是 TEMP 对象，只存在于当前连接，不会写入数据库文件。
+    应在建表和迁移完成后调用，迁移本身不会被记录。
+    """
+    # 不使用唯一约束去重：触发器内的冲突处理会被外层语句（如 INSERT OR REPLACE）覆盖
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS delta_changes (tbl TEXT NOT NULL, rid INTEGER NOT NULL)")
+    conn.execute("CREATE INDEX IF NOT EXISTS temp.idx_delta_changes ON delta_changes(tbl, rid)")
+    for table in _tracked_tables(conn):
+        for event, refs in (("INSERT", ("NEW",)), ("UPDATE", ("OLD", "NEW")), ("DELETE", ("OLD",))):
+            body = " ".join(
+                f"INSERT INTO delta_changes (tbl, rid) SELECT '{table}', {ref}.rowid "
+                f"WHERE NOT EXISTS (SELECT 1 FROM delta_changes WHERE tbl = '{table}' AND rid = {ref}.rowid);"
+                for ref in refs
+            )
+            conn.execute(
+                f'CREATE TEMP TRIGGER IF NOT EXISTS "delta_{table}_{event.lower()}" '
+                f'AFTER {event} ON main."{table}" BEGIN {body} END'
+            )
+    conn.commit()
+
+
+def has_pending_changes(conn: sqlite3.Connection) -> bool:
+    """是否有尚未导出的变更"""
+    try:
+        return conn.execute("SELECT 1 FROM temp.delta_changes LIMIT 1").fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+def clear_changes(conn: sqlite3.Connection) -> None:
+    """清空变更记录（段文件上传成功或已全量上传后调用）"""
+    try:
+        conn.execute("DELETE FROM temp.delta_changes")
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass
+
+
+def export_changeset(conn: sqlite3.Connection, path: Path) -> int:
+    """
+    把记录的变更导出为段文件
+
+    变更记录不会被清空，上传成功后需调用 clear_changes()。
+
+    Args:
+        conn: 已安装变更记录的连接
+        path: 段文件路径（已存在时覆盖）
+
+    Returns:
+        导出的行数（含删除）
+    """
+    conn.commit()
+    path.unlink(missing_ok=True)
+
+    conn.execute(f"ATTACH DATABASE ? AS {_SEGMENT_SCHEMA}", (str(path),))
+    try:
+        conn.execute(
+            f"CREATE TABLE {_SEGMENT_SCHEMA}.{DELETED_TABLE} (tbl TEXT NOT NULL, rid INTEGER NOT NULL)"
+        )
+        count = 0
+        tables = [row[0] for row in conn.execute("SELECT DISTINCT tbl FROM temp.delta_changes")]
+        for table in tables:
+            conn.execute(
+                f'CREATE TABLE {_SEGMENT_SCHEMA}."{table}" AS '
+                f'SELECT rowid AS {ROWID_COLUMN}, * FROM main."{table}" '
+                "WHERE rowid IN (SELECT rid FROM temp.delta_changes WHERE tbl = ?)",
+                (table,),
+            )
+            cursor = conn.execute(
+                f"INSERT INTO {_SEGMENT_SCHEMA}.{DELETED_TABLE} (tbl, rid) "
+                "SELECT DISTINCT c.tbl, c.rid FROM temp.delta_changes c "
+                f'WHERE c.tbl = ? AND NOT EXISTS (SELECT 1 FROM main."{table}" t WHERE t.rowid = c.rid)',
+                (table,),
+            )
+            count += cursor.rowcount
+            count += conn.execute(f'SELECT COUNT(*) FROM {_SEGMENT_SCHEMA}."{table}"').fetchone()[0]
+        conn.commit()
+        return count
+    finally:
+        conn.execute(f"DETACH DATABASE {_SEGMENT_SCHEMA}")
+
+
+def apply_changeset(conn: sqlite3.Connection, path: Path) -> None:
+    """
+    把段文件应用到数据库
+
+    先执行删除，再按 rowid 覆盖写入变更行；只写入两边都存在的列，
+    基础文件表结构较旧时由调用方先完成迁移。
+
+    Args:
+        conn: 目标数据库连接（不能安装变更记录，否则会再次被记录）
+        path: 段文件路径
+    """
+    conn.commit()
+    conn.execute(f"ATTACH DATABASE ? AS {_SEGMENT_SCHEMA}", (str(path),))
+    try:
+        main_tables = set(_tracked_tables(conn))
+        deleted = conn.execute(
+            f"SELECT DISTINCT tbl FROM {_SEGMENT_SCHEMA}.{DELETED_TABLE}"
+        ).fetchall()
+        for (table,) in deleted:
+            if table in main_tables:
+                conn.execute(
+                    f'DELETE FROM main."{table}" WHERE rowid IN '
+                    f"(SELECT rid FROM {_SEGMENT_SCHEMA}.{DELETED_TABLE} WHERE tbl = ?)",
+                    (table,),
+                )
+
+        for table in _tracked_tables(conn, _SEGMENT_SCHEMA):
+            if table == DELETED_TABLE:
+                continue
+            if table not in main_tables:
+                print(f"[远程存储] 增量段中的表 {table} 在数据库中不存在，已跳过")
+                continue
+            main_columns = set(_table_columns(conn, table))
+            columns = [
+                col for col in _table_columns(conn, table, _SEGMENT_SCHEMA)
+                if col != ROWID_COLUMN and col in main_columns
+            ]
+            column_list = ", ".join(f'"{col}"' for col in columns)
+            conn.execute(
+                f'INSERT OR REPLACE INTO main."{table}" (rowid, {column_list}) '
+                f'SELECT {ROWID_COLUMN}, {column_list} FROM {_SEGMENT_SCHEMA}."{table}"'
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute(f"DETACH DATABASE {_SEGMENT_SCHEMA}")
@@ -11,10 +11,11 @@ import pytz
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from trendradar.storage.base import StorageBackend, NewsItem, NewsData, RSSItem, RSSData
 from trendradar.storage.sqlite_mixin import SQLiteStorageMixin
+from trendradar.storage.sqlite_profile import resolve_sqlite_pragmas
 from trendradar.utils.time import (
     DEFAULT_TIMEZONE,
     get_configured_time,
@@ -39,6 +40,7 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
         enable_txt: bool = True,
         enable_html: bool = True,
         timezone: str = DEFAULT_TIMEZONE,
+        sqlite_pragmas: Optional[Dict[str, Any]] = None,
     ):
         """
         初始化本地存储后端
@@ -48,11 +50,13 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
             enable_txt: 是否启用 TXT 快照
             enable_html: 是否启用 HTML 报告
             timezone: 时区配置
+            sqlite_pragmas: SQLite PRAGMA 配置（默认使用 performance 预置配置）
         """
         self.data_dir = Path(data_dir)
         self.enable_txt = enable_txt
         self.enable_html = enable_html
         self.timezone = timezone
+        self.sqlite_pragmas = sqlite_pragmas if sqlite_pragmas is not None else resolve_sqlite_pragmas()
         self._db_connections: Dict[str, sqlite3.Connection] = {}
 
     @property
@@ -115,6 +119,7 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
         if db_path not in self._db_connections:
             conn = sqlite3.connect(db_path)
             conn.row_factory = sqlite3.Row
+            self._configure_connection(conn)
             self._init_tables(conn, db_type)
             self._db_connections[db_path] = conn
 
@@ -172,6 +177,20 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
             return True
         return self._is_first_crawl_today_impl(date)
 
+    def get_platform_fingerprints(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的平台指纹"""
+        db_path = self._get_db_path(date)
+        if not db_path.exists():
+            return {}
+        return self._get_platform_fingerprints_impl(date)
+
+    def get_platform_health(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的平台健康记录"""
+        db_path = self._get_db_path(date)
+        if not db_path.exists():
+            return {}
+        return self._get_platform_health_impl(date)
+
     def get_crawl_times(self, date: Optional[str] = None) -> List[str]:
         """获取指定日期的所有抓取时间列表"""
         db_path = self._get_db_path(date)
@@ -220,6 +239,13 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
         """检测新增的 RSS 条目"""
         return self._detect_new_rss_items_impl(current_data)
 
+    def get_rss_feed_validators(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的 RSS 源 HTTP 校验头"""
+        db_path = self._get_db_path(date, db_type="rss")
+        if not db_path.exists():
+            return {}
+        return self._get_rss_feed_validators_impl(date)
+
     def get_latest_rss_data(self, date: Optional[str] = None) -> Optional[RSSData]:
         """获取最新一次抓取的 RSS 数据"""
         db_path = self._get_db_path(date, db_type="rss")
@@ -399,9 +425,11 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
                             except Exception:
                                 pass
 
-                        # 删除文件
+                        # 删除文件（连同可能残留的 WAL 文件）
                         try:
                             db_file.unlink()
+                            for suffix in ("-wal", "-shm"):
+                                Path(f"{db_file}{suffix}").unlink(missing_ok=True)
                             deleted_count += 1
                             print(f"[本地存储] 清理过期数据: {db_type}/{db_file.name}")
                         except Exception as e:
@@ -435,6 +463,41 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
             print(f"[本地存储] 清理过期数据失败: {e}")
             return deleted_count
 
+    def compact_closed_days(self) -> int:
+        """
+        压缩已结束日期新闻数据库的排名历史（storage.local.compact_rank_history）
+
+        当天数据库仍在写入，不做处理；已压缩且没有新写入的数据库会直接跳过。
+
+        Returns:
+            压缩的数据库数量
+        """
+        db_dir = self.data_dir / "news"
+        if not db_dir.exists():
+            return 0
+
+        today = self._format_date_folder()
+        compacted = 0
+        for db_file in sorted(db_dir.glob("*.db")):
+            date_str = db_file.stem
+            if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", date_str) or date_str >= today:
+                continue
+
+            db_path = str(db_file)
+            was_open = db_path in self._db_connections
+            try:
+                conn = self._get_connection(date_str)
+                if self._compact_rank_history_impl(conn, f"news/{db_file.name}", "[本地存储]"):
+                    compacted += 1
+            except Exception as e:
+                print(f"[本地存储] 压缩排名历史失败 {db_file}: {e}")
+            finally:
+                # 本次运行不会再用到历史日期的连接
+                if not was_open and db_path in self._db_connections:
+                    self._db_connections.pop(db_path).close()
+
+        return compacted
+
     def __del__(self):
         """析构函数，确保关闭连接"""
         self.cleanup()
@@ -6,7 +6,7 @@
 """
 
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from trendradar.storage.base import StorageBackend, NewsData, RSSData
 from trendradar.utils.time import DEFAULT_TIMEZONE
@@ -35,10 +35,13 @@ class StorageManager:
         enable_html: bool = True,
         remote_config: Optional[dict] = None,
         local_retention_days: int = 0,
+        local_compact_rank_history: bool = True,
         remote_retention_days: int = 0,
         pull_enabled: bool = False,
         pull_days: int = 0,
+        pull_workers: int = 4,
         timezone: str = DEFAULT_TIMEZONE,
+        sqlite_pragmas: Optional[Dict[str, Any]] = None,
     ):
         """
         初始化存储管理器
@@ -48,12 +51,15 @@ class StorageManager:
             data_dir: 本地数据目录
             enable_txt: 是否启用 TXT 快照
             enable_html: 是否启用 HTML 报告
-            remote_config: 远程存储配置（endpoint_url, bucket_name, access_key_id 等）
+            remote_config: 远程存储配置（endpoint_url, bucket_name, access_key_id, sync_mode 等）
             local_retention_days: 本地数据保留天数（0 = 无限制）
+            local_compact_rank_history: 是否压缩本地已结束日期的排名历史
             remote_retention_days: 远程数据保留天数（0 = 无限制）
             pull_enabled: 是否启用启动时自动拉取
             pull_days: 拉取最近 N 天的数据
+            pull_workers: 拉取时的并发下载数
             timezone: 时区配置
+            sqlite_pragmas: SQLite PRAGMA 配置（None 使用默认预置配置）
         """
         self.backend_type = backend_type
         self.data_dir = data_dir
@@ -61,10 +67,13 @@ class StorageManager:
         self.enable_html = enable_html
         self.remote_config = remote_config or {}
         self.local_retention_days = local_retention_days
+        self.local_compact_rank_history = local_compact_rank_history
         self.remote_retention_days = remote_retention_days
         self.pull_enabled = pull_enabled
         self.pull_days = pull_days
+        self.pull_workers = pull_workers
         self.timezone = timezone
+        self.sqlite_pragmas = sqlite_pragmas
 
         self._backend: Optional[StorageBackend] = None
         self._remote_backend: Optional[StorageBackend] = None
@@ -129,6 +138,7 @@ class StorageManager:
         try:
             from trendradar.storage.remote import RemoteStorageBackend
 
+            upload_config = self.remote_config.get("upload") or {}
             return RemoteStorageBackend(
                 bucket_name=self.remote_config.get("bucket_name") or os.environ.get("S3_BUCKET_NAME", ""),
                 access_key_id=self.remote_config.get("access_key_id") or os.environ.get("S3_ACCESS_KEY_ID", ""),
@@ -138,6 +148,16 @@ class StorageManager:
                 enable_txt=self.enable_txt,
                 enable_html=self.enable_html,
                 timezone=self.timezone,
+                sqlite_pragmas=self.sqlite_pragmas,
+                sync_mode=self.remote_config.get("sync_mode", "full"),
+                compact_every=self.remote_config.get("compact_every", 12),
+                cache_dir=self.remote_config.get("cache_dir") or None,
+                archive=self.remote_config.get("archive", False),
+                archive_format=self.remote_config.get("archive_format", "gzip"),
+                part_size_mb=upload_config.get("PART_SIZE_MB", 8),
+                multipart_threshold_mb=upload_config.get("MULTIPART_THRESHOLD_MB", 16),
+                upload_retries=upload_config.get("RETRIES", 3),
+                upload_compat=upload_config.get("COMPAT"),
             )
         except ImportError as e:
             print(f"[存储管理器] 远程后端导入失败: {e}")
@@ -168,6 +188,7 @@ class StorageManager:
                     enable_txt=self.enable_txt,
                     enable_html=self.enable_html,
                     timezone=self.timezone,
+                    sqlite_pragmas=self.sqlite_pragmas,
                 )
                 print(f"[存储管理器] 使用本地存储后端 (数据目录: {self.data_dir})")
 
@@ -196,7 +217,9 @@ class StorageManager:
             return 0
 
         # 调用拉取方法
-        return self._remote_backend.pull_recent_days(self.pull_days, self.data_dir)
+        return self._remote_backend.pull_recent_days(
+            self.pull_days, self.data_dir, max_workers=self.pull_workers
+        )
 
     def save_news_data(self, data: NewsData) -> bool:
         """保存新闻数据"""
@@ -218,6 +241,10 @@ class StorageManager:
         """检测新增的 RSS 条目（增量模式）"""
         return self.get_backend().detect_new_rss_items(current_data)
 
+    def get_rss_feed_validators(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的 RSS 源 HTTP 校验头"""
+        return self.get_backend().get_rss_feed_validators(date)
+
     def get_today_all_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """获取当天所有数据"""
         return self.get_backend().get_today_all_data(date)
@@ -242,6 +269,14 @@ class StorageManager:
         """检查是否是当天第一次抓取"""
         return self.get_backend().is_first_crawl_today(date)
 
+    def get_platform_fingerprints(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的平台指纹"""
+        return self.get_backend().get_platform_fingerprints(date)
+
+    def get_platform_health(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的平台健康记录"""
+        return self.get_backend().get_platform_health(date)
+
     def cleanup(self) -> None:
         """清理资源"""
         if self._backend:
@@ -249,6 +284,43 @@ class StorageManager:
         if self._remote_backend:
             self._remote_backend.cleanup()
 
+    def archive_remote_days(self) -> int:
+        """
+        压缩归档远程存储中已结束日期的数据库（storage.remote.archive）
+
+        Returns:
+            归档的数据库数量
+        """
+        if not self.remote_config.get("archive") or not self._has_remote_config():
+            return 0
+
+        # 优先使用当前的远程后端，避免重复创建
+        if self._backend is not None and self._backend.backend_name == "remote":
+            backend = self._backend
+        else:
+            if self._remote_backend is None:
+                self._remote_backend = self._create_remote_backend()
+            backend = self._remote_backend
+
+        if backend is None:
+            return 0
+        return backend.archive_closed_days()
+
+    def compact_local_days(self) -> int:
+        """
+        压缩本地已结束日期的排名历史（storage.local.compact_rank_history）
+
+        Returns:
+            压缩的数据库数量
+        """
+        if not self.local_compact_rank_history:
+            return 0
+
+        backend = self.get_backend()
+        if backend.backend_name != "local":
+            return 0
+        return backend.compact_closed_days()
+
     def cleanup_old_data(self) -> int:
         """
         清理过期数据
@@ -298,10 +370,13 @@ def get_storage_manager(
     enable_html: bool = True,
     remote_config: Optional[dict] = None,
     local_retention_days: int = 0,
+    local_compact_rank_history: bool = True,
     remote_retention_days: int = 0,
     pull_enabled: bool = False,
     pull_days: int = 0,
+    pull_workers: int = 4,
     timezone: str = DEFAULT_TIMEZONE,
+    sqlite_pragmas: Optional[Dict[str, Any]] = None,
     force_new: bool = False,
 ) -> StorageManager:
     """
@@ -314,10 +389,13 @@ def get_storage_manager(
         enable_html: 是否启用 HTML 报告
         remote_config: 远程存储配置
         local_retention_days: 本地数据保留天数（0 = 无限制）
+        local_compact_rank_history: 是否压缩本地已结束日期的排名历史
         remote_retention_days: 远程数据保留天数（0 = 无限制）
         pull_enabled: 是否启用启动时自动拉取
         pull_days: 拉取最近 N 天的数据
+        pull_workers: 拉取时的并发下载数
         timezone: 时区配置
+        sqlite_pragmas: SQLite PRAGMA 配置（None 使用默认预置配置）
         force_new: 是否强制创建新实例
 
     Returns:
@@ -333,10 +411,13 @@ def get_storage_manager(
             enable_html=enable_html,
             remote_config=remote_config,
             local_retention_days=local_retention_days,
+            local_compact_rank_history=local_compact_rank_history,
             remote_retention_days=remote_retention_days,
             pull_enabled=pull_enabled,
             pull_days=pull_days,
+            pull_workers=pull_workers,
             timezone=timezone,
+            sqlite_pragmas=sqlite_pragmas,
         )
 
     return _storage_manager
@@ -0,0 +1,90 @@
+# coding=utf-8
+"""
+远程存储清单（manifest.json）
+
+存储桶根目录下的一个小 JSON 对象，记录每个日期数据库的对象键、大小、ETag、
+归档格式、增量段序号、各表行数和 schema 版本。
+列出日期、检查存在性、过期清理都读取清单，不再遍历存储桶或逐个 HEAD。
+
+格式:
+    {
+        "version": 1,
+        "updated_at": "2025-12-28 10:30:00",
+        "entries": {
+            "news/2025-12-28": {
+                "db_type": "news", "date": "2025-12-28",
+                "key": "news/2025-12-28.db", "size": 122880, "etag": "\\"...\\"",
+                "format": null, "delta_seq": 0,
+                "rows": {"news_items": 812, ...}, "schema_version": 3,
+                "updated_at": "2025-12-28 10:30:00"
+            }
+        }
+    }
+"""
+
+import sqlite3
+from typing import Any, Dict, Optional
+
+from trendradar.storage.delta import SYNC_STATE_TABLE
+
+MANIFEST_KEY = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def new_manifest() -> Dict[str, Any]:
+    """空清单"""
+    return {"version": MANIFEST_VERSION, "updated_at": "", "entries": {}}
+
+
+def entry_id(db_type: str, date: str) -> str:
+    """清单条目键，如 "news/2025-12-28" """
+    return f"{db_type}/{date}"
+
+
+def make_entry(
+    db_type: str,
+    date: str,
+    key: str,
+    size: int,
+    etag: str,
+    archive_format: Optional[str] = None,
+    delta_seq: int = 0,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """构造清单条目"""
+    stats = stats or {}
+    return {
+        "db_type": db_type,
+        "date": date,
+        "key": key,
+        "size": size,
+        "etag": etag,
+        "format": archive_format,
+        "delta_seq": delta_seq,
+        "rows": stats.get("rows", {}),
+        "schema_version": stats.get("schema_version", 0),
+    }
+
+
+def collect_db_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    统计数据库各表行数和 schema 版本
+
+    Returns:
+        {"rows": {表名: 行数}, "schema_version": 版本号}
+    """
+    tables = [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+            "AND name != ? ORDER BY name",
+            (SYNC_STATE_TABLE,),
+        )
+    ]
+    rows = {
+        table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        for table in tables
+    }
+    return {
+        "rows": rows,
+        "schema_version": conn.execute("PRAGMA user_version").fetchone()[0],
+    }
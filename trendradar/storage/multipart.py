@@ -0,0 +1,204 @@
+# coding=utf-8
+"""
+流式分片上传（S3 Multipart Upload）
+
+按固定大小分片从磁盘读取并上传，内存占用与文件大小无关；单个分片失败只重传该分片。
+小于阈值的文件仍使用一次 put_object。
+
+兼容模式（腾讯云 COS、阿里云 OSS 等）：每个分片读入内存后以 bytes 上传，
+并显式设置 ContentLength，避免 chunked transfer encoding；内存占用为一个分片。
+非兼容模式直接把文件区间作为可 seek 的流传给 boto3，不额外缓存分片内容。
+"""
+
+import io
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+MB = 1024 * 1024
+
+# S3 要求除最后一个分片外每片至少 5 MB，且最多 10000 个分片
+MIN_PART_SIZE = 5 * MB
+MAX_PARTS = 10000
+
+DEFAULT_PART_SIZE = 8 * MB
+DEFAULT_MULTIPART_THRESHOLD = 16 * MB
+DEFAULT_MAX_RETRIES = 3
+
+# 条件写入失败（对象已存在 / 已被修改）的错误码：重试也不会成功，直接抛出
+PRECONDITION_FAILED_CODES = ("412", "PreconditionFailed", "ConditionalRequestConflict", "409")
+
+
+class FileSlice(io.RawIOBase):
+    """文件中 [offset, offset + length) 区间的只读流，支持 seek 以便 boto3 计算长度和重试"""
+
+    def __init__(self, file, offset: int, length: int):
+        super().__init__()
+        self._file = file
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._pos = min(max(offset, 0), self._length)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b""
+        self._file.seek(self._offset + self._pos)
+        data = self._file.read(size)
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def __len__(self) -> int:
+        return self._length
+
+
+def is_precondition_failed(error: Exception) -> bool:
+    """是否为条件写入失败"""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code", "") in PRECONDITION_FAILED_CODES
+
+
+def _with_retries(action: Callable[[], Any], label: str, max_retries: int) -> Any:
+    """执行操作，失败时按 1s、2s、4s... 退避重试（条件写入失败不重试）"""
+    for attempt in range(max_retries + 1):
+        try:
+            return action()
+        except Exception as e:
+            if attempt >= max_retries or is_precondition_failed(e):
+                raise
+            delay = 2 ** attempt
+            print(f"[远程存储] {label} 失败（{e}），{delay}s 后重试 ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+
+def resolve_part_size(file_size: int, part_size: int) -> int:
+    """分片大小不小于 5 MB，且保证分片数不超过 10000"""
+    part_size = max(int(part_size), MIN_PART_SIZE)
+    while file_size > part_size * MAX_PARTS:
+        part_size *= 2
+    return part_size
+
+
+def upload_file(
+    s3_client,
+    bucket: str,
+    key: str,
+    path: Path,
+    content_type: str = "application/octet-stream",
+    metadata: Optional[Dict[str, str]] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    compat: bool = True,
+    if_none_match: Optional[str] = None,
+) -> int:
+    """
+    上传本地文件到对象存储
+
+    Args:
+        s3_client: boto3 S3 客户端
+        bucket: 存储桶名称
+        key: 对象键
+        path: 本地文件路径
+        content_type: Content-Type
+        metadata: 对象元数据
+        part_size: 分片大小（字节）
+        multipart_threshold: 文件达到该大小时使用分片上传
+        max_retries: 单个请求（分片）的最大重试次数
+        compat: 兼容模式，分片以 bytes 上传并显式设置 ContentLength
+        if_none_match: 条件写入（"*" 表示对象已存在时失败，由服务端返回 412）
+
+    Returns:
+        上传的字节数
+    """
+    file_size = path.stat().st_size
+    extra: Dict[str, Any] = {"ContentType": content_type}
+    if metadata:
+        extra["Metadata"] = metadata
+    condition: Dict[str, Any] = {"IfNoneMatch": if_none_match} if if_none_match else {}
+
+    with open(path, "rb") as f:
+        if file_size < multipart_threshold:
+            def put() -> None:
+                body = FileSlice(f, 0, file_size)
+                if compat:
+                    body = body.read()
+                s3_client.put_object(
+                    Bucket=bucket, Key=key, Body=body, ContentLength=file_size, **extra, **condition
+                )
+
+            _with_retries(put, f"上传 {key}", max_retries)
+            return file_size
+
+        part_size = resolve_part_size(file_size, part_size)
+        upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key, **extra)["UploadId"]
+        parts: List[Dict[str, Any]] = []
+        try:
+            for index, offset in enumerate(range(0, file_size, part_size), start=1):
+                length = min(part_size, file_size - offset)
+
+                def put_part() -> str:
+                    body = FileSlice(f, offset, length)
+                    if compat:
+                        body = body.read()
+                    response = s3_client.upload_part(
+                        Bucket=bucket,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=index,
+                        Body=body,
+                        ContentLength=length,
+                    )
+                    return response["ETag"]
+
+                etag = _with_retries(put_part, f"上传分片 {key} #{index}", max_retries)
+                parts.append({"PartNumber": index, "ETag": etag})
+
+            _with_retries(
+                lambda: s3_client.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                    **condition,
+                ),
+                f"合并分片 {key}",
+                max_retries,
+            )
+        except Exception:
+            # 放弃未完成的上传，避免残留分片占用存储
+            try:
+                s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            except Exception as e:
+                print(f"[远程存储] 取消分片上传失败: {e}")
+            raise
+
+        print(f"[远程存储] 分片上传完成: {key}（{len(parts)} 个分片，每片 {part_size // MB} MB）")
+        return file_size
@@ -0,0 +1,200 @@
+# coding=utf-8
+"""
+排名历史压缩（已结束日期的 rank_history 列式编码）
+
+rank_history 每条新闻每次抓取一行，并重复存储 crawl_time 文本和 created_at，
+是当天数据库中最大的表。日期结束后不再有新的抓取，可以把每条新闻的历史折叠为一个 BLOB：
+
+- rank_history_slots: 当天出现过的抓取时间，按时间排序编号（slot）
+- rank_history_packed: 每条新闻一行，history 为 array('H') 小端字节序，
+  依次存放 [slot 增量, 排名, slot 增量, 排名, ...]（第一个增量即 slot 本身）
+
+压缩后原始行被删除；之后若仍有写入，新行照常写入 rank_history，
+读取时与压缩数据合并，结果与压缩前一致。
+"""
+
+import sqlite3
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# array('H') 的取值上限：slot 数和排名都不能超过该值
+MAX_PACKED_VALUE = 0xFFFF
+
+
+def encode_history(entries: List[Tuple[int, int]]) -> bytes:
+    """
+    编码一条新闻的排名历史
+
+    Args:
+        entries: [(slot, 排名)]，按 slot 升序
+
+    Returns:
+        小端字节序的 array('H') 字节串
+    """
+    values = array("H")
+    prev_slot = 0
+    for slot, rank in entries:
+        values.append(slot - prev_slot)
+        values.append(rank)
+        prev_slot = slot
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def decode_history(blob: bytes, slot_times: List[str]) -> List[Tuple[str, int]]:
+    """
+    解码一条新闻的排名历史
+
+    Args:
+        blob: encode_history 的结果
+        slot_times: slot → 抓取时间
+
+    Returns:
+        [(抓取时间, 排名)]，按时间升序
+    """
+    values = array("H")
+    values.frombytes(blob)
+    if sys.byteorder != "little":
+        values.byteswap()
+    result = []
+    slot = 0
+    for i in range(0, len(values), 2):
+        slot += values[i]
+        result.append((slot_times[slot], values[i + 1]))
+    return result
+
+
+def has_packed_history(conn: sqlite3.Connection) -> bool:
+    """数据库是否包含压缩后的排名历史（旧数据库可能没有这两张表）"""
+    try:
+        return conn.execute("SELECT 1 FROM rank_history_packed LIMIT 1").fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+def load_slot_times(cursor: sqlite3.Cursor) -> List[str]:
+    """读取 slot → 抓取时间 映射"""
+    return [row[0] for row in cursor.execute(
+        "SELECT crawl_time FROM rank_history_slots ORDER BY slot"
+    )]
+
+
+def load_packed_history(
+    cursor: sqlite3.Cursor,
+    where: str = "",
+    params: tuple = (),
+    skip_trailing_off_list: bool = False,
+) -> Dict[int, List[Tuple[str, int]]]:
+    """
+    读取并解码压缩的排名历史
+
+    Args:
+        cursor: 数据库游标
+        where: 对 news_items（别名 n）的过滤条件，如 "WHERE n.last_crawl_time = ?"
+        params: 过滤条件参数
+        skip_trailing_off_list: 是否跳过 last_crawl_time 之后的脱榜记录（rank=0）
+
+    Returns:
+        {news_item_id: [(抓取时间, 排名)]}
+    """
+    if not has_packed_history(cursor.connection):
+        return {}
+
+    slot_times = load_slot_times(cursor)
+    rows = cursor.execute(f"""
+        SELECT p.news_item_id, p.history, n.last_crawl_time
+        FROM news_items n
+        JOIN rank_history_packed p ON p.news_item_id = n.id
+        {where}
+    """, params).fetchall()
+
+    history: Dict[int, List[Tuple[str, int]]] = {}
+    for news_id, blob, last_crawl_time in rows:
+        entries = decode_history(blob, slot_times)
+        if skip_trailing_off_list:
+            entries = [
+                (crawl_time, rank) for crawl_time, rank in entries
+                if not (rank == 0 and crawl_time > last_crawl_time)
+            ]
+        history[news_id] = entries
+    return history
+
+
+def merge_history_rows(
+    rows: Iterable[Tuple[int, int, str]],
+    packed: Dict[int, List[Tuple[str, int]]],
+) -> Iterator[Tuple[int, int, str]]:
+    """
+    合并压缩历史与 rank_history 原始行
+
+    Args:
+        rows: rank_history 原始行 (news_item_id, 排名, 抓取时间)
+        packed: load_packed_history 的结果
+
+    Yields:
+        (news_item_id, 排名, 抓取时间)，按 news_item_id、抓取时间排序
+    """
+    merged: Dict[int, List[Tuple[str, int]]] = {
+        news_id: list(entries) for news_id, entries in packed.items()
+    }
+    for news_id, rank, crawl_time in rows:
+        merged.setdefault(news_id, []).append((crawl_time, rank))
+
+    for news_id in sorted(merged):
+        # 稳定排序：同一抓取时间保持原有顺序
+        for crawl_time, rank in sorted(merged[news_id], key=lambda entry: entry[0]):
+            yield news_id, rank, crawl_time
+
+
+def compact_rank_history(conn: sqlite3.Connection) -> Optional[int]:
+    """
+    把 rank_history 原始行折叠进 rank_history_packed
+
+    已有的压缩数据会与新行合并后重新编码（slot 按全部抓取时间重新编号）。
+    调用方负责在之后执行 VACUUM 回收空间。
+
+    Args:
+        conn: 新闻数据库连接（表结构已初始化）
+
+    Returns:
+        折叠的原始行数；没有可压缩的行时为 0，超出编码范围时为 None
+    """
+    cursor = conn.cursor()
+    if cursor.execute("SELECT 1 FROM rank_history LIMIT 1").fetchone() is None:
+        return 0
+
+    raw_rows = cursor.execute(
+        "SELECT news_item_id, rank, crawl_time FROM rank_history ORDER BY news_item_id, crawl_time, id"
+    ).fetchall()
+    merged: Dict[int, List[Tuple[str, int]]] = {}
+    for news_id, rank, crawl_time in merge_history_rows(raw_rows, load_packed_history(cursor)):
+        merged.setdefault(news_id, []).append((crawl_time, rank))
+
+    slot_times = sorted({crawl_time for entries in merged.values() for crawl_time, _ in entries})
+    max_rank = max((rank for entries in merged.values() for _, rank in entries), default=0)
+    if len(slot_times) > MAX_PACKED_VALUE or max_rank > MAX_PACKED_VALUE:
+        return None
+    slot_of = {crawl_time: slot for slot, crawl_time in enumerate(slot_times)}
+
+    try:
+        cursor.execute("DELETE FROM rank_history_slots")
+        cursor.executemany(
+            "INSERT INTO rank_history_slots (slot, crawl_time) VALUES (?, ?)",
+            list(enumerate(slot_times)),
+        )
+        cursor.execute("DELETE FROM rank_history_packed")
+        cursor.executemany(
+            "INSERT INTO rank_history_packed (news_item_id, history) VALUES (?, ?)",
+            [
+                (news_id, encode_history([(slot_of[crawl_time], rank) for crawl_time, rank in entries]))
+                for news_id, entries in merged.items()
+            ],
+        )
+        folded = cursor.execute("DELETE FROM rank_history").rowcount
+        conn.commit()
+        return folded
+    except Exception:
+        conn.rollback()
+        raise
@@ -5,17 +5,34 @@
 支持 Cloudflare R2、阿里云 OSS、腾讯云 COS、AWS S3、MinIO 等
 使用 S3 兼容 API (boto3) 访问对象存储
 数据流程：下载当天 SQLite → 合并新数据 → 上传回远程
+
+同步模式（storage.remote.sync_mode）：
+- full: 每次保存上传完整数据库
+- delta: 只上传本次变更的行（增量段），段数达到 compact_every 时合并为完整数据库
+
+归档（storage.remote.archive）：已结束日期的数据库 VACUUM 后压缩为 {type}/{date}.db.gz（或 .zst），
+读取和拉取时透明解压；未压缩的 .db 存在时优先使用。
+
+清单（manifest.json）：每次上传、归档、清理后更新，记录各日期数据库的对象键、大小、ETag 等；
+列出日期、检查存在性和过期清理读取清单，不再遍历存储桶。
+
+本地缓存（storage.remote.cache_dir）：下载的数据库保存在持久目录中，并在旁边记录
+远程对象的 ETag 和大小；下次运行时 HEAD 比对一致且本地文件未被改动则跳过下载。
 """
 
+import json
+import os
 import pytz
 import re
 import shutil
 import sys
 import tempfile
+import time
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     import boto3
@@ -28,8 +45,38 @@ except ImportError:
     BotoConfig = None
     ClientError = Exception
 
+from trendradar.storage.archive import (
+    ARCHIVE_SUFFIXES,
+    compress_file,
+    decompress_file,
+    format_from_key,
+    resolve_archive_format,
+    vacuum_into,
+)
 from trendradar.storage.base import StorageBackend, NewsItem, NewsData, RSSItem, RSSData
+from trendradar.storage.delta import (
+    apply_changeset,
+    clear_changes,
+    delta_prefix,
+    export_changeset,
+    get_synced_seq,
+    has_pending_changes,
+    install_change_capture,
+    parse_segment_seq,
+    segment_key,
+    set_synced_seq,
+)
+from trendradar.storage.manifest import (
+    MANIFEST_KEY,
+    collect_db_stats,
+    entry_id,
+    make_entry,
+    new_manifest,
+)
+from trendradar.storage.multipart import MB, PRECONDITION_FAILED_CODES, upload_file
+from trendradar.storage.rank_pack import compact_rank_history
 from trendradar.storage.sqlite_mixin import SQLiteStorageMixin
+from trendradar.storage.sqlite_profile import checkpoint_sqlite, resolve_sqlite_pragmas
 from trendradar.utils.time import (
     DEFAULT_TIMEZONE,
     get_configured_time,
@@ -37,6 +84,12 @@ from trendradar.utils.time import (
     format_time_filename,
 )
 
+# 拉取远程数据时的默认并发数
+DEFAULT_PULL_WORKERS = 4
+
+# 远程清单的缓存时间（秒）：常驻模式下后端对象长期存在，过期后重新读取以看到其他写入端的更新
+MANIFEST_TTL_SECONDS = 60
+
 
 class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
     """
@@ -62,6 +115,16 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         enable_html: bool = True,
         temp_dir: Optional[str] = None,
         timezone: str = DEFAULT_TIMEZONE,
+        sqlite_pragmas: Optional[Dict[str, Any]] = None,
+        sync_mode: str = "full",
+        compact_every: int = 12,
+        cache_dir: Optional[str] = None,
+        archive: bool = False,
+        archive_format: str = "gzip",
+        part_size_mb: int = 8,
+        multipart_threshold_mb: int = 16,
+        upload_retries: int = 3,
+        upload_compat: Optional[bool] = None,
     ):
         """
         初始化远程存储后端
@@ -76,6 +139,17 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             enable_html: 是否启用 HTML 报告
             temp_dir: 临时目录路径（默认使用系统临时目录）
             timezone: 时区配置
+            sqlite_pragmas: SQLite PRAGMA 配置（默认使用 performance 预置配置）
+            sync_mode: 同步模式（"full" 全量上传 / "delta" 增量上传）
+            compact_every: delta 模式下累计多少个增量段后合并为完整数据库
+            cache_dir: 远程数据库的本地缓存目录（None 时使用临时目录，运行结束后删除）
+            archive: 是否压缩归档已结束日期的数据库
+            archive_format: 归档压缩格式（"gzip" / "zstd"）
+            part_size_mb: 分片上传的分片大小（MB）
+            multipart_threshold_mb: 文件达到该大小（MB）时使用分片上传
+            upload_retries: 单个上传请求（分片）的最大重试次数
+            upload_compat: 兼容模式，分片以 bytes 上传并显式设置 ContentLength
+                          （None 时腾讯云 COS、阿里云 OSS 自动开启）
         """
         if not HAS_BOTO3:
             raise ImportError("远程存储后端需要安装 boto3: pip install boto3")
@@ -86,11 +160,25 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         self.enable_txt = enable_txt
         self.enable_html = enable_html
         self.timezone = timezone
+        self.sqlite_pragmas = sqlite_pragmas if sqlite_pragmas is not None else resolve_sqlite_pragmas()
+
+        if sync_mode not in ("full", "delta"):
+            print(f"[远程存储] 未知的同步模式 '{sync_mode}'，使用 full")
+            sync_mode = "full"
+        self.sync_mode = sync_mode
+        self.compact_every = max(1, int(compact_every))
+        self.archive = archive
+        self.archive_format = resolve_archive_format(archive_format) if archive else archive_format
 
         # 创建临时目录
         self.temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.mkdtemp(prefix="trendradar_"))
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
+        # 数据库文件的持久缓存目录（TXT/HTML 快照仍写入临时目录）
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
         # 初始化 S3 客户端
         # 使用 virtual-hosted style addressing（主流）
         # 根据服务商选择签名版本：
@@ -99,6 +187,12 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         use_sigv2 = "myqcloud.com" in endpoint_url.lower() or "aliyuncs.com" in endpoint_url.lower()
         signature_version = 's3' if use_sigv2 else 's3v4'
 
+        # 分片上传配置
+        self.part_size = max(1, int(part_size_mb)) * MB
+        self.multipart_threshold = max(1, int(multipart_threshold_mb)) * MB
+        self.upload_retries = max(0, int(upload_retries))
+        self.upload_compat = use_sigv2 if upload_compat is None else bool(upload_compat)
+
         s3_config = BotoConfig(
             s3={"addressing_style": "virtual"},
             signature_version=signature_version,
@@ -118,8 +212,21 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         # 跟踪下载的文件（用于清理）
         self._downloaded_files: List[Path] = []
         self._db_connections: Dict[str, sqlite3.Connection] = {}
+        # 各远程数据库的同步状态
+        # {对象键: {"base_seq": 基础文件已合并的段序号, "latest_seq": 最新段序号, "etag": 基础文件 ETag, "size": 基础文件大小}}
+        self._delta_state: Dict[str, Dict[str, Any]] = {}
+
+        # 远程清单（首次使用时读取，缓存 MANIFEST_TTL_SECONDS 秒）
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_etag = ""
+        self._manifest_loaded_at: Optional[float] = None
+        # 存储服务是否支持条件写入（清单和增量段共用，返回不支持时关闭）
+        self._conditional_writes = True
 
-        print(f"[远程存储] 初始化完成，存储桶: {bucket_name}，签名版本: {signature_version}")
+        print(f"[远程存储] 初始化完成，存储桶: {bucket_name}，签名版本: {signature_version}，同步模式: {self.sync_mode}")
+
+        if self.cache_dir:
+            self._prune_cache()
 
     @property
     def backend_name(self) -> str:
@@ -161,52 +268,310 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
 
     def _get_local_db_path(self, date: Optional[str] = None, db_type: str = "news") -> Path:
         """
-        获取本地临时 SQLite 文件路径
+        获取本地 SQLite 文件路径（配置了缓存目录时位于缓存目录，否则位于临时目录）
 
         Args:
             date: 日期字符串
             db_type: 数据库类型 ("news" 或 "rss")
 
         Returns:
-            本地临时文件路径
+            本地文件路径
         """
         date_folder = self._format_date_folder(date)
-        db_dir = self.temp_dir / db_type
+        db_dir = (self.cache_dir or self.temp_dir) / db_type
         db_dir.mkdir(parents=True, exist_ok=True)
         return db_dir / f"{date_folder}.db"
 
-    def _check_object_exists(self, r2_key: str) -> bool:
+    def _head_object(self, r2_key: str) -> Optional[Dict[str, Any]]:
         """
-        检查远程存储中对象是否存在
+        获取远程对象的元信息
 
         Args:
             r2_key: 远程对象键
 
         Returns:
-            是否存在
+            head_object 响应，对象不存在时返回 None
         """
         try:
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=r2_key)
-            return True
+            return self.s3_client.head_object(Bucket=self.bucket_name, Key=r2_key)
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "")
             # S3 兼容存储可能返回 404, NoSuchKey, 或其他变体
             if error_code in ("404", "NoSuchKey", "Not Found"):
-                return False
+                return None
             # 其他错误（如权限问题）也视为不存在，但打印警告
             print(f"[远程存储] 检查对象存在性失败 ({r2_key}): {e}")
-            return False
+            return None
         except Exception as e:
             print(f"[远程存储] 检查对象存在性异常 ({r2_key}): {e}")
+            return None
+
+    def _check_object_exists(self, r2_key: str) -> bool:
+        """
+        检查远程存储中对象是否存在
+
+        Args:
+            r2_key: 远程对象键
+
+        Returns:
+            是否存在
+        """
+        return self._head_object(r2_key) is not None
+
+    # ========================================
+    # 本地缓存
+    # ========================================
+
+    @staticmethod
+    def _cache_meta_path(local_path: Path) -> Path:
+        return local_path.with_name(f"{local_path.name}.meta.json")
+
+    @staticmethod
+    def _local_file_state(local_path: Path) -> Optional[List[int]]:
+        """本地数据库文件状态 [大小, 修改时间 ns]；存在未合并的 WAL 时返回 None"""
+        wal_path = Path(f"{local_path}-wal")
+        if wal_path.exists() and wal_path.stat().st_size > 0:
+            return None
+        try:
+            stat = local_path.stat()
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _read_cache_meta(self, local_path: Path, r2_key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取本地缓存记录
+
+        Returns:
+            缓存记录；没有记录、记录不属于该对象或本地文件在记录后被改动过时返回 None
+        """
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_meta_path(local_path), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != r2_key or meta.get("file") != self._local_file_state(local_path):
+            return None
+        return meta
+
+    def _write_cache_meta(self, local_path: Path, r2_key: str, etag: str, size: int, base_seq: int) -> None:
+        """
+        记录本地缓存与远程对象的对应关系
+
+        Args:
+            local_path: 本地数据库路径（须已 checkpoint）
+            r2_key: 远程对象键
+            etag: 远程基础文件的 ETag
+            size: 远程基础文件大小
+            base_seq: 远程基础文件已合并的增量段序号
+        """
+        if not self.cache_dir or not etag:
+            return
+        meta = {
+            "key": r2_key,
+            "etag": etag,
+            "size": size,
+            "base_seq": base_seq,
+            "file": self._local_file_state(local_path),
+        }
+        meta_path = self._cache_meta_path(local_path)
+        tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, meta_path)
+        except OSError as e:
+            print(f"[远程存储] 写入缓存记录失败: {e}")
+
+    @staticmethod
+    def _remove_wal_files(local_path: Path) -> None:
+        for suffix in ("-wal", "-shm"):
+            Path(f"{local_path}{suffix}").unlink(missing_ok=True)
+
+    def _drop_cached_db(self, local_path: Path) -> None:
+        """删除本地缓存的数据库（远程已不存在时，与远程保持一致）"""
+        if not self.cache_dir or not local_path.exists():
+            return
+        try:
+            local_path.unlink()
+            self._remove_wal_files(local_path)
+            self._cache_meta_path(local_path).unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[远程存储] 删除本地缓存失败 {local_path}: {e}")
+
+    def _prune_cache(self, keep_days: int = 2) -> None:
+        """删除缓存目录中早于 keep_days 天的数据库（写入端只会用到当天的数据库）"""
+        cutoff = (self._get_configured_time() - timedelta(days=keep_days - 1)).strftime("%Y-%m-%d")
+        for db_type in ("news", "rss"):
+            db_dir = self.cache_dir / db_type
+            if not db_dir.exists():
+                continue
+            for item in db_dir.iterdir():
+                match = re.match(r"(\d{4}-\d{2}-\d{2})\.db", item.name)
+                if match and match.group(1) < cutoff:
+                    try:
+                        item.unlink()
+                    except OSError as e:
+                        print(f"[远程存储] 清理缓存文件失败 {item}: {e}")
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        """是否为对象不存在错误（S3 兼容存储可能返回 404、NoSuchKey 或其他变体）"""
+        if not isinstance(error, ClientError) or not hasattr(error, "response"):
             return False
+        error_code = error.response.get("Error", {}).get("Code", "")
+        return error_code in ("404", "NoSuchKey", "Not Found")
 
-    def _download_sqlite(self, date: Optional[str] = None, db_type: str = "news") -> Optional[Path]:
+    def _download_object(self, r2_key: str, local_path: Path) -> Dict[str, Any]:
         """
-        从远程存储下载当天的 SQLite 文件到本地临时目录
+        下载远程对象到本地文件
 
         使用 get_object + iter_chunks 替代 download_file，
         以正确处理腾讯云 COS 的 chunked transfer encoding。
 
+        Returns:
+            {"etag": ETag, "size": 对象大小}
+        """
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=r2_key)
+        with open(local_path, 'wb') as f:
+            for chunk in response['Body'].iter_chunks(chunk_size=1024*1024):
+                f.write(chunk)
+        return {"etag": response.get("ETag", ""), "size": local_path.stat().st_size}
+
+    def _list_delta_seqs(self, r2_key: str) -> List[int]:
+        """列出远程数据库的所有增量段序号（升序）"""
+        seqs = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=delta_prefix(r2_key)):
+            for obj in page.get('Contents', []):
+                seq = parse_segment_seq(obj['Key'])
+                if seq is not None:
+                    seqs.append(seq)
+        return sorted(seqs)
+
+    def _manifest_delta_seq(self, r2_key: str) -> int:
+        """清单中记录的该数据库最新增量段序号（没有清单或没有记录时为 0）"""
+        manifest = self._load_manifest()
+        if manifest is None:
+            return 0
+        for entry in manifest["entries"].values():
+            if entry.get("key") == r2_key:
+                return entry.get("delta_seq", 0) or 0
+        return 0
+
+    def _apply_remote_deltas(
+        self,
+        local_path: Path,
+        r2_key: str,
+        db_type: str,
+        base_seq: Optional[int] = None,
+    ) -> None:
+        """
+        把本地数据库尚未包含的增量段应用上去
+
+        应用前先完成表结构迁移，避免新版本写入的列因基础文件结构较旧而丢失。
+        full 模式下只有清单记录了更新的增量段（其他写入端使用 delta 模式）时才列举增量段，
+        避免每次下载都多一次 LIST 请求。
+
+        Args:
+            local_path: 本地数据库路径
+            r2_key: 远程基础文件对象键
+            db_type: 数据库类型
+            base_seq: 远程基础文件已合并的段序号（None 表示本地文件就是刚下载的基础文件）
+        """
+        conn = sqlite3.connect(str(local_path))
+        try:
+            applied_seq = get_synced_seq(conn)
+            if base_seq is None:
+                base_seq = applied_seq
+            if self.sync_mode == "full" and self._manifest_delta_seq(r2_key) <= applied_seq:
+                seqs = []
+            else:
+                seqs = [seq for seq in self._list_delta_seqs(r2_key) if seq > applied_seq]
+            self._delta_state[r2_key] = {
+                "base_seq": base_seq,
+                "latest_seq": seqs[-1] if seqs else applied_seq,
+            }
+            if not seqs:
+                return
+
+            self._init_tables(conn, db_type)
+            for seq in seqs:
+                segment_path = local_path.with_name(f"{local_path.stem}.delta-{seq:06d}.db")
+                try:
+                    self._download_object(segment_key(r2_key, seq), segment_path)
+                    apply_changeset(conn, segment_path)
+                finally:
+                    segment_path.unlink(missing_ok=True)
+            set_synced_seq(conn, seqs[-1])
+            print(f"[远程存储] 已应用 {len(seqs)} 个增量段: {r2_key}")
+        finally:
+            conn.close()
+
+    def _fetch_day_db(
+        self,
+        r2_key: str,
+        local_path: Path,
+        db_type: str,
+        head: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        下载基础文件并应用增量段，得到完整的数据库
+
+        本地缓存与远程基础文件一致（ETag 和大小相同）时跳过下载，只应用新的增量段。
+        增量段可能在下载期间被其他写入端合并删除，此时重新下载一次基础文件。
+
+        Args:
+            r2_key: 远程基础文件对象键
+            local_path: 本地数据库路径
+            db_type: 数据库类型
+            head: 基础文件的 head_object 响应（用于与本地缓存比对）
+
+        Returns:
+            是否命中本地缓存
+        """
+        meta = self._read_cache_meta(local_path, r2_key) if head else None
+        if (
+            meta is not None
+            and head.get("ETag") == meta.get("etag")
+            and head.get("ContentLength") == meta.get("size")
+        ):
+            try:
+                self._apply_remote_deltas(local_path, r2_key, db_type, base_seq=meta.get("base_seq", 0))
+                self._delta_state[r2_key].update(etag=meta["etag"], size=meta["size"])
+                self._write_cache_meta(local_path, r2_key, meta["etag"], meta["size"], meta.get("base_seq", 0))
+                return True
+            except ClientError as e:
+                if not self._is_not_found(e):
+                    raise
+                print(f"[远程存储] 增量段已被合并，重新下载: {r2_key}")
+
+        for attempt in range(2):
+            # 残留的 WAL 属于旧文件，必须与其一起丢弃
+            self._remove_wal_files(local_path)
+            downloaded = self._download_object(r2_key, local_path)
+            try:
+                self._apply_remote_deltas(local_path, r2_key, db_type)
+                break
+            except ClientError as e:
+                if attempt == 0 and self._is_not_found(e):
+                    print(f"[远程存储] 增量段已被合并，重新下载: {r2_key}")
+                    continue
+                raise
+        state = self._delta_state[r2_key]
+        state.update(downloaded)
+        if head is not None:
+            self._write_cache_meta(local_path, r2_key, state["etag"], state["size"], state["base_seq"])
+        return False
+
+    def _download_sqlite(self, date: Optional[str] = None, db_type: str = "news") -> Optional[Path]:
+        """
+        从远程存储下载当天的 SQLite 文件到本地目录
+
+        配置了缓存目录且本地缓存与远程一致时不重新下载。
+
         Args:
             date: 日期字符串
             db_type: 数据库类型 ("news" 或 "rss")
@@ -220,25 +585,39 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         # 确保目录存在
         local_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 先检查文件是否存在
-        if not self._check_object_exists(r2_key):
+        # 先检查文件是否存在：清单记录为归档时不再 HEAD；
+        # 其余情况总是 HEAD，清单可能落后于实际对象，不能用其 ETag 判断本地缓存是否可复用
+        entry = self._get_manifest_entry(db_type, self._format_date_folder(date))
+        if entry is not None and entry.get("format"):
+            head = None
+        else:
+            head = self._head_object(r2_key)
+
+        if head is None:
+            # 已结束的日期可能已被压缩归档
+            if self._format_date_folder(date) < self._format_date_folder():
+                archive_key = entry["key"] if entry and entry.get("format") else self._find_archive(r2_key)
+                if archive_key:
+                    self._remove_wal_files(local_path)
+                    self._download_archive(archive_key, local_path)
+                    self._downloaded_files.append(local_path)
+                    print(f"[远程存储] 已下载归档: {archive_key} -> {local_path}")
+                    return local_path
             print(f"[远程存储] 文件不存在，将创建新数据库: {r2_key}")
+            self._drop_cached_db(local_path)
             return None
 
         try:
-            # 使用 get_object + iter_chunks 替代 download_file
-            # iter_chunks 会自动处理 chunked transfer encoding
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=r2_key)
-            with open(local_path, 'wb') as f:
-                for chunk in response['Body'].iter_chunks(chunk_size=1024*1024):
-                    f.write(chunk)
-            self._downloaded_files.append(local_path)
-            print(f"[远程存储] 已下载: {r2_key} -> {local_path}")
+            if self._fetch_day_db(r2_key, local_path, db_type, head=head):
+                print(f"[远程存储] 本地缓存与远程一致，跳过下载: {r2_key}")
+            else:
+                self._downloaded_files.append(local_path)
+                print(f"[远程存储] 已下载: {r2_key} -> {local_path}")
             return local_path
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "")
             # S3 兼容存储可能返回不同的错误码
-            if error_code in ("404", "NoSuchKey", "Not Found"):
+            if self._is_not_found(e):
                 print(f"[远程存储] 文件不存在，将创建新数据库: {r2_key}")
                 return None
             else:
@@ -252,6 +631,9 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         """
         上传本地 SQLite 文件到远程存储
 
+        delta 模式下只上传增量段；远程尚无基础文件或增量段数达到 compact_every 时
+        上传完整数据库（合并），并删除已合并的增量段。
+
         Args:
             date: 日期字符串
             db_type: 数据库类型 ("news" 或 "rss")
@@ -266,30 +648,44 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             print(f"[远程存储] 本地文件不存在，无法上传: {local_path}")
             return False
 
+        conn = self._db_connections.get(str(local_path))
+        state = self._delta_state.get(r2_key)
+
+        if self.sync_mode == "delta" and conn is not None and state is not None:
+            if state["latest_seq"] - state["base_seq"] < self.compact_every:
+                return self._upload_delta_segment(conn, local_path, r2_key, state)
+            print(f"[远程存储] 已累计 {state['latest_seq'] - state['base_seq']} 个增量段，上传完整数据库合并")
+
+        # 完整数据库已包含到目前为止的所有增量段
+        if conn is not None and state is not None:
+            set_synced_seq(conn, state["latest_seq"])
+
+        # WAL 模式下先把日志合并回主文件，保证上传的单个文件包含全部数据
+        if conn is not None:
+            checkpoint_sqlite(conn)
+
         try:
             # 获取本地文件大小
             local_size = local_path.stat().st_size
             print(f"[远程存储] 准备上传: {local_path} ({local_size} bytes) -> {r2_key}")
 
-            # 读取文件内容为 bytes 后上传
-            # 避免传入文件对象时 requests 库使用 chunked transfer encoding
-            # 腾讯云 COS 等 S3 兼容服务可能无法正确处理 chunked encoding
-            with open(local_path, 'rb') as f:
-                file_content = f.read()
-
-            # 使用 put_object 并明确设置 ContentLength，确保不使用 chunked encoding
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=r2_key,
-                Body=file_content,
-                ContentLength=local_size,
-                ContentType='application/x-sqlite3',
-            )
+            # 大文件分片流式上传，内存占用与数据库大小无关
+            self._put_file(r2_key, local_path, 'application/x-sqlite3')
             print(f"[远程存储] 已上传: {local_path} -> {r2_key}")
 
             # 验证上传成功
-            if self._check_object_exists(r2_key):
+            head = self._head_object(r2_key)
+            if head is not None:
                 print(f"[远程存储] 上传验证成功: {r2_key}")
+                self._after_full_upload(conn, r2_key, state)
+                state = self._delta_state[r2_key]
+                state["etag"] = head.get("ETag", "")
+                state["size"] = head.get("ContentLength", local_size)
+                self._write_cache_meta(local_path, r2_key, state["etag"], state["size"], state["base_seq"])
+                self._record_manifest_entry(
+                    db_type, self._format_date_folder(date), r2_key, state["size"], state["etag"],
+                    delta_seq=state["latest_seq"], conn=conn,
+                )
                 return True
             else:
                 print(f"[远程存储] 上传验证失败: 文件未在远程存储中找到")
@@ -299,6 +695,136 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             print(f"[远程存储] 上传失败: {e}")
             return False
 
+    def _put_file(
+        self,
+        key: str,
+        path: Path,
+        content_type: str,
+        metadata: Optional[Dict[str, str]] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        """
+        上传本地文件：小文件单次 put_object，达到阈值时按固定大小分片流式上传
+
+        兼容模式下每次请求都以 bytes 发送并显式设置 ContentLength，
+        避免腾讯云 COS 等服务无法处理的 chunked transfer encoding。
+        """
+        upload_file(
+            self.s3_client,
+            self.bucket_name,
+            key,
+            path,
+            content_type=content_type,
+            metadata=metadata,
+            part_size=self.part_size,
+            multipart_threshold=self.multipart_threshold,
+            max_retries=self.upload_retries,
+            compat=self.upload_compat,
+            if_none_match=if_none_match,
+        )
+
+    def _after_full_upload(
+        self,
+        conn: Optional[sqlite3.Connection],
+        r2_key: str,
+        state: Optional[Dict[str, Any]],
+    ) -> None:
+        """完整数据库上传成功后：清空变更记录，删除已合并的增量段"""
+        if conn is not None:
+            clear_changes(conn)
+
+        if state is None:
+            # 上传的数据库可能来自归档，保留其中记录的段序号
+            seq = get_synced_seq(conn) if conn is not None else 0
+            self._delta_state[r2_key] = {"base_seq": seq, "latest_seq": seq}
+            return
+
+        merged = range(state["base_seq"] + 1, state["latest_seq"] + 1)
+        state["base_seq"] = state["latest_seq"]
+        if not merged:
+            return
+
+        try:
+            self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={'Objects': [{'Key': segment_key(r2_key, seq)} for seq in merged]},
+            )
+            print(f"[远程存储] 已合并并删除 {len(merged)} 个增量段: {r2_key}")
+        except Exception as e:
+            # 残留的段序号不大于基础文件记录的序号，读取时会被忽略
+            print(f"[远程存储] 删除已合并的增量段失败: {e}")
+
+    def _upload_delta_segment(
+        self,
+        conn: sqlite3.Connection,
+        local_path: Path,
+        r2_key: str,
+        state: Dict[str, Any],
+    ) -> bool:
+        """
+        导出并上传本次变更的增量段
+
+        段文件使用 If-None-Match 条件写入，避免两个写入端使用同一序号时后者覆盖前者；
+        序号已被占用时重新列举并使用下一个空闲序号。
+        """
+        if not has_pending_changes(conn):
+            print(f"[远程存储] 没有新的变更，跳过上传: {r2_key}")
+            return True
+
+        expected_seq = state["latest_seq"] + 1
+        segment_path = local_path.with_name(f"{local_path.stem}.delta-{expected_seq:06d}.db")
+
+        try:
+            row_count = export_changeset(conn, segment_path)
+            segment_size = segment_path.stat().st_size
+            seq = expected_seq
+            for attempt in range(3):
+                key = segment_key(r2_key, seq)
+                try:
+                    self._put_file(
+                        key, segment_path, 'application/x-sqlite3',
+                        if_none_match="*" if self._conditional_writes else None,
+                    )
+                    break
+                except Exception as e:
+                    if self._conditional_writes and self._is_conditional_unsupported(e):
+                        print(f"[远程存储] 存储服务不支持条件写入，增量段改为直接上传: {e}")
+                        self._conditional_writes = False
+                        self._put_file(key, segment_path, 'application/x-sqlite3')
+                        break
+                    if not self._is_precondition_failed(e) or attempt == 2:
+                        raise
+                    seqs = self._list_delta_seqs(r2_key)
+                    seq = max(seqs[-1] if seqs else 0, seq) + 1
+                    print(f"[远程存储] 增量段序号已被其他写入端占用，改用 {seq}: {r2_key}")
+            # 上传成功后才清空变更记录，失败时下次上传会包含这些变更
+            clear_changes(conn)
+            state["latest_seq"] = seq
+
+            # 本地缓存已包含该段，下次运行只需应用更新的段；
+            # 跳过了其他写入端的段时本地缓存并不包含它们，保持原同步序号以便下次补上
+            if self.cache_dir and seq == expected_seq:
+                set_synced_seq(conn, seq)
+                checkpoint_sqlite(conn)
+                self._write_cache_meta(
+                    local_path, r2_key, state.get("etag", ""), state.get("size", 0), state["base_seq"]
+                )
+            print(
+                f"[远程存储] 已上传增量段: {key}（{row_count} 行，{segment_size} bytes，"
+                f"完整数据库 {local_path.stat().st_size} bytes）"
+            )
+            db_type, date_str = r2_key[:-len(".db")].split("/", 1)
+            self._record_manifest_entry(
+                db_type, date_str, r2_key, state.get("size", 0), state.get("etag", ""),
+                delta_seq=seq, conn=conn,
+            )
+            return True
+        except Exception as e:
+            print(f"[远程存储] 增量段上传失败: {e}")
+            return False
+        finally:
+            segment_path.unlink(missing_ok=True)
+
     def _get_connection(self, date: Optional[str] = None, db_type: str = "news") -> sqlite3.Connection:
         """
         获取数据库连接
@@ -317,13 +843,16 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             # 确保目录存在
             local_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # 如果本地不存在，尝试从远程存储下载
-            if not local_path.exists():
+            # 本地不存在时从远程存储下载；使用缓存目录时总是与远程比对
+            if self.cache_dir or not local_path.exists():
                 self._download_sqlite(date, db_type)
 
             conn = sqlite3.connect(db_path)
             conn.row_factory = sqlite3.Row
+            self._configure_connection(conn)
             self._init_tables(conn, db_type)
+            if self.sync_mode == "delta":
+                install_change_capture(conn)
             self._db_connections[db_path] = conn
 
         return self._db_connections[db_path]
@@ -394,6 +923,14 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         """检查是否是当天第一次抓取"""
         return self._is_first_crawl_today_impl(date)
 
+    def get_platform_fingerprints(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的平台指纹"""
+        return self._get_platform_fingerprints_impl(date)
+
+    def get_platform_health(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的平台健康记录"""
+        return self._get_platform_health_impl(date)
+
     # ========================================
     # 时间段执行记录（调度系统）
     # ========================================
@@ -457,6 +994,10 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         """检测新增的 RSS 条目"""
         return self._detect_new_rss_items_impl(current_data)
 
+    def get_rss_feed_validators(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """获取已保存的 RSS 源 HTTP 校验头"""
+        return self._get_rss_feed_validators_impl(date)
+
     def get_latest_rss_data(self, date: Optional[str] = None) -> Optional[RSSData]:
         """获取最新一次抓取的 RSS 数据"""
         return self._get_latest_rss_data_impl(date)
@@ -588,40 +1129,12 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         cutoff_date = self._get_configured_time() - timedelta(days=retention_days)
 
         try:
-            # 列出远程存储中 news/ 前缀下的所有对象
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix="news/")
-
-            # 收集需要删除的对象键
-            objects_to_delete = []
-            deleted_dates = set()
-
-            for page in pages:
-                if 'Contents' not in page:
-                    continue
-
-                for obj in page['Contents']:
-                    key = obj['Key']
-
-                    # 解析日期（格式: news/YYYY-MM-DD.db）
-                    folder_date = None
-                    date_str = None
-                    try:
-                        date_match = re.match(r'news/(\d{4})-(\d{2})-(\d{2})\.db$', key)
-                        if date_match:
-                            folder_date = datetime(
-                                int(date_match.group(1)),
-                                int(date_match.group(2)),
-                                int(date_match.group(3)),
-                                tzinfo=pytz.timezone(self.timezone)
-                            )
-                            date_str = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}"
-                    except Exception:
-                        continue
-
-                    if folder_date and folder_date < cutoff_date:
-                        objects_to_delete.append({'Key': key})
-                        deleted_dates.add(date_str)
+            # 收集需要删除的对象键：有清单时读取最新清单，否则遍历存储桶
+            manifest = self._load_manifest(refresh=True)
+            if manifest is not None:
+                objects_to_delete, deleted_dates = self._collect_expired_from_manifest(manifest, cutoff_date)
+            else:
+                objects_to_delete, deleted_dates = self._collect_expired_from_listing(cutoff_date)
 
             # 批量删除对象（每次最多 1000 个）
             if objects_to_delete:
@@ -643,12 +1156,78 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
 
                 print(f"[远程存储] 共清理 {deleted_count} 个过期日期数据库文件")
 
+                if manifest is not None:
+                    def mutate(current: Dict[str, Any]) -> None:
+                        for date_str in deleted_dates:
+                            current["entries"].pop(entry_id("news", date_str), None)
+
+                    self._update_manifest(mutate)
+
             return deleted_count
 
         except Exception as e:
             print(f"[远程存储] 清理过期数据失败: {e}")
             return deleted_count
 
+    def _collect_expired_from_manifest(
+        self, manifest: Dict[str, Any], cutoff_date: datetime
+    ) -> Tuple[List[Dict[str, str]], set]:
+        """根据清单收集过期的 news 数据库对象键（含增量段和未压缩 / 归档两种形式）"""
+        cutoff_str = cutoff_date.strftime("%Y-%m-%d")
+        objects_to_delete = []
+        deleted_dates = set()
+
+        for entry in manifest["entries"].values():
+            date_str = entry.get("date", "")
+            if entry.get("db_type") != "news" or not date_str or date_str > cutoff_str:
+                continue
+            raw_key = f"news/{date_str}.db"
+            keys = {entry["key"], raw_key}
+            keys.update(segment_key(raw_key, seq) for seq in range(1, int(entry.get("delta_seq", 0)) + 1))
+            objects_to_delete.extend({'Key': key} for key in sorted(keys))
+            deleted_dates.add(date_str)
+
+        return objects_to_delete, deleted_dates
+
+    def _collect_expired_from_listing(self, cutoff_date: datetime) -> Tuple[List[Dict[str, str]], set]:
+        """遍历存储桶收集过期的 news 数据库对象键"""
+        # 列出远程存储中 news/ 前缀下的所有对象
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.bucket_name, Prefix="news/")
+
+        # 收集需要删除的对象键
+        objects_to_delete = []
+        deleted_dates = set()
+
+        for page in pages:
+            if 'Contents' not in page:
+                continue
+
+            for obj in page['Contents']:
+                key = obj['Key']
+
+                # 解析日期（格式: news/YYYY-MM-DD.db、归档 news/YYYY-MM-DD.db.gz 或增量段 news/YYYY-MM-DD.delta/NNNNNN.db）
+                folder_date = None
+                date_str = None
+                try:
+                    date_match = re.match(r'news/(\d{4})-(\d{2})-(\d{2})(?:\.db(?:\.gz|\.zst)?$|\.delta/)', key)
+                    if date_match:
+                        folder_date = datetime(
+                            int(date_match.group(1)),
+                            int(date_match.group(2)),
+                            int(date_match.group(3)),
+                            tzinfo=pytz.timezone(self.timezone)
+                        )
+                        date_str = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}"
+                except Exception:
+                    continue
+
+                if folder_date and folder_date < cutoff_date:
+                    objects_to_delete.append({'Key': key})
+                    deleted_dates.add(date_str)
+
+        return objects_to_delete, deleted_dates
+
     def __del__(self):
         """析构函数"""
         # 检查 Python 是否正在关闭
@@ -661,93 +1240,605 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             pass
 
     # ========================================
-    # 远程特有功能：数据拉取和列表
+    # 远程清单
     # ========================================
 
-    def pull_recent_days(self, days: int, local_data_dir: str = "output") -> int:
+    @staticmethod
+    def _is_precondition_failed(error: Exception) -> bool:
+        if not isinstance(error, ClientError) or not hasattr(error, "response"):
+            return False
+        error_code = error.response.get("Error", {}).get("Code", "")
+        return error_code in PRECONDITION_FAILED_CODES
+
+    @staticmethod
+    def _is_conditional_unsupported(error: Exception) -> bool:
+        """存储服务是否明确表示不支持条件写入（超时、5xx、限流等不算）"""
+        if not isinstance(error, ClientError) or not hasattr(error, "response"):
+            return False
+        error_code = error.response.get("Error", {}).get("Code", "")
+        return error_code in ("501", "NotImplemented")
+
+    def _load_manifest(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
-        从远程拉取最近 N 天的数据到本地
+        读取远程清单（缓存 MANIFEST_TTL_SECONDS 秒，过期或 refresh=True 时重新读取）
+
+        Returns:
+            清单；不存在或读取失败时返回 None
+        """
+        if (
+            not refresh
+            and self._manifest_loaded_at is not None
+            and time.monotonic() - self._manifest_loaded_at < MANIFEST_TTL_SECONDS
+        ):
+            return self._manifest
+
+        manifest, etag = None, ""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=MANIFEST_KEY)
+            manifest = json.loads(response['Body'].read().decode("utf-8"))
+            etag = response.get("ETag", "")
+            if not isinstance(manifest.get("entries"), dict):
+                raise ValueError("缺少 entries")
+        except ClientError as e:
+            manifest = None
+            if not self._is_not_found(e):
+                print(f"[远程存储] 读取清单失败: {e}")
+        except Exception as e:
+            manifest = None
+            print(f"[远程存储] 清单无法解析，将按存储桶列表处理: {e}")
+
+        self._manifest, self._manifest_etag = manifest, etag
+        self._manifest_loaded_at = time.monotonic()
+        return manifest
+
+    def _build_manifest_from_listing(self) -> Dict[str, Any]:
+        """遍历存储桶生成清单（清单尚不存在时的初始化，不含行数统计）"""
+        manifest = new_manifest()
+        for db_type in ("news", "rss"):
+            for date_str, obj in self._list_remote_objects(db_type).items():
+                manifest["entries"][entry_id(db_type, date_str)] = make_entry(
+                    db_type, date_str, obj["key"], obj["size"], obj["etag"],
+                    archive_format=obj["format"],
+                )
+        print(f"[远程存储] 已根据存储桶列表初始化清单（{len(manifest['entries'])} 个数据库）")
+        return manifest
+
+    def _update_manifest(self, mutate: Callable[[Dict[str, Any]], None]) -> bool:
+        """
+        读取 → 修改 → 写回清单
+
+        使用条件写入（If-Match / If-None-Match）避免并发写入端互相覆盖，冲突或写入出错时重新读取后重试；
+        只有存储服务明确返回不支持条件写入（501 / NotImplemented）时才退化为直接覆盖。
 
         Args:
-            days: 拉取天数
-            local_data_dir: 本地数据目录
+            mutate: 就地修改清单的函数
 
         Returns:
-            成功拉取的数据库文件数量
+            是否写入成功
         """
-        if days <= 0:
-            return 0
+        for attempt in range(3):
+            manifest = self._load_manifest(refresh=attempt > 0)
+            etag = self._manifest_etag
+            if manifest is None:
+                manifest = self._build_manifest_from_listing()
+                etag = ""
+
+            mutate(manifest)
+            manifest["updated_at"] = self._get_configured_time().strftime("%Y-%m-%d %H:%M:%S")
+            body = json.dumps(manifest, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+            put_kwargs = {
+                "Bucket": self.bucket_name,
+                "Key": MANIFEST_KEY,
+                "Body": body,
+                "ContentLength": len(body),
+                "ContentType": "application/json",
+            }
+            if self._conditional_writes:
+                if etag:
+                    put_kwargs["IfMatch"] = etag
+                else:
+                    put_kwargs["IfNoneMatch"] = "*"
 
-        local_dir = Path(local_data_dir)
-        local_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                response = self.s3_client.put_object(**put_kwargs)
+            except Exception as e:
+                if self._is_precondition_failed(e):
+                    print("[远程存储] 清单已被其他写入端更新，重新读取后重试")
+                    continue
+                if self._conditional_writes and self._is_conditional_unsupported(e):
+                    print(f"[远程存储] 存储服务不支持条件写入，清单改为直接覆盖: {e}")
+                    self._conditional_writes = False
+                    continue
+                print(f"[远程存储] 更新清单失败，重新读取后重试: {e}")
+                continue
 
-        pulled_count = 0
-        now = self._get_configured_time()
+            self._manifest = manifest
+            self._manifest_etag = response.get("ETag", "")
+            self._manifest_loaded_at = time.monotonic()
+            return True
 
-        print(f"[远程存储] 开始拉取最近 {days} 天的数据...")
+        print("[远程存储] 清单更新多次失败，放弃本次更新")
+        return False
 
-        for i in range(days):
-            date = now - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
+    def _record_manifest_entry(
+        self,
+        db_type: str,
+        date: str,
+        key: str,
+        size: int,
+        etag: str,
+        archive_format: Optional[str] = None,
+        delta_seq: int = 0,
+        conn: Optional[sqlite3.Connection] = None,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """上传成功后更新清单中该日期数据库的记录"""
+        if stats is None and conn is not None:
+            try:
+                stats = collect_db_stats(conn)
+            except sqlite3.Error as e:
+                print(f"[远程存储] 统计数据库行数失败: {e}")
 
-            # 本地目标路径
-            local_date_dir = local_dir / date_str
-            local_db_path = local_date_dir / "news.db"
+        entry = make_entry(db_type, date, key, size, etag, archive_format, delta_seq, stats)
 
-            # 如果本地已存在，跳过
-            if local_db_path.exists():
-                print(f"[远程存储] 跳过（本地已存在）: {date_str}")
-                continue
+        def mutate(manifest: Dict[str, Any]) -> None:
+            entry["updated_at"] = self._get_configured_time().strftime("%Y-%m-%d %H:%M:%S")
+            manifest["entries"][entry_id(db_type, date)] = entry
 
-            # 远程对象键
-            remote_key = f"news/{date_str}.db"
+        self._update_manifest(mutate)
 
-            # 检查远程是否存在
-            if not self._check_object_exists(remote_key):
-                print(f"[远程存储] 跳过（远程不存在）: {date_str}")
-                continue
+    def _get_manifest_entry(self, db_type: str, date: str) -> Optional[Dict[str, Any]]:
+        """清单中某日期数据库的记录，没有清单或没有记录时返回 None"""
+        manifest = self._load_manifest()
+        if manifest is None:
+            return None
+        return manifest["entries"].get(entry_id(db_type, date))
+
+    def _get_remote_index(self, db_type: str = "news") -> Dict[str, Dict[str, Any]]:
+        """
+        远程某类型的所有日期数据库（优先读取清单，没有清单时遍历存储桶）
+
+        Returns:
+            {日期: {"key": 对象键, "size": 大小, "etag": ETag, "format": 归档格式}}
+        """
+        manifest = self._load_manifest()
+        if manifest is None:
+            return self._list_remote_objects(db_type)
+        return {
+            entry["date"]: {
+                "key": entry["key"],
+                "size": entry.get("size", 0),
+                "etag": entry.get("etag", ""),
+                "format": entry.get("format"),
+            }
+            for entry in manifest["entries"].values()
+            if entry.get("db_type") == db_type
+        }
+
+    def rebuild_manifest(self) -> bool:
+        """遍历存储桶重建清单（清单丢失或与存储桶不一致时使用）"""
+        rebuilt = self._build_manifest_from_listing()
+
+        def mutate(manifest: Dict[str, Any]) -> None:
+            # 保留已有记录中的行数统计
+            for key, entry in rebuilt["entries"].items():
+                previous = manifest["entries"].get(key, {})
+                if previous.get("key") == entry["key"] and previous.get("etag") == entry["etag"]:
+                    entry["rows"] = previous.get("rows", {})
+                    entry["schema_version"] = previous.get("schema_version", 0)
+                    entry["delta_seq"] = previous.get("delta_seq", 0)
+            manifest["entries"] = rebuilt["entries"]
+
+        return self._update_manifest(mutate)
+
+    # ========================================
+    # 远程特有功能：压缩归档
+    # ========================================
+
+    def _find_archive(self, r2_key: str) -> Optional[str]:
+        """查找数据库的压缩归档对象键，不存在时返回 None"""
+        for suffix in ARCHIVE_SUFFIXES.values():
+            if self._check_object_exists(r2_key + suffix):
+                return r2_key + suffix
+        return None
+
+    def _download_archive(self, archive_key: str, local_path: Path) -> None:
+        """下载压缩归档并解压到本地路径"""
+        archive_format = format_from_key(archive_key)
+        compressed_path = local_path.with_name(local_path.name + ARCHIVE_SUFFIXES[archive_format])
+        try:
+            self._download_object(archive_key, compressed_path)
+            decompress_file(compressed_path, local_path, archive_format)
+        finally:
+            compressed_path.unlink(missing_ok=True)
+
+    def archive_closed_days(self, db_types: Tuple[str, ...] = ("news", "rss")) -> int:
+        """
+        压缩归档已结束日期的数据库
 
-            # 下载（使用 get_object + iter_chunks 处理 chunked encoding）
+        对每个早于今天、仍以未压缩 .db 存放的数据库：下载（含增量段）→ 压缩排名历史 → VACUUM → 压缩 →
+        上传 {type}/{date}.db.gz（对象元数据记录原始大小和段序号）→ 删除原 .db 和增量段。
+        当天的数据库保持未压缩，继续增量写入。
+
+        Args:
+            db_types: 归档的数据库类型
+
+        Returns:
+            归档的数据库数量
+        """
+        if not self.archive:
+            return 0
+
+        today = self._format_date_folder()
+        suffix = ARCHIVE_SUFFIXES[self.archive_format]
+        archived_count = 0
+
+        for db_type in db_types:
             try:
-                local_date_dir.mkdir(parents=True, exist_ok=True)
-                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=remote_key)
-                with open(local_db_path, 'wb') as f:
-                    for chunk in response['Body'].iter_chunks(chunk_size=1024*1024):
-                        f.write(chunk)
-                print(f"[远程存储] 已拉取: {remote_key} -> {local_db_path}")
-                pulled_count += 1
+                remote_objects = self._get_remote_index(db_type)
             except Exception as e:
-                print(f"[远程存储] 拉取失败 ({date_str}): {e}")
+                print(f"[远程存储] 列出远程 {db_type} 数据失败，跳过归档: {e}")
+                continue
+
+            for date_str, obj in sorted(remote_objects.items()):
+                if date_str >= today or obj["format"]:
+                    continue
+
+                r2_key = obj["key"]
+                archive_key = r2_key + suffix
+                work_dir = Path(tempfile.mkdtemp(prefix="archive_", dir=self.temp_dir))
+                try:
+                    raw_path = work_dir / f"{date_str}.db"
+                    compact_path = work_dir / f"{date_str}.vacuum.db"
+                    compressed_path = work_dir / f"{date_str}.db{suffix}"
+
+                    self._fetch_day_db(r2_key, raw_path, db_type)
+                    conn = sqlite3.connect(str(raw_path))
+                    try:
+                        delta_seq = get_synced_seq(conn)
+                        # 已结束日期的排名历史折叠为编码数据，随后的 VACUUM INTO 回收空间
+                        if db_type == "news":
+                            self._init_tables(conn, db_type)
+                            folded = compact_rank_history(conn)
+                            if folded:
+                                print(f"[远程存储] 已压缩排名历史: {r2_key}（{folded} 行）")
+                    finally:
+                        conn.close()
+                    vacuum_into(raw_path, compact_path)
+                    compress_file(compact_path, compressed_path, self.archive_format)
+
+                    raw_size = compact_path.stat().st_size
+                    archive_size = compressed_path.stat().st_size
+                    self._put_file(
+                        archive_key,
+                        compressed_path,
+                        'application/octet-stream',
+                        metadata={
+                            "archive-format": self.archive_format,
+                            "raw-size": str(raw_size),
+                            "delta-seq": str(delta_seq),
+                        },
+                    )
+                    head = self._head_object(archive_key)
+                    if head is None:
+                        print(f"[远程存储] 归档上传验证失败: {archive_key}")
+                        continue
+
+                    conn = sqlite3.connect(str(compact_path))
+                    try:
+                        stats = collect_db_stats(conn)
+                    finally:
+                        conn.close()
+                    self._record_manifest_entry(
+                        db_type, date_str, archive_key, archive_size, head.get("ETag", ""),
+                        archive_format=self.archive_format, delta_seq=delta_seq, stats=stats,
+                    )
+
+                    # 归档已包含全部增量段，删除原文件和增量段
+                    stale_keys = [r2_key] + [segment_key(r2_key, seq) for seq in self._list_delta_seqs(r2_key)]
+                    for i in range(0, len(stale_keys), 1000):
+                        self.s3_client.delete_objects(
+                            Bucket=self.bucket_name,
+                            Delete={'Objects': [{'Key': key} for key in stale_keys[i:i + 1000]]},
+                        )
+
+                    archived_count += 1
+                    print(
+                        f"[远程存储] 已归档: {r2_key} -> {archive_key}"
+                        f"（{obj['size']} -> {archive_size} bytes）"
+                    )
+                except Exception as e:
+                    print(f"[远程存储] 归档失败 ({r2_key}): {e}")
+                finally:
+                    shutil.rmtree(work_dir, ignore_errors=True)
+
+        if archived_count:
+            print(f"[远程存储] 共归档 {archived_count} 个已结束日期的数据库")
+        return archived_count
 
-        print(f"[远程存储] 拉取完成，共下载 {pulled_count} 个数据库文件")
-        return pulled_count
+    # ========================================
+    # 远程特有功能：数据拉取和列表
+    # ========================================
 
-    def list_remote_dates(self) -> List[str]:
+    def _list_remote_objects(self, db_type: str = "news") -> Dict[str, Dict[str, Any]]:
         """
-        列出远程存储中所有可用的日期
+        列出远程某类型的所有日期数据库（基础文件）
+
+        Args:
+            db_type: 数据库类型 ("news" 或 "rss")
 
         Returns:
-            日期字符串列表（YYYY-MM-DD 格式）
+            {日期: {"key": 对象键, "size": 大小, "etag": ETag, "format": 归档格式（未压缩为 None）}}
+            同一日期同时存在未压缩文件和归档时取未压缩文件
         """
-        dates = []
+        objects = {}
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{db_type}/"):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                date_match = re.match(rf'{db_type}/(\d{{4}}-\d{{2}}-\d{{2}})\.db(\.gz|\.zst)?$', key)
+                if not date_match:
+                    continue
+                date_str = date_match.group(1)
+                archive_format = format_from_key(key)
+                if archive_format and date_str in objects:
+                    continue
+                objects[date_str] = {
+                    "key": key,
+                    "size": obj.get('Size', 0),
+                    "etag": obj.get('ETag', ""),
+                    "format": archive_format,
+                }
+        return objects
+
+    def _download_resumable(self, r2_key: str, part_path: Path, size: int, etag: str) -> int:
+        """
+        断点续传下载到 .part 文件
 
-        try:
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix="news/")
+        .part 旁的 .etag 文件记录所属对象版本，版本一致时从已下载的位置继续（Range 请求），
+        否则重新下载。续传请求带 If-Match，并核对实际返回对象的 ETag：
+        对象在列出后已被替换时从头重新下载新版本，避免把不同版本的字节拼接在一起。
 
-            for page in pages:
-                if 'Contents' not in page:
+        Returns:
+            本次实际传输的字节数
+        """
+        etag_path = part_path.with_name(part_path.name + ".etag")
+        offset = 0
+        if part_path.exists() and etag_path.exists() and etag_path.read_text() == etag:
+            offset = part_path.stat().st_size
+            if offset > size:
+                offset = 0
+        else:
+            part_path.unlink(missing_ok=True)
+        etag_path.write_text(etag)
+
+        if size and offset == size:
+            return 0
+
+        kwargs = {"Bucket": self.bucket_name, "Key": r2_key}
+        response = None
+        if offset:
+            kwargs["Range"] = f"bytes={offset}-"
+            if etag:
+                kwargs["IfMatch"] = etag
+            try:
+                response = self.s3_client.get_object(**kwargs)
+            except ClientError as e:
+                if not self._is_precondition_failed(e):
+                    raise
+            # 不支持 If-Match 的服务端会忽略该条件，再核对一次实际返回的版本
+            if response is not None and etag and response.get("ETag", etag) != etag:
+                response['Body'].close()
+                response = None
+            if response is None:
+                print(f"[远程存储] 对象已更新，重新下载: {r2_key}")
+                offset = 0
+                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=r2_key)
+                etag = response.get("ETag", "")
+                size = response.get("ContentLength", size)
+                etag_path.write_text(etag)
+        else:
+            response = self.s3_client.get_object(**kwargs)
+        # 服务端不支持 Range 时返回完整内容
+        if offset and not response.get("ContentRange"):
+            offset = 0
+        # 从头下载时以实际返回的版本标记 .part
+        if not offset and response.get("ETag") and response["ETag"] != etag:
+            etag_path.write_text(response["ETag"])
+
+        transferred = 0
+        with open(part_path, 'ab' if offset else 'wb') as f:
+            for chunk in response['Body'].iter_chunks(chunk_size=1024*1024):
+                f.write(chunk)
+                transferred += len(chunk)
+
+        if size and part_path.stat().st_size != size:
+            raise IOError(f"文件大小不一致: {part_path.stat().st_size} != {size}")
+        return transferred
+
+    def _pull_one(
+        self,
+        r2_key: str,
+        local_path: Path,
+        db_type: str,
+        size: int,
+        etag: str,
+        archive_format: Optional[str] = None,
+    ) -> int:
+        """
+        拉取单个日期数据库：断点续传下载 → 解压归档 / 应用增量段 → 原子替换到目标路径
+
+        Returns:
+            本次实际传输的字节数
+        """
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = local_path.with_name(local_path.name + ".part")
+        etag_path = part_path.with_name(part_path.name + ".etag")
+
+        if archive_format:
+            # 归档不带增量段：下载压缩文件后解压
+            compressed_path = local_path.with_name(local_path.name + ARCHIVE_SUFFIXES[archive_format] + ".part")
+            transferred = self._download_resumable(r2_key, compressed_path, size, etag)
+            decompress_file(compressed_path, part_path, archive_format)
+            os.replace(part_path, local_path)
+            compressed_path.unlink(missing_ok=True)
+            compressed_path.with_name(compressed_path.name + ".etag").unlink(missing_ok=True)
+            return transferred
+
+        transferred = 0
+        for attempt in range(2):
+            transferred += self._download_resumable(r2_key, part_path, size, etag)
+            try:
+                self._apply_remote_deltas(part_path, r2_key, db_type)
+                break
+            except ClientError as e:
+                # 增量段已被合并：基础文件已更新，重新下载
+                part_path.unlink(missing_ok=True)
+                if attempt == 0 and self._is_not_found(e):
+                    head = self._head_object(r2_key) or {}
+                    size, etag = head.get("ContentLength", 0), head.get("ETag", "")
                     continue
+                raise
 
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    # 解析日期
-                    date_match = re.match(r'news/(\d{4}-\d{2}-\d{2})\.db$', key)
-                    if date_match:
-                        dates.append(date_match.group(1))
+        os.replace(part_path, local_path)
+        etag_path.unlink(missing_ok=True)
+        return transferred
+
+    def pull_dates(
+        self,
+        dates: List[str],
+        local_data_dir: str = "output",
+        db_types: Tuple[str, ...] = ("news", "rss"),
+        max_workers: int = DEFAULT_PULL_WORKERS,
+    ) -> Dict[str, List]:
+        """
+        并发拉取指定日期的数据库到本地（output/{db_type}/{date}.db）
 
-            return sorted(dates, reverse=True)
+        - 每种类型只列举一次远程对象，不再逐个 HEAD
+        - 最多 max_workers 个文件同时下载
+        - 先写入 .part 文件，中断后再次拉取时从断点继续，完成后原子替换
+        - 本地已存在的文件跳过
 
+        Args:
+            dates: 日期列表（YYYY-MM-DD）
+            local_data_dir: 本地数据目录
+            db_types: 拉取的数据库类型
+            max_workers: 最大并发数
+
+        Returns:
+            {"synced": [对象键], "skipped": [对象键], "missing": [对象键],
+             "failed": [{"key": 对象键, "date": 日期, "db_type": 类型, "error": 错误}]}
+        """
+        result = {"synced": [], "skipped": [], "missing": [], "failed": []}
+        local_dir = Path(local_data_dir)
+
+        jobs = []
+        for db_type in db_types:
+            try:
+                remote_objects = self._get_remote_index(db_type)
+            except Exception as e:
+                print(f"[远程存储] 列出远程 {db_type} 数据失败: {e}")
+                for date_str in dates:
+                    result["failed"].append({
+                        "key": f"{db_type}/{date_str}.db", "date": date_str,
+                        "db_type": db_type, "error": str(e),
+                    })
+                continue
+
+            for date_str in dates:
+                r2_key = f"{db_type}/{date_str}.db"
+                local_path = local_dir / db_type / f"{date_str}.db"
+                if local_path.exists():
+                    result["skipped"].append(r2_key)
+                elif date_str not in remote_objects:
+                    result["missing"].append(r2_key)
+                else:
+                    obj = remote_objects[date_str]
+                    jobs.append((obj["key"], local_path, db_type, date_str, obj["size"], obj["etag"], obj["format"]))
+
+        if not jobs:
+            return result
+
+        total = len(jobs)
+        total_size = sum(job[4] for job in jobs)
+        workers = max(1, min(max_workers, total))
+        print(f"[远程存储] 开始拉取 {total} 个数据库（{total_size / 1024 / 1024:.1f} MB），并发数 {workers}")
+
+        start = time.perf_counter()
+        transferred = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pull") as executor:
+            futures = {
+                executor.submit(
+                    self._pull_one, r2_key, local_path, db_type, size, etag, archive_format
+                ): (r2_key, db_type, date_str)
+                for r2_key, local_path, db_type, date_str, size, etag, archive_format in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                r2_key, db_type, date_str = futures[future]
+                try:
+                    transferred += future.result()
+                    result["synced"].append(f"{db_type}/{date_str}.db")
+                    print(f"[远程存储] [{done}/{total}] 已拉取: {r2_key}")
+                except Exception as e:
+                    result["failed"].append({
+                        "key": f"{db_type}/{date_str}.db", "date": date_str,
+                        "db_type": db_type, "error": str(e),
+                    })
+                    print(f"[远程存储] [{done}/{total}] 拉取失败 ({r2_key}): {e}")
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"[远程存储] 传输 {transferred / 1024 / 1024:.1f} MB，耗时 {elapsed:.1f} 秒"
+            f"（{transferred / 1024 / 1024 / max(elapsed, 0.001):.1f} MB/s）"
+        )
+        result["synced"].sort()
+        return result
+
+    def pull_recent_days(
+        self,
+        days: int,
+        local_data_dir: str = "output",
+        max_workers: int = DEFAULT_PULL_WORKERS,
+    ) -> int:
+        """
+        从远程拉取最近 N 天的数据（热榜和 RSS）到本地
+
+        Args:
+            days: 拉取天数
+            local_data_dir: 本地数据目录
+            max_workers: 最大并发数
+
+        Returns:
+            成功拉取的数据库文件数量
+        """
+        if days <= 0:
+            return 0
+
+        now = self._get_configured_time()
+        dates = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+
+        print(f"[远程存储] 开始拉取最近 {days} 天的数据...")
+        result = self.pull_dates(dates, local_data_dir, max_workers=max_workers)
+
+        print(
+            f"[远程存储] 拉取完成，共下载 {len(result['synced'])} 个数据库文件"
+            f"（跳过 {len(result['skipped'])} 个本地已存在，失败 {len(result['failed'])} 个）"
+        )
+        return len(result["synced"])
+
+    def list_remote_dates(self, db_type: str = "news") -> List[str]:
+        """
+        列出远程存储中所有可用的日期
+
+        Args:
+            db_type: 数据库类型 ("news" 或 "rss")
+
+        Returns:
+            日期字符串列表（YYYY-MM-DD 格式）
+        """
+        try:
+            return sorted(self._get_remote_index(db_type), reverse=True)
         except Exception as e:
             print(f"[远程存储] 列出远程日期失败: {e}")
             return []
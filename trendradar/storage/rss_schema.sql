@@ -1,5 +1,6 @@
 -- TrendRadar RSS 数据库表结构
 -- 用于存储 RSS/Atom 订阅源数据
+-- 结构版本记录在 PRAGMA user_version；修改已有表/索引时须在 SQLiteStorageMixin.SCHEMA_MIGRATIONS 中增加迁移
 
 -- ============================================
 -- RSS 源配置表
@@ -11,8 +12,10 @@ CREATE TABLE IF NOT EXISTS rss_feeds (
     feed_url TEXT DEFAULT '',                 -- RSS/Atom URL（可选，配置文件中已有）
     is_active INTEGER DEFAULT 1,              -- 是否启用
     last_fetch_time TEXT,                     -- 最后抓取时间
-    last_fetch_status TEXT,                   -- 最后抓取状态（success/failed）
+    last_fetch_status TEXT,                   -- 最后抓取状态（success/not_modified/failed）
     item_count INTEGER DEFAULT 0,             -- 当日条目数
+    etag TEXT DEFAULT '',                     -- HTTP ETag（用于条件请求）
+    last_modified TEXT DEFAULT '',            -- HTTP Last-Modified（用于条件请求）
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -82,8 +85,9 @@ CREATE TABLE IF NOT EXISTS rss_push_records (
 -- 索引定义
 -- ============================================
 
--- RSS 源索引
-CREATE INDEX IF NOT EXISTS idx_rss_feed ON rss_items(feed_id);
+-- RSS 源 + 抓取时间索引
+CREATE INDEX IF NOT EXISTS idx_rss_feed_crawl_time
+    ON rss_items(feed_id, last_crawl_time);
 
 -- 发布时间索引（用于按时间排序）
 CREATE INDEX IF NOT EXISTS idx_rss_published ON rss_items(published_at DESC);
@@ -1,4 +1,5 @@
 -- TrendRadar 数据库表结构
+-- 结构版本记录在 PRAGMA user_version；修改已有表/索引时须在 SQLiteStorageMixin.SCHEMA_MIGRATIONS 中增加迁移
 
 -- ============================================
 -- 平台信息表
@@ -56,6 +57,21 @@ CREATE TABLE IF NOT EXISTS rank_history (
     FOREIGN KEY (news_item_id) REFERENCES news_items(id)
 );
 
+-- ============================================
+-- 压缩后的排名历史（已结束日期）
+-- rank_history 折叠为每条新闻一行的编码 BLOB，见 trendradar/storage/rank_pack.py
+-- ============================================
+CREATE TABLE IF NOT EXISTS rank_history_slots (
+    slot INTEGER PRIMARY KEY,
+    crawl_time TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS rank_history_packed (
+    news_item_id INTEGER PRIMARY KEY,
+    history BLOB NOT NULL,
+    FOREIGN KEY (news_item_id) REFERENCES news_items(id)
+);
+
 -- ============================================
 -- 抓取记录表
 -- 记录每次抓取的时间和数量
@@ -70,16 +86,51 @@ CREATE TABLE IF NOT EXISTS crawl_records (
 -- ============================================
 -- 抓取来源状态表
 -- 记录每次抓取各平台的成功/失败状态
+-- 熔断跳过的平台记为 failed，error_message 说明原因
 -- ============================================
 CREATE TABLE IF NOT EXISTS crawl_source_status (
     crawl_record_id INTEGER NOT NULL,
     platform_id TEXT NOT NULL,
     status TEXT NOT NULL CHECK(status IN ('success', 'failed')),
+    error_message TEXT DEFAULT '',        -- 失败原因
+    failure_streak INTEGER DEFAULT 0,     -- 截至本次的连续失败次数
+    duration_ms INTEGER DEFAULT 0,        -- 本次抓取耗时（含重试等待）
     PRIMARY KEY (crawl_record_id, platform_id),
     FOREIGN KEY (crawl_record_id) REFERENCES crawl_records(id),
     FOREIGN KEY (platform_id) REFERENCES platforms(id)
 );
 
+-- ============================================
+-- 平台内容指纹表
+-- 记录各平台最近一次成功抓取的内容指纹和 HTTP 校验头，
+-- 用于识别内容未变化的平台（走批量更新快速路径）
+-- ============================================
+CREATE TABLE IF NOT EXISTS platform_fingerprints (
+    platform_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,           -- items 列表的哈希
+    etag TEXT DEFAULT '',
+    last_modified TEXT DEFAULT '',
+    payload TEXT DEFAULT '',              -- 上次响应内容（仅服务端支持条件请求时保存）
+    crawl_time TEXT NOT NULL,             -- 指纹对应的抓取时间
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (platform_id) REFERENCES platforms(id)
+);
+
+-- ============================================
+-- 平台健康记录表
+-- 记录各平台的连续失败次数和熔断状态，用于跳过持续失败的平台
+-- ============================================
+CREATE TABLE IF NOT EXISTS platform_health (
+    platform_id TEXT PRIMARY KEY,
+    failure_streak INTEGER DEFAULT 0,     -- 连续失败次数
+    last_error TEXT DEFAULT '',           -- 最近一次错误信息
+    last_success_time TEXT DEFAULT '',    -- 最近一次成功时间
+    last_failure_time TEXT DEFAULT '',    -- 最近一次失败时间
+    open_until REAL DEFAULT 0,            -- 熔断截止时间（Unix 时间戳，0 表示未熔断）
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (platform_id) REFERENCES platforms(id)
+);
+
 -- ============================================
 -- 时间段执行记录表
 -- 记录每天每个时间段在各 action 维度的执行状态（用于 once 功能）
@@ -98,8 +149,9 @@ CREATE TABLE IF NOT EXISTS period_executions (
 -- 索引定义
 -- ============================================
 
--- 平台索引
-CREATE INDEX IF NOT EXISTS idx_news_platform ON news_items(platform_id);
+-- 平台 + 抓取时间索引（按平台查询在榜/脱榜新闻）
+CREATE INDEX IF NOT EXISTS idx_news_platform_crawl_time
+    ON news_items(platform_id, last_crawl_time);
 
 -- 时间索引（用于查询最新数据）
 CREATE INDEX IF NOT EXISTS idx_news_crawl_time ON news_items(last_crawl_time);
@@ -114,8 +166,13 @@ CREATE UNIQUE INDEX IF NOT EXISTS idx_news_url_platform
 -- 抓取状态索引
 CREATE INDEX IF NOT EXISTS idx_crawl_status_record ON crawl_source_status(crawl_record_id);
 
--- 排名历史索引
-CREATE INDEX IF NOT EXISTS idx_rank_history_news ON rank_history(news_item_id);
+-- 抓取状态按状态查询（覆盖失败来源查询）
+CREATE INDEX IF NOT EXISTS idx_crawl_status_status
+    ON crawl_source_status(status, crawl_record_id, platform_id);
+
+-- 排名历史索引（覆盖按新闻 + 时间顺序读取排名）
+CREATE INDEX IF NOT EXISTS idx_rank_history_news_time
+    ON rank_history(news_item_id, crawl_time, rank);
 
 -- 时间段执行记录索引
 CREATE INDEX IF NOT EXISTS idx_period_exec_lookup
@@ -7,11 +7,14 @@ SQLite 存储 Mixin
 
 import sqlite3
 from abc import abstractmethod
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from trendradar.storage.base import NewsItem, NewsData, RSSItem, RSSData
+from trendradar.storage.rank_pack import compact_rank_history, load_packed_history, merge_history_rows
+from trendradar.storage.sqlite_profile import apply_sqlite_pragmas
 from trendradar.utils.url import normalize_url
 
 
@@ -24,6 +27,23 @@ class SQLiteStorageMixin:
     - _get_configured_time() -> datetime
     - _format_date_folder(date) -> str
     - _format_time_filename() -> str
+
+    子类可设置 sqlite_pragmas 属性（{pragma 名: 值}），新建连接时应用
+    """
+
+    sqlite_pragmas: Optional[Dict[str, Any]] = None
+
+    # 当天新闻读模型（进程内缓存，只保留一天）
+    # 结构: {"date", "conn", "data_version", "entries": {platform_id: {news_id: NewsItem}}, "snapshot"}
+    _news_day_cache: Optional[Dict[str, Any]] = None
+
+    # 读取 news_items 的公共列（_row_to_news_item 按此顺序解析）
+    _NEWS_ITEM_COLUMNS = """
+        SELECT n.id, n.title, n.platform_id, p.name as platform_name,
+               n.rank, n.url, n.mobile_url,
+               n.first_crawl_time, n.last_crawl_time, n.crawl_count
+        FROM news_items n
+        LEFT JOIN platforms p ON n.platform_id = p.id
     """
 
     # ========================================
@@ -68,25 +88,215 @@ class SQLiteStorageMixin:
             return Path(__file__).parent / "rss_schema.sql"
         return Path(__file__).parent / "schema.sql"
 
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """对新建的连接应用 PRAGMA 配置（需在建表之前调用）"""
+        apply_sqlite_pragmas(conn, self.sqlite_pragmas)
+
     def _init_tables(self, conn: sqlite3.Connection, db_type: str = "news") -> None:
         """
         从 schema.sql 初始化数据库表结构
 
+        新建的数据库直接按 schema 文件建到最新结构并记录版本号；
+        已有的数据库先执行未应用的迁移，再执行 schema 文件补齐新增的表和索引。
+
         Args:
             conn: 数据库连接
             db_type: 数据库类型 ("news" 或 "rss")
         """
         schema_path = self._get_schema_path(db_type)
 
-        if schema_path.exists():
-            with open(schema_path, "r", encoding="utf-8") as f:
-                schema_sql = f.read()
+        if not schema_path.exists():
+            raise FileNotFoundError(f"Schema file not found: {schema_path}")
+
+        with open(schema_path, "r", encoding="utf-8") as f:
+            schema_sql = f.read()
+
+        cursor = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'")
+        is_new = cursor.fetchone()[0] == 0
+
+        if is_new:
             conn.executescript(schema_sql)
+            self._set_schema_version(conn, self._latest_schema_version(db_type))
         else:
-            raise FileNotFoundError(f"Schema file not found: {schema_path}")
+            self._migrate_schema(conn, db_type)
+            conn.executescript(schema_sql)
 
         conn.commit()
 
+    # ========================================
+    # Schema 迁移
+    # ========================================
+
+    # 各类数据库的迁移列表：(版本号, 迁移方法名)，版本号递增
+    # 数据库当前版本记录在 PRAGMA user_version 中，打开时依次执行更高版本的迁移。
+    # 迁移须可重复执行（中途失败后会从该版本重新开始），并且不依赖 schema 文件中
+    # 后加入的表（执行迁移时 schema 文件尚未执行）。
+    # 新增迁移时同步修改 schema 文件，使新建数据库直接得到相同的结构。
+    SCHEMA_MIGRATIONS: Dict[str, List[Tuple[int, str]]] = {
+        "news": [
+            (1, "_migrate_news_source_status_columns"),
+            (2, "_migrate_news_composite_indexes"),
+            (3, "_migrate_news_rank_history_packed"),
+        ],
+        "rss": [
+            (1, "_migrate_rss_feed_validators"),
+            (2, "_migrate_rss_composite_indexes"),
+        ],
+    }
+
+    def _latest_schema_version(self, db_type: str) -> int:
+        """获取最新的 schema 版本号"""
+        migrations = self.SCHEMA_MIGRATIONS.get(db_type, [])
+        return migrations[-1][0] if migrations else 0
+
+    @staticmethod
+    def _get_schema_version(conn: sqlite3.Connection) -> int:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    @staticmethod
+    def _set_schema_version(conn: sqlite3.Connection, version: int) -> None:
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+
+    def _migrate_schema(self, conn: sqlite3.Connection, db_type: str) -> None:
+        """
+        执行未应用的迁移
+
+        Args:
+            conn: 数据库连接
+            db_type: 数据库类型 ("news" 或 "rss")
+        """
+        current = self._get_schema_version(conn)
+        for version, method_name in self.SCHEMA_MIGRATIONS.get(db_type, []):
+            if version <= current:
+                continue
+            getattr(self, method_name)(conn)
+            self._set_schema_version(conn, version)
+            conn.commit()
+            print(f"[存储] {db_type} 数据库结构已升级到 v{version} ({method_name})")
+
+    def _table_exists(self, conn: sqlite3.Connection, table: str) -> bool:
+        cursor = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        )
+        return cursor.fetchone() is not None
+
+    def _ensure_columns(self, conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+        """
+        为已存在的表补齐缺失的列（CREATE TABLE IF NOT EXISTS 不会修改旧表）
+
+        表不存在时跳过，由 schema 文件按最新结构创建。
+
+        Args:
+            conn: 数据库连接
+            table: 表名
+            columns: {列名: 列定义}
+        """
+        if not self._table_exists(conn, table):
+            return
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, definition in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    def _migrate_news_source_status_columns(self, conn: sqlite3.Connection) -> None:
+        """v1: crawl_source_status 增加失败原因、连续失败次数和耗时"""
+        self._ensure_columns(conn, "crawl_source_status", {
+            "error_message": "TEXT DEFAULT ''",
+            "failure_streak": "INTEGER DEFAULT 0",
+            "duration_ms": "INTEGER DEFAULT 0",
+        })
+
+    def _migrate_news_composite_indexes(self, conn: sqlite3.Connection) -> None:
+        """v2: 热点查询的复合/覆盖索引，替换被覆盖的单列索引"""
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_rank_history_news_time
+                ON rank_history(news_item_id, crawl_time, rank);
+            CREATE INDEX IF NOT EXISTS idx_news_platform_crawl_time
+                ON news_items(platform_id, last_crawl_time);
+            CREATE INDEX IF NOT EXISTS idx_crawl_status_status
+                ON crawl_source_status(status, crawl_record_id, platform_id);
+            DROP INDEX IF EXISTS idx_rank_history_news;
+            DROP INDEX IF EXISTS idx_news_platform;
+            ANALYZE;
+        """)
+
+    def _migrate_news_rank_history_packed(self, conn: sqlite3.Connection) -> None:
+        """v3: 已结束日期的排名历史压缩表（旧版本读取压缩后的数据库会缺失排名历史）"""
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS rank_history_slots (
+                slot INTEGER PRIMARY KEY,
+                crawl_time TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS rank_history_packed (
+                news_item_id INTEGER PRIMARY KEY,
+                history BLOB NOT NULL,
+                FOREIGN KEY (news_item_id) REFERENCES news_items(id)
+            );
+        """)
+
+    def _migrate_rss_feed_validators(self, conn: sqlite3.Connection) -> None:
+        """v1: rss_feeds 增加 HTTP 校验头"""
+        self._ensure_columns(conn, "rss_feeds", {
+            "etag": "TEXT DEFAULT ''",
+            "last_modified": "TEXT DEFAULT ''",
+        })
+
+    def _migrate_rss_composite_indexes(self, conn: sqlite3.Connection) -> None:
+        """v2: rss_items 按源 + 抓取时间的复合索引，替换单列源索引"""
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_rss_feed_crawl_time
+                ON rss_items(feed_id, last_crawl_time);
+            DROP INDEX IF EXISTS idx_rss_feed;
+            ANALYZE;
+        """)
+
+    def _compact_rank_history_impl(
+        self,
+        conn: sqlite3.Connection,
+        label: str,
+        log_prefix: str = "[存储]",
+    ) -> bool:
+        """
+        压缩已结束日期的排名历史并 VACUUM 回收空间
+
+        Args:
+            conn: 新闻数据库连接
+            label: 日志中显示的数据库名称
+            log_prefix: 日志前缀
+
+        Returns:
+            是否执行了压缩
+        """
+        try:
+            folded = compact_rank_history(conn)
+            if folded is None:
+                print(f"{log_prefix} 排名历史超出编码范围，跳过压缩: {label}")
+                return False
+            if folded == 0:
+                return False
+            conn.execute("VACUUM")
+            print(f"{log_prefix} 已压缩排名历史: {label}（{folded} 行）")
+            return True
+        except sqlite3.Error as e:
+            print(f"{log_prefix} 压缩排名历史失败 {label}: {e}")
+            return False
+
+    def _analyze_if_needed(self, conn: sqlite3.Connection) -> None:
+        """
+        首次批量写入后收集统计信息（ANALYZE）
+
+        每天的数据库在第一次抓取写入后即具备代表性的数据分布，
+        此后查询规划器可以正确选择复合索引；已有统计信息时不重复执行。
+        """
+        try:
+            if self._table_exists(conn, "sqlite_stat1"):
+                if conn.execute("SELECT 1 FROM sqlite_stat1 LIMIT 1").fetchone():
+                    return
+            conn.execute("ANALYZE")
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[存储] ANALYZE 失败: {e}")
+
     # ========================================
     # 新闻数据存储
     # ========================================
@@ -102,6 +312,7 @@ class SQLiteStorageMixin:
         Returns:
             (success, new_count, updated_count, title_changed_count, off_list_count)
         """
+        conn = None
         try:
             conn = self._get_connection(data.date)
             cursor = conn.cursor()
@@ -120,102 +331,36 @@ class SQLiteStorageMixin:
                 """, (source_id, source_name, now_str))
 
             # 统计计数器
-            new_count = 0
             updated_count = 0
-            title_changed_count = 0
             success_sources = []
 
-            for source_id, news_list in data.items.items():
-                success_sources.append(source_id)
+            # 本次各平台条目的标准化 URL，写入临时表（批量写入和脱榜检测共用）
+            normalized_items = self._normalize_news_items(data)
+            self._load_crawl_urls(cursor, normalized_items)
 
-                for item in news_list:
-                    try:
-                        # 标准化 URL（去除动态参数，如微博的 band_rank）
-                        normalized_url = normalize_url(item.url, source_id) if item.url else ""
+            # 内容未变化的平台：读取其指纹对应的抓取时间（批量快速路径的前提）
+            unchanged_since = self._get_unchanged_since(cursor, data)
 
-                        # 检查是否已存在（通过标准化 URL + platform_id）
-                        if normalized_url:
-                            cursor.execute("""
-                                SELECT id, title FROM news_items
-                                WHERE url = ? AND platform_id = ?
-                            """, (normalized_url, source_id))
-                            existing = cursor.fetchone()
+            pending_sources = []
+            for source_id in data.items:
+                success_sources.append(source_id)
 
-                            if existing:
-                                # 已存在，更新记录
-                                existing_id, existing_title = existing
-
-                                # 检查标题是否变化
-                                if existing_title != item.title:
-                                    # 记录标题变更
-                                    cursor.execute("""
-                                        INSERT INTO title_changes
-                                        (news_item_id, old_title, new_title, changed_at)
-                                        VALUES (?, ?, ?, ?)
-                                    """, (existing_id, existing_title, item.title, now_str))
-                                    title_changed_count += 1
-
-                                # 记录排名历史
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (existing_id, item.rank, data.crawl_time, now_str))
+                if source_id in unchanged_since:
+                    bumped = self._bump_unchanged_platform(
+                        cursor, source_id, normalized_items.get(source_id, []),
+                        unchanged_since[source_id], data.crawl_time, now_str
+                    )
+                    if bumped:
+                        updated_count += bumped
+                        continue
 
-                                # 更新现有记录
-                                cursor.execute("""
-                                    UPDATE news_items SET
-                                        title = ?,
-                                        rank = ?,
-                                        mobile_url = ?,
-                                        last_crawl_time = ?,
-                                        crawl_count = crawl_count + 1,
-                                        updated_at = ?
-                                    WHERE id = ?
-                                """, (item.title, item.rank, item.mobile_url,
-                                      data.crawl_time, now_str, existing_id))
-                                updated_count += 1
-                            else:
-                                # 不存在，插入新记录（存储标准化后的 URL）
-                                cursor.execute("""
-                                    INSERT INTO news_items
-                                    (title, platform_id, rank, url, mobile_url,
-                                     first_crawl_time, last_crawl_time, crawl_count,
-                                     created_at, updated_at)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                                """, (item.title, source_id, item.rank, normalized_url,
-                                      item.mobile_url, data.crawl_time, data.crawl_time,
-                                      now_str, now_str))
-                                new_id = cursor.lastrowid
-                                # 记录初始排名
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (new_id, item.rank, data.crawl_time, now_str))
-                                new_count += 1
-                        else:
-                            # URL 为空的情况，直接插入（不做去重）
-                            cursor.execute("""
-                                INSERT INTO news_items
-                                (title, platform_id, rank, url, mobile_url,
-                                 first_crawl_time, last_crawl_time, crawl_count,
-                                 created_at, updated_at)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                            """, (item.title, source_id, item.rank, "",
-                                  item.mobile_url, data.crawl_time, data.crawl_time,
-                                  now_str, now_str))
-                            new_id = cursor.lastrowid
-                            # 记录初始排名
-                            cursor.execute("""
-                                INSERT INTO rank_history
-                                (news_item_id, rank, crawl_time, created_at)
-                                VALUES (?, ?, ?, ?)
-                            """, (new_id, item.rank, data.crawl_time, now_str))
-                            new_count += 1
+                pending_sources.append(source_id)
 
-                    except sqlite3.Error as e:
-                        print(f"{log_prefix} 保存新闻条目失败 [{item.title[:30]}...]: {e}")
+            # 其余平台批量写入
+            new_count, upserted_count, title_changed_count = self._upsert_news_items(
+                cursor, data, normalized_items, pending_sources, now_str
+            )
+            updated_count += upserted_count
 
             total_items = new_count + updated_count
 
@@ -234,36 +379,9 @@ class SQLiteStorageMixin:
             prev_record = cursor.fetchone()
 
             if prev_record:
-                prev_crawl_time = prev_record[0]
-
-                # 对于每个成功抓取的平台，检测脱榜
-                for source_id in success_sources:
-                    # 获取当前抓取中该平台的所有标准化 URL
-                    current_urls = set()
-                    for item in data.items.get(source_id, []):
-                        normalized_url = normalize_url(item.url, source_id) if item.url else ""
-                        if normalized_url:
-                            current_urls.add(normalized_url)
-
-                    # 查询上次在榜（last_crawl_time = prev_crawl_time）但这次不在榜的新闻
-                    # 这些新闻是"第一次脱榜"，需要记录
-                    cursor.execute("""
-                        SELECT id, url FROM news_items
-                        WHERE platform_id = ?
-                          AND last_crawl_time = ?
-                          AND url != ''
-                    """, (source_id, prev_crawl_time))
-
-                    for row in cursor.fetchall():
-                        news_id, url = row[0], row[1]
-                        if url not in current_urls:
-                            # 插入脱榜记录（rank=0 表示脱榜）
-                            cursor.execute("""
-                                INSERT INTO rank_history
-                                (news_item_id, rank, crawl_time, created_at)
-                                VALUES (?, 0, ?, ?)
-                            """, (news_id, data.crawl_time, now_str))
-                            off_list_count += 1
+                off_list_count = self._mark_off_list(
+                    cursor, prev_record[0], data.crawl_time, now_str
+                )
 
             # 记录抓取信息
             cursor.execute("""
@@ -282,11 +400,12 @@ class SQLiteStorageMixin:
 
                 # 记录成功的来源
                 for source_id in success_sources:
+                    health = data.source_health.get(source_id, {})
                     cursor.execute("""
                         INSERT OR REPLACE INTO crawl_source_status
-                        (crawl_record_id, platform_id, status)
-                        VALUES (?, ?, 'success')
-                    """, (crawl_record_id, source_id))
+                        (crawl_record_id, platform_id, status, duration_ms)
+                        VALUES (?, ?, 'success', ?)
+                    """, (crawl_record_id, source_id, health.get("duration_ms", 0)))
 
                 # 记录失败的来源
                 for failed_id in data.failed_ids:
@@ -296,153 +415,757 @@ class SQLiteStorageMixin:
                         VALUES (?, ?, ?)
                     """, (failed_id, failed_id, now_str))
 
+                    health = data.source_health.get(failed_id, {})
+                    error_message = health.get("last_error", "")
+                    if health.get("status") == "skipped":
+                        error_message = f"熔断跳过: {error_message}"
                     cursor.execute("""
                         INSERT OR REPLACE INTO crawl_source_status
-                        (crawl_record_id, platform_id, status)
-                        VALUES (?, ?, 'failed')
-                    """, (crawl_record_id, failed_id))
+                        (crawl_record_id, platform_id, status,
+                         error_message, failure_streak, duration_ms)
+                        VALUES (?, ?, 'failed', ?, ?, ?)
+                    """, (crawl_record_id, failed_id, error_message,
+                          health.get("failure_streak", 0), health.get("duration_ms", 0)))
+
+            # 保存平台指纹（供下次抓取识别未变化的平台）
+            self._save_platform_fingerprints(cursor, data, success_sources, now_str)
+
+            # 保存平台健康记录（供下次抓取判断熔断）
+            self._save_platform_health(cursor, data, now_str)
 
             conn.commit()
+            self._analyze_if_needed(conn)
+            self._update_news_day_cache(conn, data)
 
             return True, new_count, updated_count, title_changed_count, off_list_count
 
         except Exception as e:
+            self._news_day_cache = None
+            # 撤销本次已写入的部分数据，避免被同一连接上的下一次 commit 一并提交；
+            # 增量同步的变更记录（temp.delta_changes）在同一事务中，也会一起撤销
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
             print(f"{log_prefix} 保存失败: {e}")
             return False, 0, 0, 0, 0
 
-    def _get_today_all_data_impl(self, date: Optional[str] = None) -> Optional[NewsData]:
+    def _normalize_news_items(self, data: NewsData) -> Dict[str, List[Tuple[str, NewsItem]]]:
         """
-        获取指定日期的所有新闻数据（合并后）
+        标准化本次各平台条目的 URL（去除动态参数，如微博的 band_rank）
+
+        Returns:
+            {platform_id: [(标准化 URL, 条目)]}，URL 为空的条目对应空字符串
+        """
+        return {
+            source_id: [
+                (normalize_url(item.url, source_id) if item.url else "", item)
+                for item in news_list
+            ]
+            for source_id, news_list in data.items.items()
+        }
+
+    def _load_crawl_urls(
+        self,
+        cursor: sqlite3.Cursor,
+        normalized_items: Dict[str, List[Tuple[str, NewsItem]]],
+    ) -> None:
+        """
+        将本次抓取成功的平台及其标准化 URL 写入临时表
+
+        - temp.crawl_sources: 本次抓取成功的平台
+        - temp.crawl_urls: 本次在榜的 (url, platform_id)
+
+        临时表随连接存在，每次保存前清空重建内容。
+        """
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS crawl_sources (
+                platform_id TEXT PRIMARY KEY
+            )
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS crawl_urls (
+                url TEXT NOT NULL,
+                platform_id TEXT NOT NULL,
+                PRIMARY KEY (url, platform_id)
+            )
+        """)
+        cursor.execute("DELETE FROM temp.crawl_sources")
+        cursor.execute("DELETE FROM temp.crawl_urls")
+
+        cursor.executemany(
+            "INSERT INTO temp.crawl_sources (platform_id) VALUES (?)",
+            [(source_id,) for source_id in normalized_items],
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO temp.crawl_urls (url, platform_id) VALUES (?, ?)",
+            [
+                (url, source_id)
+                for source_id, rows in normalized_items.items()
+                for url, _ in rows if url
+            ],
+        )
+
+    def _upsert_news_items(
+        self,
+        cursor: sqlite3.Cursor,
+        data: NewsData,
+        normalized_items: Dict[str, List[Tuple[str, NewsItem]]],
+        source_ids: List[str],
+        now_str: str,
+    ) -> Tuple[int, int, int]:
+        """
+        批量写入新闻条目
+
+        一次性预取本次 URL 对应的已有记录标题，在内存中按原顺序推演新增/更新/
+        标题变更，再用 executemany 批量执行 UPSERT、标题变更和排名历史写入。
+        URL 为空的条目不参与去重，逐条插入。
+
+        Returns:
+            (new_count, updated_count, title_changed_count)
+        """
+        rows = [
+            (normalized_url, source_id, item)
+            for source_id in source_ids
+            for normalized_url, item in normalized_items.get(source_id, [])
+        ]
+        url_rows = [row for row in rows if row[0]]
+
+        new_count = 0
+        updated_count = 0
+        title_changes = []
+
+        if url_rows:
+            # 预取已有记录的当前标题（通过标准化 URL + platform_id）
+            known_titles = self._prefetch_news_titles(cursor)
+
+            # 按原顺序推演：同一轮内重复出现的 URL 视为对前一条的更新
+            for url, source_id, item in url_rows:
+                key = (url, source_id)
+                if key in known_titles:
+                    if known_titles[key] != item.title:
+                        title_changes.append((known_titles[key], item.title, now_str, url, source_id))
+                    updated_count += 1
+                else:
+                    new_count += 1
+                known_titles[key] = item.title
+
+        # 按抓取顺序写入条目（保持与逐条写入相同的行顺序）：
+        # 连续的有 URL 条目合并为一次 UPSERT，URL 为空的条目不做去重，逐条插入
+        batch = []
+        for url, source_id, item in rows:
+            if url:
+                batch.append((item.title, source_id, item.rank, url, item.mobile_url,
+                              data.crawl_time, data.crawl_time, now_str, now_str))
+                continue
+
+            self._upsert_news_batch(cursor, batch)
+            batch = []
+
+            cursor.execute("""
+                INSERT INTO news_items
+                (title, platform_id, rank, url, mobile_url,
+                 first_crawl_time, last_crawl_time, crawl_count,
+                 created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+            """, (item.title, source_id, item.rank, "",
+                  item.mobile_url, data.crawl_time, data.crawl_time,
+                  now_str, now_str))
+            # 记录初始排名
+            cursor.execute("""
+                INSERT INTO rank_history
+                (news_item_id, rank, crawl_time, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (cursor.lastrowid, item.rank, data.crawl_time, now_str))
+            new_count += 1
+
+        self._upsert_news_batch(cursor, batch)
+
+        if url_rows:
+            # 记录标题变更
+            if title_changes:
+                cursor.executemany("""
+                    INSERT INTO title_changes
+                    (news_item_id, old_title, new_title, changed_at)
+                    SELECT id, ?, ?, ? FROM news_items
+                    WHERE url = ? AND platform_id = ?
+                """, title_changes)
+
+            # 记录排名历史
+            cursor.executemany("""
+                INSERT INTO rank_history
+                (news_item_id, rank, crawl_time, created_at)
+                SELECT id, ?, ?, ? FROM news_items
+                WHERE url = ? AND platform_id = ?
+            """, [
+                (item.rank, data.crawl_time, now_str, url, source_id)
+                for url, source_id, item in url_rows
+            ])
+
+        return new_count, updated_count, len(title_changes)
+
+    def _upsert_news_batch(self, cursor: sqlite3.Cursor, batch: List[tuple]) -> None:
+        """批量新增或更新有 URL 的条目（存储标准化后的 URL）"""
+        if not batch:
+            return
+        cursor.executemany("""
+            INSERT INTO news_items
+            (title, platform_id, rank, url, mobile_url,
+             first_crawl_time, last_crawl_time, crawl_count,
+             created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+            ON CONFLICT(url, platform_id) WHERE url != '' DO UPDATE SET
+                title = excluded.title,
+                rank = excluded.rank,
+                mobile_url = excluded.mobile_url,
+                last_crawl_time = excluded.last_crawl_time,
+                crawl_count = crawl_count + 1,
+                updated_at = excluded.updated_at
+        """, batch)
+
+    def _prefetch_news_titles(self, cursor: sqlite3.Cursor) -> Dict[Tuple[str, str], str]:
+        """
+        预取已有新闻条目的标题
+
+        临时表 crawl_urls 与 news_items 连接查询，避免逐条 SELECT 和 IN 参数个数限制。
+
+        Returns:
+            {(url, platform_id): title}
+        """
+        cursor.execute("""
+            SELECT n.url, n.platform_id, n.title
+            FROM temp.crawl_urls c
+            JOIN news_items n ON n.url = c.url AND n.platform_id = c.platform_id
+        """)
+        return {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+
+    def _mark_off_list(
+        self,
+        cursor: sqlite3.Cursor,
+        prev_crawl_time: str,
+        crawl_time: str,
+        now_str: str,
+    ) -> int:
+        """
+        标记脱榜新闻
+
+        上次在榜（last_crawl_time = prev_crawl_time）但本次不在榜的新闻是"第一次脱榜"，
+        对本次抓取成功的平台用一条 INSERT ... SELECT 插入 rank=0 的排名记录。
+
+        Returns:
+            脱榜条目数
+        """
+        cursor.execute("""
+            INSERT INTO rank_history
+            (news_item_id, rank, crawl_time, created_at)
+            SELECT n.id, 0, ?, ?
+            FROM news_items n
+            WHERE n.last_crawl_time = ?
+              AND n.url != ''
+              AND n.platform_id IN (SELECT platform_id FROM temp.crawl_sources)
+              AND NOT EXISTS (
+                  SELECT 1 FROM temp.crawl_urls c
+                  WHERE c.url = n.url AND c.platform_id = n.platform_id
+              )
+        """, (crawl_time, now_str, prev_crawl_time))
+        return cursor.rowcount
+
+    def _get_unchanged_since(self, cursor: sqlite3.Cursor, data: NewsData) -> Dict[str, str]:
+        """
+        获取内容未变化平台的上次指纹抓取时间
+
+        只有指纹早于本次抓取时间的平台才能走快速路径。
+
+        Returns:
+            {platform_id: 指纹对应的抓取时间}
+        """
+        if not data.unchanged_ids:
+            return {}
+
+        placeholders = ",".join("?" * len(data.unchanged_ids))
+        cursor.execute(f"""
+            SELECT platform_id, crawl_time FROM platform_fingerprints
+            WHERE platform_id IN ({placeholders})
+              AND crawl_time < ?
+        """, (*data.unchanged_ids, data.crawl_time))
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def _bump_unchanged_platform(
+        self,
+        cursor: sqlite3.Cursor,
+        source_id: str,
+        rows: List[Tuple[str, NewsItem]],
+        since: str,
+        crawl_time: str,
+        now_str: str,
+    ) -> int:
+        """
+        批量处理内容未变化的平台
+
+        榜单与上次抓取完全一致，无需逐条比对：补记一轮排名历史，
+        并批量顺延 last_crawl_time / crawl_count。
+
+        只有结果与完整写入一致时才走快速路径：
+        - 每个条目都有 URL 且 URL 互不重复（URL 为空的条目每轮都新增记录，
+          重复 URL 每次出现都要记一条排名历史）
+        - 上次抓取留下的记录与本次 URL 一一对应
+
+        Returns:
+            更新的条目数（0 表示需要回退到逐条处理）
+        """
+        urls = [url for url, _ in rows]
+        if not urls or "" in urls or len(set(urls)) != len(urls):
+            return 0
+
+        # 上次抓取时间对应的记录必须恰好是本次在榜的这些 URL
+        cursor.execute("""
+            SELECT COUNT(*), COUNT(c.url) FROM news_items n
+            LEFT JOIN temp.crawl_urls c ON c.url = n.url AND c.platform_id = n.platform_id
+            WHERE n.platform_id = ? AND n.last_crawl_time = ?
+        """, (source_id, since))
+        matched_rows, matched_urls = cursor.fetchone()
+        if matched_rows != len(urls) or matched_urls != len(urls):
+            return 0
+
+        cursor.execute("""
+            INSERT INTO rank_history
+            (news_item_id, rank, crawl_time, created_at)
+            SELECT id, rank, ?, ? FROM news_items
+            WHERE platform_id = ? AND last_crawl_time = ?
+        """, (crawl_time, now_str, source_id, since))
+
+        cursor.execute("""
+            UPDATE news_items SET
+                last_crawl_time = ?,
+                crawl_count = crawl_count + 1,
+                updated_at = ?
+            WHERE platform_id = ? AND last_crawl_time = ?
+        """, (crawl_time, now_str, source_id, since))
+        return cursor.rowcount
+
+    def _save_platform_fingerprints(
+        self,
+        cursor: sqlite3.Cursor,
+        data: NewsData,
+        success_sources: List[str],
+        now_str: str,
+    ) -> None:
+        """保存本次成功抓取平台的内容指纹"""
+        rows = []
+        for source_id in success_sources:
+            fingerprint = data.fingerprints.get(source_id)
+            if not fingerprint or not fingerprint.get("content_hash"):
+                continue
+            rows.append((
+                source_id,
+                fingerprint["content_hash"],
+                fingerprint.get("etag", ""),
+                fingerprint.get("last_modified", ""),
+                fingerprint.get("payload", ""),
+                data.crawl_time,
+                now_str,
+            ))
+
+        if rows:
+            cursor.executemany("""
+                INSERT INTO platform_fingerprints
+                (platform_id, content_hash, etag, last_modified, payload,
+                 crawl_time, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(platform_id) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    payload = excluded.payload,
+                    crawl_time = excluded.crawl_time,
+                    updated_at = excluded.updated_at
+            """, rows)
+
+    def _save_platform_health(self, cursor: sqlite3.Cursor, data: NewsData, now_str: str) -> None:
+        """保存本次抓取涉及平台的健康记录"""
+        rows = []
+        for source_id, health in data.source_health.items():
+            status = health.get("status")
+            if not status:
+                # 本次未参与抓取的平台，保持原记录
+                continue
+            rows.append((
+                source_id,
+                health.get("failure_streak", 0),
+                health.get("last_error", ""),
+                now_str if status == "success" else health.get("last_success_time", ""),
+                now_str if status == "failed" else health.get("last_failure_time", ""),
+                health.get("open_until", 0),
+                now_str,
+            ))
+
+        if rows:
+            cursor.executemany("""
+                INSERT INTO platform_health
+                (platform_id, failure_streak, last_error, last_success_time,
+                 last_failure_time, open_until, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(platform_id) DO UPDATE SET
+                    failure_streak = excluded.failure_streak,
+                    last_error = excluded.last_error,
+                    last_success_time = excluded.last_success_time,
+                    last_failure_time = excluded.last_failure_time,
+                    open_until = excluded.open_until,
+                    updated_at = excluded.updated_at
+            """, rows)
+
+    def _get_platform_health_impl(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        获取指定日期已保存的平台健康记录
 
         Args:
             date: 日期字符串，默认为今天
 
         Returns:
-            合并后的新闻数据
+            {platform_id: {"failure_streak", "last_error", "last_success_time",
+                           "last_failure_time", "open_until"}}
         """
         try:
             conn = self._get_connection(date)
             cursor = conn.cursor()
+            cursor.execute("""
+                SELECT platform_id, failure_streak, last_error,
+                       last_success_time, last_failure_time, open_until
+                FROM platform_health
+            """)
+            return {
+                row[0]: {
+                    "failure_streak": row[1] or 0,
+                    "last_error": row[2] or "",
+                    "last_success_time": row[3] or "",
+                    "last_failure_time": row[4] or "",
+                    "open_until": row[5] or 0,
+                }
+                for row in cursor.fetchall()
+            }
+        except Exception as e:
+            print(f"[存储] 读取平台健康记录失败: {e}")
+            return {}
 
-            # 获取所有新闻数据（包含 id 用于查询排名历史）
+    def _get_platform_fingerprints_impl(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        获取指定日期已保存的平台指纹
+
+        Args:
+            date: 日期字符串，默认为今天
+
+        Returns:
+            {platform_id: {"content_hash", "etag", "last_modified", "payload", "crawl_time"}}
+        """
+        try:
+            conn = self._get_connection(date)
+            cursor = conn.cursor()
             cursor.execute("""
-                SELECT n.id, n.title, n.platform_id, p.name as platform_name,
-                       n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
-                FROM news_items n
-                LEFT JOIN platforms p ON n.platform_id = p.id
-                ORDER BY n.platform_id, n.last_crawl_time
+                SELECT platform_id, content_hash, etag, last_modified, payload, crawl_time
+                FROM platform_fingerprints
             """)
+            return {
+                row[0]: {
+                    "content_hash": row[1],
+                    "etag": row[2] or "",
+                    "last_modified": row[3] or "",
+                    "payload": row[4] or "",
+                    "crawl_time": row[5],
+                }
+                for row in cursor.fetchall()
+            }
+        except Exception as e:
+            print(f"[存储] 读取平台指纹失败: {e}")
+            return {}
 
-            rows = cursor.fetchall()
-            if not rows:
-                return None
+    def _get_today_all_data_impl(self, date: Optional[str] = None) -> Optional[NewsData]:
+        """
+        获取指定日期的所有新闻数据（合并后）
 
-            # 收集所有 news_item_id
-            news_ids = [row[0] for row in rows]
-
-            # 批量查询排名历史（同时获取时间和排名）
-            # 过滤逻辑：只保留 last_crawl_time 之前的脱榜记录（rank=0）
-            # 这样可以避免显示新闻永久脱榜后的无意义记录
-            rank_history_map: Dict[int, List[int]] = {}
-            rank_timeline_map: Dict[int, List[Dict[str, Any]]] = {}
-            if news_ids:
-                placeholders = ",".join("?" * len(news_ids))
-                cursor.execute(f"""
-                    SELECT rh.news_item_id, rh.rank, rh.crawl_time
-                    FROM rank_history rh
-                    JOIN news_items ni ON rh.news_item_id = ni.id
-                    WHERE rh.news_item_id IN ({placeholders})
-                      AND NOT (rh.rank = 0 AND rh.crawl_time > ni.last_crawl_time)
-                    ORDER BY rh.news_item_id, rh.crawl_time
-                """, news_ids)
-                for rh_row in cursor.fetchall():
-                    news_id, rank, crawl_time = rh_row[0], rh_row[1], rh_row[2]
-
-                    # 构建 ranks 列表（去重，排除脱榜记录 rank=0）
-                    if news_id not in rank_history_map:
-                        rank_history_map[news_id] = []
-                    if rank != 0 and rank not in rank_history_map[news_id]:
-                        rank_history_map[news_id].append(rank)
-
-                    # 构建 rank_timeline 列表（完整时间线，包含脱榜）
-                    if news_id not in rank_timeline_map:
-                        rank_timeline_map[news_id] = []
-                    # 提取时间部分（HH:MM）
-                    time_part = crawl_time.split()[1][:5] if ' ' in crawl_time else crawl_time[:5]
-                    rank_timeline_map[news_id].append({
-                        "time": time_part,
-                        "rank": rank if rank != 0 else None  # 0 转为 None 表示脱榜
-                    })
-
-            # 按 platform_id 分组
-            items: Dict[str, List[NewsItem]] = {}
-            id_to_name: Dict[str, str] = {}
+        结果来自进程内的当天读模型：首次读取时从数据库完整构建，
+        之后由 _save_news_data_impl 按本次写入的行增量更新，
+        新增检测、统计和报告共用同一份快照。
+
+        Args:
+            date: 日期字符串，默认为今天
+
+        Returns:
+            合并后的新闻数据
+        """
+        try:
+            conn = self._get_connection(date)
             crawl_date = self._format_date_folder(date)
 
-            for row in rows:
-                news_id = row[0]
-                platform_id = row[2]
-                title = row[1]
-                platform_name = row[3] or platform_id
-
-                id_to_name[platform_id] = platform_name
-
-                if platform_id not in items:
-                    items[platform_id] = []
-
-                # 获取排名历史，如果没有则使用当前排名
-                ranks = rank_history_map.get(news_id, [row[4]])
-                rank_timeline = rank_timeline_map.get(news_id, [])
-
-                items[platform_id].append(NewsItem(
-                    title=title,
-                    source_id=platform_id,
-                    source_name=platform_name,
-                    rank=row[4],
-                    url=row[5] or "",
-                    mobile_url=row[6] or "",
-                    crawl_time=row[8],  # last_crawl_time
-                    ranks=ranks,
-                    first_time=row[7],  # first_crawl_time
-                    last_time=row[8],   # last_crawl_time
-                    count=row[9],       # crawl_count
-                    rank_timeline=rank_timeline,
-                ))
+            cache = self._news_day_cache
+            if not self._is_news_day_cache_valid(cache, conn, crawl_date):
+                cache = self._build_news_day_cache(conn, crawl_date)
 
-            final_items = items
+            return cache["snapshot"]
 
-            # 获取失败的来源
-            cursor.execute("""
-                SELECT DISTINCT css.platform_id
-                FROM crawl_source_status css
-                JOIN crawl_records cr ON css.crawl_record_id = cr.id
-                WHERE css.status = 'failed'
-            """)
-            failed_ids = [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            self._news_day_cache = None
+            print(f"[存储] 读取数据失败: {e}")
+            return None
 
-            # 获取最新的抓取时间
-            cursor.execute("""
-                SELECT crawl_time FROM crawl_records
-                ORDER BY crawl_time DESC
-                LIMIT 1
-            """)
+    # ========================================
+    # 当天数据读模型（进程内缓存）
+    # ========================================
 
-            time_row = cursor.fetchone()
-            crawl_time = time_row[0] if time_row else self._format_time_filename()
+    @staticmethod
+    def _get_data_version(conn: sqlite3.Connection) -> int:
+        """读取 data_version（其他连接提交写入后会变化，本连接的写入不影响）"""
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _is_news_day_cache_valid(
+        self,
+        cache: Optional[Dict[str, Any]],
+        conn: sqlite3.Connection,
+        crawl_date: str,
+    ) -> bool:
+        """
+        检查读模型是否仍与数据库一致
 
-            return NewsData(
-                date=crawl_date,
-                crawl_time=crawl_time,
-                items=final_items,
-                id_to_name=id_to_name,
-                failed_ids=failed_ids,
+        连接被替换（远程下载、清理后重连）或其他进程写入过数据库时失效。
+        """
+        return (
+            cache is not None
+            and cache["date"] == crawl_date
+            and cache["conn"] is conn
+            and cache["data_version"] == self._get_data_version(conn)
+        )
+
+    def _build_news_day_cache(self, conn: sqlite3.Connection, crawl_date: str) -> Dict[str, Any]:
+        """从数据库完整构建当天读模型（只保留一天）"""
+        cursor = conn.cursor()
+
+        cursor.execute(self._NEWS_ITEM_COLUMNS + " ORDER BY n.platform_id, n.last_crawl_time, n.id")
+        rows = cursor.fetchall()
+
+        # 查询排名历史（同时获取时间和排名）
+        rank_history_map, rank_timeline_map = self._load_rank_history(cursor)
+
+        # 按 platform_id 分组
+        entries: Dict[str, Dict[int, NewsItem]] = {}
+        for row in rows:
+            entries.setdefault(row[2], {})[row[0]] = self._row_to_news_item(
+                row, rank_history_map, rank_timeline_map
             )
 
+        cache = {
+            "date": crawl_date,
+            "conn": conn,
+            "data_version": self._get_data_version(conn),
+            "entries": entries,
+            "snapshot": None,
+        }
+        cache["snapshot"] = self._make_news_day_snapshot(cursor, cache)
+        self._news_day_cache = cache
+        return cache
+
+    def _update_news_day_cache(self, conn: sqlite3.Connection, data: NewsData) -> None:
+        """
+        用本次保存写入的行增量更新读模型
+
+        本次写入（新增、更新、批量顺延）的新闻 last_crawl_time 都等于本次抓取时间，
+        只需重新读取这些新闻及其排名历史；其余新闻的排名历史只可能新增脱榜记录，
+        而脱榜记录在新闻重新上榜前不会被读出，因此无需变动。
+        读模型未构建、日期不同或抓取时间倒退时直接丢弃，下次读取时重建。
+        """
+        cache = self._news_day_cache
+        if cache is None:
+            return
+
+        try:
+            self._apply_news_day_update(conn, cache, data)
         except Exception as e:
-            print(f"[存储] 读取数据失败: {e}")
+            # 数据已提交，读模型更新失败只需丢弃，下次读取时重建
+            self._news_day_cache = None
+            print(f"[存储] 更新当天读模型失败: {e}")
+
+    def _apply_news_day_update(self, conn: sqlite3.Connection, cache: Dict[str, Any], data: NewsData) -> None:
+        """增量更新读模型（_update_news_day_cache 的实现）"""
+        snapshot = cache["snapshot"]
+        if (
+            cache["date"] != self._format_date_folder(data.date)
+            or cache["conn"] is not conn
+            or (snapshot is not None and data.crawl_time < snapshot.crawl_time)
+        ):
+            self._news_day_cache = None
+            return
+
+        cursor = conn.cursor()
+        cursor.execute(self._NEWS_ITEM_COLUMNS + " WHERE n.last_crawl_time = ? ORDER BY n.id", (data.crawl_time,))
+        rows = cursor.fetchall()
+        rank_history_map, rank_timeline_map = self._load_rank_history(cursor, data.crawl_time)
+
+        entries = cache["entries"]
+        for row in rows:
+            platform_entries = entries.setdefault(row[2], {})
+            # 先移除再插入：本次写入的新闻排到该平台末尾（与 last_crawl_time 排序一致）
+            platform_entries.pop(row[0], None)
+            platform_entries[row[0]] = self._row_to_news_item(row, rank_history_map, rank_timeline_map)
+
+        # 平台改名时同步更新已缓存条目的来源名称
+        cursor.execute("SELECT id, name FROM platforms")
+        for platform_id, platform_name in cursor.fetchall():
+            platform_entries = entries.get(platform_id)
+            if not platform_entries:
+                continue
+            name = platform_name or platform_id
+            for news_id, item in platform_entries.items():
+                if item.source_name != name:
+                    platform_entries[news_id] = replace(item, source_name=name)
+
+        cache["data_version"] = self._get_data_version(conn)
+        cache["snapshot"] = self._make_news_day_snapshot(cursor, cache)
+
+    def _make_news_day_snapshot(self, cursor: sqlite3.Cursor, cache: Dict[str, Any]) -> Optional[NewsData]:
+        """
+        由读模型生成 NewsData 快照
+
+        快照中的列表每次重新生成，NewsItem 只替换不修改，
+        已返回的快照不会被后续的增量更新改变。
+        """
+        entries = cache["entries"]
+        if not any(entries.values()):
             return None
 
+        items: Dict[str, List[NewsItem]] = {}
+        id_to_name: Dict[str, str] = {}
+        for platform_id in sorted(entries):
+            platform_entries = entries[platform_id]
+            if not platform_entries:
+                continue
+            items[platform_id] = list(platform_entries.values())
+            id_to_name[platform_id] = items[platform_id][0].source_name
+
+        # 获取失败的来源
+        cursor.execute("""
+            SELECT DISTINCT css.platform_id
+            FROM crawl_source_status css
+            JOIN crawl_records cr ON css.crawl_record_id = cr.id
+            WHERE css.status = 'failed'
+        """)
+        failed_ids = [row[0] for row in cursor.fetchall()]
+
+        # 获取最新的抓取时间
+        cursor.execute("""
+            SELECT crawl_time FROM crawl_records
+            ORDER BY crawl_time DESC
+            LIMIT 1
+        """)
+
+        time_row = cursor.fetchone()
+        crawl_time = time_row[0] if time_row else self._format_time_filename()
+
+        return NewsData(
+            date=cache["date"],
+            crawl_time=crawl_time,
+            items=items,
+            id_to_name=id_to_name,
+            failed_ids=failed_ids,
+        )
+
+    @staticmethod
+    def _row_to_news_item(
+        row: sqlite3.Row,
+        rank_history_map: Dict[int, List[int]],
+        rank_timeline_map: Dict[int, List[Dict[str, Any]]],
+    ) -> NewsItem:
+        """将 news_items 查询行（_NEWS_ITEM_COLUMNS）转换为 NewsItem"""
+        news_id = row[0]
+        platform_id = row[2]
+
+        return NewsItem(
+            title=row[1],
+            source_id=platform_id,
+            source_name=row[3] or platform_id,
+            rank=row[4],
+            url=row[5] or "",
+            mobile_url=row[6] or "",
+            crawl_time=row[8],  # last_crawl_time
+            # 获取排名历史，如果没有则使用当前排名
+            ranks=rank_history_map.get(news_id, [row[4]]),
+            first_time=row[7],  # first_crawl_time
+            last_time=row[8],   # last_crawl_time
+            count=row[9],       # crawl_count
+            rank_timeline=rank_timeline_map.get(news_id, []),
+        )
+
+    def _load_rank_history(
+        self,
+        cursor: sqlite3.Cursor,
+        last_crawl_time: Optional[str] = None,
+    ) -> Tuple[Dict[int, List[int]], Dict[int, List[Dict[str, Any]]]]:
+        """
+        读取排名历史并按新闻分组
+
+        通过 news_items 与 rank_history 的有序连接一次流式读取，
+        不再拼接 IN (...) 参数列表，查询成本与当天新闻数量无关。
+        已压缩的日期从 rank_history_packed 解码后与原始行合并，结果一致。
+
+        过滤逻辑：只保留 last_crawl_time 之前的脱榜记录（rank=0），
+        这样可以避免显示新闻永久脱榜后的无意义记录。
+
+        Args:
+            cursor: 数据库游标
+            last_crawl_time: 只读取该时间在榜的新闻（None 表示全部新闻）
+
+        Returns:
+            (rank_history_map, rank_timeline_map)
+            - rank_history_map: {news_item_id: 去重后的排名列表（排除脱榜）}
+            - rank_timeline_map: {news_item_id: [{"time": "HH:MM", "rank": 排名或 None}]}
+        """
+        sql = """
+            SELECT rh.news_item_id, rh.rank, rh.crawl_time
+            FROM news_items ni
+            JOIN rank_history rh ON rh.news_item_id = ni.id
+            WHERE NOT (rh.rank = 0 AND rh.crawl_time > ni.last_crawl_time)
+        """
+        params: tuple = ()
+        if last_crawl_time is not None:
+            sql += " AND ni.last_crawl_time = ?"
+            params = (last_crawl_time,)
+        sql += " ORDER BY rh.news_item_id, rh.crawl_time"
+
+        packed = load_packed_history(
+            cursor,
+            "WHERE n.last_crawl_time = ?" if last_crawl_time is not None else "",
+            params,
+            skip_trailing_off_list=True,
+        )
+        rows = cursor.execute(sql, params)
+        if packed:
+            rows = merge_history_rows(rows.fetchall(), packed)
+
+        rank_history_map: Dict[int, List[int]] = {}
+        rank_timeline_map: Dict[int, List[Dict[str, Any]]] = {}
+        current_id = None
+        ranks: List[int] = []
+        timeline: List[Dict[str, Any]] = []
+
+        # 结果按 news_item_id 有序，逐行分组
+        for news_id, rank, crawl_time in rows:
+            if news_id != current_id:
+                current_id = news_id
+                ranks = rank_history_map[news_id] = []
+                timeline = rank_timeline_map[news_id] = []
+
+            # 构建 ranks 列表（去重，排除脱榜记录 rank=0）
+            if rank != 0 and rank not in ranks:
+                ranks.append(rank)
+
+            # 构建 rank_timeline 列表（完整时间线，包含脱榜）
+            # 提取时间部分（HH:MM）
+            time_part = crawl_time.split()[1][:5] if ' ' in crawl_time else crawl_time[:5]
+            timeline.append({
+                "time": time_part,
+                "rank": rank if rank != 0 else None  # 0 转为 None 表示脱榜
+            })
+
+        return rank_history_map, rank_timeline_map
+
     def _get_latest_crawl_data_impl(self, date: Optional[str] = None) -> Optional[NewsData]:
         """
         获取最新一次抓取的数据
@@ -471,87 +1194,23 @@ class SQLiteStorageMixin:
             latest_time = time_row[0]
 
             # 获取该时间的新闻数据（包含 id 用于查询排名历史）
-            cursor.execute("""
-                SELECT n.id, n.title, n.platform_id, p.name as platform_name,
-                       n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
-                FROM news_items n
-                LEFT JOIN platforms p ON n.platform_id = p.id
-                WHERE n.last_crawl_time = ?
-            """, (latest_time,))
+            cursor.execute(self._NEWS_ITEM_COLUMNS + " WHERE n.last_crawl_time = ?", (latest_time,))
 
             rows = cursor.fetchall()
             if not rows:
                 return None
 
-            # 收集所有 news_item_id
-            news_ids = [row[0] for row in rows]
-
-            # 批量查询排名历史（同时获取时间和排名）
-            # 过滤逻辑：只保留 last_crawl_time 之前的脱榜记录（rank=0）
-            # 这样可以避免显示新闻永久脱榜后的无意义记录
-            rank_history_map: Dict[int, List[int]] = {}
-            rank_timeline_map: Dict[int, List[Dict[str, Any]]] = {}
-            if news_ids:
-                placeholders = ",".join("?" * len(news_ids))
-                cursor.execute(f"""
-                    SELECT rh.news_item_id, rh.rank, rh.crawl_time
-                    FROM rank_history rh
-                    JOIN news_items ni ON rh.news_item_id = ni.id
-                    WHERE rh.news_item_id IN ({placeholders})
-                      AND NOT (rh.rank = 0 AND rh.crawl_time > ni.last_crawl_time)
-                    ORDER BY rh.news_item_id, rh.crawl_time
-                """, news_ids)
-                for rh_row in cursor.fetchall():
-                    news_id, rank, crawl_time = rh_row[0], rh_row[1], rh_row[2]
-
-                    # 构建 ranks 列表（去重，排除脱榜记录 rank=0）
-                    if news_id not in rank_history_map:
-                        rank_history_map[news_id] = []
-                    if rank != 0 and rank not in rank_history_map[news_id]:
-                        rank_history_map[news_id].append(rank)
-
-                    # 构建 rank_timeline 列表（完整时间线，包含脱榜）
-                    if news_id not in rank_timeline_map:
-                        rank_timeline_map[news_id] = []
-                    # 提取时间部分（HH:MM）
-                    time_part = crawl_time.split()[1][:5] if ' ' in crawl_time else crawl_time[:5]
-                    rank_timeline_map[news_id].append({
-                        "time": time_part,
-                        "rank": rank if rank != 0 else None  # 0 转为 None 表示脱榜
-                    })
+            # 查询该时间在榜新闻的排名历史（同时获取时间和排名）
+            rank_history_map, rank_timeline_map = self._load_rank_history(cursor, latest_time)
 
             items: Dict[str, List[NewsItem]] = {}
             id_to_name: Dict[str, str] = {}
             crawl_date = self._format_date_folder(date)
 
             for row in rows:
-                news_id = row[0]
-                platform_id = row[2]
-                platform_name = row[3] or platform_id
-                id_to_name[platform_id] = platform_name
-
-                if platform_id not in items:
-                    items[platform_id] = []
-
-                # 获取排名历史，如果没有则使用当前排名
-                ranks = rank_history_map.get(news_id, [row[4]])
-                rank_timeline = rank_timeline_map.get(news_id, [])
-
-                items[platform_id].append(NewsItem(
-                    title=row[1],
-                    source_id=platform_id,
-                    source_name=platform_name,
-                    rank=row[4],
-                    url=row[5] or "",
-                    mobile_url=row[6] or "",
-                    crawl_time=row[8],  # last_crawl_time
-                    ranks=ranks,
-                    first_time=row[7],  # first_crawl_time
-                    last_time=row[8],   # last_crawl_time
-                    count=row[9],       # crawl_count
-                    rank_timeline=rank_timeline,
-                ))
+                item = self._row_to_news_item(row, rank_history_map, rank_timeline_map)
+                id_to_name[item.source_id] = item.source_name
+                items.setdefault(item.source_id, []).append(item)
 
             # 获取失败的来源（针对最新一次抓取）
             cursor.execute("""
@@ -804,6 +1463,21 @@ class SQLiteStorageMixin:
             new_count = 0
             updated_count = 0
 
+            # 返回 304 的源：条目与上次一致，批量顺延最后抓取时间
+            for feed_id in data.unchanged_ids:
+                cursor.execute("""
+                    UPDATE rss_items SET
+                        last_crawl_time = ?,
+                        crawl_count = crawl_count + 1,
+                        updated_at = ?
+                    WHERE feed_id = ?
+                      AND last_crawl_time = (
+                          SELECT MAX(last_crawl_time) FROM rss_items WHERE feed_id = ?
+                      )
+                      AND last_crawl_time < ?
+                """, (data.crawl_time, now_str, feed_id, feed_id, data.crawl_time))
+                updated_count += cursor.rowcount
+
             for feed_id, rss_list in data.items.items():
                 for item in rss_list:
                     try:
@@ -888,8 +1562,8 @@ class SQLiteStorageMixin:
             if record_row:
                 crawl_record_id = record_row[0]
 
-                # 记录成功的源
-                for feed_id in data.items.keys():
+                # 记录成功的源（含返回 304 的源）
+                for feed_id in list(data.items.keys()) + data.unchanged_ids:
                     cursor.execute("""
                         INSERT OR REPLACE INTO rss_crawl_status
                         (crawl_record_id, feed_id, status)
@@ -909,7 +1583,11 @@ class SQLiteStorageMixin:
                         VALUES (?, ?, 'failed')
                     """, (crawl_record_id, failed_id))
 
+            # 更新各源的抓取状态和 HTTP 校验头
+            self._update_rss_feed_fetch_state(cursor, data)
+
             conn.commit()
+            self._analyze_if_needed(conn)
 
             return True, new_count, updated_count
 
@@ -917,6 +1595,61 @@ class SQLiteStorageMixin:
             print(f"{log_prefix} 保存 RSS 数据失败: {e}")
             return False, 0, 0
 
+    def _update_rss_feed_fetch_state(self, cursor: sqlite3.Cursor, data: RSSData) -> None:
+        """更新 rss_feeds 的最后抓取时间、状态和 HTTP 校验头"""
+        for feed_id in data.items.keys():
+            validator = data.validators.get(feed_id, {})
+            cursor.execute("""
+                UPDATE rss_feeds SET
+                    last_fetch_time = ?,
+                    last_fetch_status = 'success',
+                    etag = ?,
+                    last_modified = ?
+                WHERE id = ?
+            """, (data.crawl_time, validator.get("etag", ""),
+                  validator.get("last_modified", ""), feed_id))
+
+        for feed_id in data.unchanged_ids:
+            cursor.execute("""
+                UPDATE rss_feeds SET
+                    last_fetch_time = ?,
+                    last_fetch_status = 'not_modified'
+                WHERE id = ?
+            """, (data.crawl_time, feed_id))
+
+        for feed_id in data.failed_ids:
+            cursor.execute("""
+                UPDATE rss_feeds SET
+                    last_fetch_time = ?,
+                    last_fetch_status = 'failed'
+                WHERE id = ?
+            """, (data.crawl_time, feed_id))
+
+    def _get_rss_feed_validators_impl(self, date: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        获取指定日期已保存的 RSS 源 HTTP 校验头
+
+        Args:
+            date: 日期字符串，默认为今天
+
+        Returns:
+            {feed_id: {"etag", "last_modified"}}（只包含有校验头的源）
+        """
+        try:
+            conn = self._get_connection(date, db_type="rss")
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, etag, last_modified FROM rss_feeds
+                WHERE etag != '' OR last_modified != ''
+            """)
+            return {
+                row[0]: {"etag": row[1] or "", "last_modified": row[2] or ""}
+                for row in cursor.fetchall()
+            }
+        except Exception as e:
+            print(f"[存储] 读取 RSS 校验头失败: {e}")
+            return {}
+
     def _get_rss_data_impl(self, date: Optional[str] = None) -> Optional[RSSData]:
         """
         获取指定日期的所有 RSS 数据
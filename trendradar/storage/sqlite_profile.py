@@ -0,0 +1,101 @@
+# coding=utf-8
+"""
+SQLite 连接参数（PRAGMA）配置
+
+预置两套配置：
+- default: SQLite 默认参数（回滚日志、FULL 同步），与旧版本行为一致
+- performance: WAL 模式 + NORMAL 同步 + 更大的页缓存/内存映射，
+  读连接不会被抓取写入阻塞，写入也更快
+
+配置示例（config.yaml）:
+    storage:
+      sqlite:
+        profile: "performance"
+        pragmas:                # 可选，覆盖预置配置中的单项
+          cache_size: -65536
+"""
+
+import sqlite3
+from typing import Any, Dict, Optional
+
+# 预置配置
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,        # 负数表示 KiB，即 16 MiB
+        "mmap_size": 134217728,      # 128 MiB
+        "temp_store": "MEMORY",
+    },
+}
+
+DEFAULT_SQLITE_PROFILE = "performance"
+
+# 只影响写入或需要写锁的参数，读连接不设置
+_WRITER_ONLY_PRAGMAS = ("journal_mode", "synchronous")
+
+
+def resolve_sqlite_pragmas(
+    profile: str = DEFAULT_SQLITE_PROFILE,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    解析最终使用的 PRAGMA 配置
+
+    Args:
+        profile: 预置配置名称
+        overrides: 覆盖项 {pragma 名: 值}
+
+    Returns:
+        {pragma 名: 值}
+    """
+    if profile not in SQLITE_PROFILES:
+        print(f"[存储] 未知的 SQLite 配置 '{profile}'，使用 {DEFAULT_SQLITE_PROFILE}")
+        profile = DEFAULT_SQLITE_PROFILE
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name, value in (overrides or {}).items():
+        pragmas[str(name).lower()] = value
+    return pragmas
+
+
+def apply_sqlite_pragmas(
+    conn: sqlite3.Connection,
+    pragmas: Optional[Dict[str, Any]],
+    readonly: bool = False,
+) -> None:
+    """
+    对连接应用 PRAGMA 配置
+
+    读连接跳过 journal_mode / synchronous：切换日志模式需要写锁，
+    而 WAL 模式一经写连接设置即持久保存在数据库文件中。
+
+    Args:
+        conn: 数据库连接
+        pragmas: {pragma 名: 值}
+        readonly: 是否为只读连接
+    """
+    for name, value in (pragmas or {}).items():
+        if readonly and name in _WRITER_ONLY_PRAGMAS:
+            continue
+        if not str(name).replace("_", "").isalnum():
+            continue
+        try:
+            conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.Error as e:
+            print(f"[存储] 设置 PRAGMA {name}={value} 失败: {e}")
+
+
+def checkpoint_sqlite(conn: sqlite3.Connection) -> None:
+    """
+    将 WAL 中的内容合并回主数据库文件
+
+    上传、复制数据库文件前调用，确保单个 .db 文件包含全部数据。
+    非 WAL 模式下为空操作。
+    """
+    conn.commit()
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except sqlite3.Error as e:
+        print(f"[存储] WAL checkpoint 失败: {e}")
@@ -0,0 +1,112 @@
+# coding=utf-8
+"""
+启动耗时分析（python -m trendradar --profile-startup）
+
+在子进程中以 -X importtime 导入 CLI 入口，按包汇总导入耗时；
+并分别测量各按需加载模块（AI、远程存储、RSS 解析、报告、通知）首次使用时的导入成本。
+"""
+
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# 按需加载的模块：(说明, 模块名)
+LAZY_MODULES: List[Tuple[str, str]] = [
+    ("AI 客户端", "litellm"),
+    ("远程存储", "boto3"),
+    ("RSS 解析", "feedparser"),
+    ("HTML 报告", "trendradar.report"),
+    ("通知推送", "trendradar.notification"),
+    ("热榜抓取", "trendradar.crawler"),
+]
+
+ENTRY_MODULE = "trendradar.__main__"
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    解析 -X importtime 输出
+
+    Returns:
+        [(模块名, 自身耗时 us, 累计耗时 us)]
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头
+        records.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return records
+
+
+def _package_of(module: str) -> str:
+    """汇总粒度：trendradar 按子包，其余按顶层包"""
+    parts = module.split(".")
+    if parts[0] == "trendradar" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def _measure_lazy_import(module: str) -> Tuple[bool, float]:
+    """在已导入入口模块的子进程中测量某模块的导入耗时（毫秒）"""
+    code = (
+        "import time, importlib\n"
+        f"import {ENTRY_MODULE}\n"
+        "start = time.perf_counter()\n"
+        "try:\n"
+        f"    importlib.import_module({module!r})\n"
+        "except ImportError:\n"
+        "    print('missing')\n"
+        "else:\n"
+        "    print((time.perf_counter() - start) * 1000)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+    output = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not output or output[-1] == "missing":
+        return False, 0.0
+    return True, float(output[-1])
+
+
+def profile_startup(top: int = 15) -> None:
+    """打印 CLI 启动的导入耗时分析"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+        capture_output=True,
+        text=True,
+    )
+    records = _parse_importtime(result.stderr)
+    if result.returncode != 0 or not records:
+        print(f"❌ 启动分析失败: {result.stderr.strip()[-500:]}")
+        return
+
+    total_us = sum(self_us for _, self_us, _ in records)
+    by_package: Dict[str, int] = {}
+    for module, self_us, _ in records:
+        package = _package_of(module)
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    print("=" * 60)
+    print("TrendRadar 启动耗时分析")
+    print("=" * 60)
+    print(f"\n⏱️ 导入 {ENTRY_MODULE}: {total_us / 1000:.1f} ms（{len(records)} 个模块）")
+
+    print(f"\n📦 按包统计（前 {top}）:")
+    for package, self_us in sorted(by_package.items(), key=lambda x: -x[1])[:top]:
+        share = self_us / total_us * 100 if total_us else 0
+        print(f"  {package:<32} {self_us / 1000:>8.1f} ms  {share:>5.1f}%")
+
+    print(f"\n🐢 累计耗时最长的模块（前 {top}）:")
+    for module, _, cumulative_us in sorted(records, key=lambda x: -x[2])[:top]:
+        print(f"  {module:<40} {cumulative_us / 1000:>8.1f} ms")
+
+    print("\n💤 按需加载（首次使用时才导入）:")
+    for label, module in LAZY_MODULES:
+        installed, elapsed_ms = _measure_lazy_import(module)
+        cost = f"{elapsed_ms:>8.1f} ms" if installed else "     未安装"
+        print(f"  {module:<28} {cost}  {label}")
+
+    print("\n" + "=" * 60)